@@ -1,6 +1,6 @@
 from relic.chunky.chunky import *
 from relic.chunky.chunk import *
-from relic.chunky import chunky, chunk, serializer
+from relic.chunky import chunky, chunk, index, serializer
 
 __all__ = [
     serializer,
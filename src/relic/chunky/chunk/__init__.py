@@ -1,12 +1,15 @@
-from relic.chunky.chunk.chunk import AbstractChunk, ChunkCollection, FolderChunk, DataChunk, GenericDataChunk
+from relic.chunky.chunk.chunk import ChunkPayload, AbstractChunk, ChunkCollection, FolderChunk, DataChunk, GenericDataChunk, LazyDataChunk, LazyFolderChunk
 from relic.chunky.chunk.header import ChunkHeaderV0301, ChunkHeaderV0101, ChunkType, ChunkHeader
 
 __all__ = [
+    "ChunkPayload",
     "AbstractChunk",
     "ChunkCollection",
     "FolderChunk",
     "DataChunk",
     "GenericDataChunk",
+    "LazyDataChunk",
+    "LazyFolderChunk",
     "ChunkType",
     "ChunkHeader",
     "ChunkHeaderV0101",
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import BinaryIO, List, Optional, Union
 
 from .header import ChunkHeader
 
+ChunkPayload = Union[bytes, memoryview]
+"""A data chunk's payload; a memoryview when the chunky was read from a buffer (see serializer.read_chunky)."""
+
+
+def check_payload_size(data: ChunkPayload, header: ChunkHeader, offset: int) -> ChunkPayload:
+    """
+    Checks that a chunk's payload was read in full.
+
+    :param offset: The offset the payload was read from; for the error message
+    :raises EOFError: if the stream ended before the chunk did
+    """
+    if len(data) != header.size:
+        raise EOFError(f"Chunk '{header.id}' at offset {offset} expected {header.size} bytes of data; only {len(data)} were read.")
+    return data
+
 
 @dataclass
 class AbstractChunk:
@@ -29,4 +44,53 @@ class DataChunk(AbstractChunk):
 
 @dataclass
 class GenericDataChunk(DataChunk):
-    raw_bytes: bytes
+    raw_bytes: ChunkPayload
+    """The chunk's payload; a memoryview when the chunky was read from a buffer (see serializer.read_chunky), so converters should accept any buffer."""
+
+
+@dataclass
+class LazyFolderChunk(FolderChunk):
+    offset: int = 0
+    """The offset of the chunk's data (after its header) in the source stream; see serializer.read_chunky(lazy=True)."""
+
+
+class LazyDataChunk(GenericDataChunk):
+    """
+    A data chunk whose payload is only read (and then kept) when raw_bytes is first accessed; the source stream must remain open until then.
+
+    If the source supports read_view (see serializer.MemoryViewReader), the payload is a view of its buffer instead of a copy.
+    """
+
+    def __init__(self, header: ChunkHeader, source: BinaryIO, offset: int):
+        """
+        :param header: The chunk's header
+        :param source: The stream the chunk was parsed from
+        :param offset: The offset of the chunk's data (after its header) in the source stream
+        """
+        self.header = header
+        self.source = source
+        self.offset = offset
+        self._raw_bytes: Optional[ChunkPayload] = None
+
+    @property
+    def data_loaded(self) -> bool:
+        return self._raw_bytes is not None
+
+    @property
+    def raw_bytes(self) -> ChunkPayload:
+        if self._raw_bytes is None:
+            self.source.seek(self.offset)
+            read = getattr(self.source, "read_view", self.source.read)
+            self._raw_bytes = check_payload_size(read(self.header.size), self.header, self.offset)
+        return self._raw_bytes
+
+    @raw_bytes.setter
+    def raw_bytes(self, value: ChunkPayload) -> None:
+        self._raw_bytes = value
+
+    def unload(self) -> None:
+        """Discards the payload (if it was read); it's read again on the next access."""
+        self._raw_bytes = None
+
+    def __repr__(self) -> str:  # Unlike GenericDataChunk's, never reads the payload
+        return f"{self.__class__.__name__}(header={self.header!r}, offset={self.offset}, data_loaded={self.data_loaded})"
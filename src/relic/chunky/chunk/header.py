@@ -79,11 +79,15 @@ class ChunkHeader:
         raise NotImplementedError
 
     @classmethod
-    def unpack(cls, stream: BinaryIO, chunky_version: ChunkyVersion) -> ChunkHeader:
+    def version_class(cls, chunky_version: ChunkyVersion) -> Type[ChunkHeader]:
         class_type = _VERSION_MAP.get(chunky_version)
         if not class_type:
             raise VersionError(chunky_version, list(_VERSION_MAP.keys()))
-        return class_type._unpack(stream)
+        return class_type
+
+    @classmethod
+    def unpack(cls, stream: BinaryIO, chunky_version: ChunkyVersion) -> ChunkHeader:
+        return cls.version_class(chunky_version)._unpack(stream)
 
     def pack(self, stream: BinaryIO) -> int:
         return self.pack(stream)
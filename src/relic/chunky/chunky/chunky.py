@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
 
 from .header import ChunkyHeader
-from ..chunk.chunk import ChunkCollection
+from ..chunk.chunk import AbstractChunk, ChunkCollection
+
+if TYPE_CHECKING:
+    from ..index import ChunkIndex, ChunkQueryResult
 
 
 @dataclass
@@ -13,4 +17,19 @@ class RelicChunky:
 
 @dataclass
 class GenericRelicChunky(RelicChunky, ChunkCollection):
-    pass
+    index: Optional[ChunkIndex] = field(default=None, repr=False, compare=False)
+    """Maps chunk paths to chunks; see query. Built by serializer.read_chunky(index=True), or on first use; reset it to None if chunks are changed."""
+
+    def get_index(self) -> ChunkIndex:
+        if self.index is None:
+            from ..index import ChunkIndex  # The index module depends on the chunk package, which depends on this package
+            self.index = ChunkIndex.build(self.chunks)
+        return self.index
+
+    def get_chunk(self, path: str) -> Optional[AbstractChunk]:
+        """Gets the chunk at the path; E.G. 'FOLD:RSGM/FOLD:MSGR/DATA:DATA#2'. See ChunkIndex.get."""
+        return self.get_index().get(path)
+
+    def query(self, pattern: str) -> ChunkQueryResult:
+        """Gets every (path, chunk) matching the pattern, in file order; E.G. '**/DATA:ATTR'. See index.compile_chunk_query."""
+        return self.get_index().query(pattern)
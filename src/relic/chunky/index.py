@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+from .chunk.chunk import AbstractChunk, FolderChunk
+from .chunk.header import ChunkHeader
+
+ChunkQueryResult = List[Tuple[str, AbstractChunk]]
+
+_WILDCARDS = re.compile(r"[*?]")
+
+
+def chunk_key(header: ChunkHeader) -> str:
+    """E.G. 'FOLD:RSGM' or 'DATA:DATA'."""
+    return f"{header.type.value}:{header.id}"
+
+
+def _strip_occurrence(segment: str) -> str:
+    return segment.split("#", 1)[0]
+
+
+def compile_chunk_query(pattern: str) -> Pattern[str]:
+    """
+    Compiles a chunk path pattern; segments are 'TYPE:ID', optionally followed by an occurrence ('#2' is the second sibling with the same type and id).
+
+    '*' and '?' match within a segment, '**' matches any number of segments; segments without an occurrence match every occurrence.
+    E.G. '**/DATA:ATTR', 'FOLD:RSGM/FOLD:MSGR/*/DATA:DATA#1'.
+    """
+    parts = pattern.strip("/").split("/")
+    regex = []
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            regex.append(".*" if last else "(?:[^/]+/)*")
+            continue
+        segment = "".join("[^/]*" if c == "*" else "[^/]" if c == "?" else re.escape(c) for c in part)
+        if "#" not in part:
+            segment += r"#\d+"
+        regex.append(segment if last else segment + "/")
+    return re.compile("".join(regex) + r"\Z")
+
+
+@dataclass
+class ChunkIndex:
+    """
+    Maps chunk paths (E.G. 'FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#2/DATA:DATA#1') to chunks; built during parsing (see serializer.read_chunky) or from a chunk tree.
+
+    Paths are kept in file order (depth first); a secondary index of each 'TYPE:ID' lets queries ending in a literal segment (E.G. '**/DATA:ATTR') skip unrelated chunks.
+    """
+    paths: Dict[str, AbstractChunk] = field(default_factory=dict)
+    keys: Dict[str, List[str]] = field(default_factory=dict)
+    """The paths of every chunk with the 'TYPE:ID' key, in file order."""
+
+    def add(self, parent_path: str, key: str, occurrence: int, chunk: AbstractChunk) -> str:
+        path = f"{parent_path}/{key}#{occurrence}" if parent_path else f"{key}#{occurrence}"
+        self.paths[path] = chunk
+        self.keys.setdefault(key, []).append(path)
+        return path
+
+    @classmethod
+    def build(cls, chunks: Iterable[AbstractChunk]) -> ChunkIndex:
+        """Indexes a chunk tree; E.G. of a chunky which was built (rather than parsed)."""
+        index = cls()
+        # Each open folder is (path, its remaining chunks, occurrences of each key); so chunks are indexed depth first, in file order
+        pending: List[Tuple[str, Iterator[AbstractChunk], Dict[str, int]]] = [("", iter(chunks), {})]
+        while pending:
+            parent_path, children, occurrences = pending[-1]
+            chunk = next(children, None)
+            if chunk is None:
+                pending.pop()
+                continue
+            key = chunk_key(chunk.header)
+            occurrence = occurrences[key] = occurrences.get(key, 0) + 1
+            path = index.add(parent_path, key, occurrence, chunk)
+            if isinstance(chunk, FolderChunk):
+                pending.append((path, iter(chunk.chunks), {}))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def get(self, path: str) -> Optional[AbstractChunk]:
+        """Gets the chunk at the path; segments without an occurrence are the first occurrence. E.G. 'FOLD:RSGM/DATA:SSHR'."""
+        segments = [segment if "#" in segment else segment + "#1" for segment in path.strip("/").split("/")]
+        return self.paths.get("/".join(segments))
+
+    def query(self, pattern: str) -> ChunkQueryResult:
+        """Gets every (path, chunk) matching the pattern (see compile_chunk_query), in file order."""
+        regex = compile_chunk_query(pattern)
+        last = pattern.strip("/").rsplit("/", 1)[-1]
+        candidates: Iterable[str]
+        if last != "**" and not _WILDCARDS.search(last):
+            candidates = self.keys.get(_strip_occurrence(last), [])
+        else:
+            candidates = self.paths
+        return [(path, self.paths[path]) for path in candidates if regex.match(path)]
+
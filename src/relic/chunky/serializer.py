@@ -1,15 +1,66 @@
-from typing import BinaryIO, List
+import io
+import os
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union, cast
 
-from serialization_tools.ioutil import BinaryWindow, has_data
-from .chunk import AbstractChunk, FolderChunk, GenericDataChunk, ChunkHeader, ChunkType
+from .chunk import AbstractChunk, FolderChunk, GenericDataChunk, ChunkHeader, ChunkType, LazyDataChunk, LazyFolderChunk
+from .chunk.chunk import check_payload_size
 from .chunky import ChunkyVersion, ChunkyMagic, ChunkyHeader, GenericRelicChunky
-
-
-def read_chunky(stream: BinaryIO) -> GenericRelicChunky:
-    ChunkyMagic.assert_magic_word(stream)
-    header = ChunkyHeader.unpack(stream)
-    chunks = read_all_chunks(stream, header.version)
-    return GenericRelicChunky(chunks, header)
+from .index import ChunkIndex, chunk_key
+
+
+class MemoryViewReader(io.RawIOBase):
+    """A read-only, seekable stream over a buffer (E.G. a memory-mapped file, or a file's data from an archive); the buffer is never copied."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        super().__init__()
+        self.buffer = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += len(self.buffer)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        data = self.read_view(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read_view(self, size: int = -1) -> memoryview:
+        """Like read, but returns a view of the buffer instead of a copy."""
+        end = len(self.buffer) if size is None or size < 0 else min(self._position + size, len(self.buffer))
+        view = self.buffer[self._position:max(end, self._position)]
+        self._position += len(view)
+        return view
+
+
+def read_chunky(stream: Union[BinaryIO, memoryview], lazy: bool = False, index: bool = False) -> GenericRelicChunky:
+    """
+    :param stream: The stream to read from; or a memoryview (E.G. of a memory-mapped file), in which case each data chunk's raw_bytes is a view of it, instead of a copy.
+    :param lazy: When true, only the chunk headers are read; each data chunk's payload is read when it is first accessed (see LazyDataChunk), so the stream (or the view's buffer) must remain open.
+    :param index: When true, the chunky's path index (see GenericRelicChunky.query) is built while parsing; otherwise it's built on first use.
+    """
+    # MemoryViewReader is a RawIOBase; it provides everything the parser reads with, but isn't a BinaryIO to the type checker
+    reader = cast(BinaryIO, MemoryViewReader(stream)) if isinstance(stream, memoryview) else stream
+    ChunkyMagic.assert_magic_word(reader)
+    header = ChunkyHeader.unpack(reader)
+    chunk_index = ChunkIndex() if index else None
+    chunks = _read_chunk_tree(reader, header.version, None, lazy, chunk_index)
+    return GenericRelicChunky(chunks, header, chunk_index)
 
 
 def write_chunky(chunky: GenericRelicChunky, stream: BinaryIO) -> int:
@@ -20,9 +71,8 @@ def write_chunky(chunky: GenericRelicChunky, stream: BinaryIO) -> int:
 
 
 def read_folder_chunk(stream: BinaryIO, header: ChunkHeader) -> FolderChunk:
-    with BinaryWindow.slice(stream, header.size) as window:  # TODO, remove, redundant, read_chunky enters a window
-        chunks = read_all_chunks(window, header.chunky_version)
-        return FolderChunk(chunks, header)
+    chunks = read_all_chunks(stream, header.chunky_version, stream.tell() + header.size)
+    return FolderChunk(chunks, header)
 
 
 def write_folder_chunk(chunk: FolderChunk, stream: BinaryIO) -> int:
@@ -42,9 +92,8 @@ def write_folder_chunk(chunk: FolderChunk, stream: BinaryIO) -> int:
 
 
 def read_data_chunk(stream: BinaryIO, header: ChunkHeader) -> GenericDataChunk:
-    data = stream.read(header.size)
-    assert len(data) == header.size
-    return GenericDataChunk(header, data)
+    offset = stream.tell()
+    return GenericDataChunk(header, check_payload_size(stream.read(header.size), header, offset))
 
 
 def write_data_chunk(chunk: GenericDataChunk, stream: BinaryIO) -> int:
@@ -56,20 +105,68 @@ def write_data_chunk(chunk: GenericDataChunk, stream: BinaryIO) -> int:
     return written
 
 
-def read_all_chunks(stream: BinaryIO, chunky_version: ChunkyVersion) -> List[AbstractChunk]:
-    chunks: List[AbstractChunk] = []
-
-    while has_data(stream):
-        header = ChunkHeader.unpack(stream, chunky_version)
-        with BinaryWindow.slice(stream, header.size) as window:
-            if header.type == ChunkType.Folder:
-                c = read_folder_chunk(window, header)
-            elif header.type == ChunkType.Data:
-                c = read_data_chunk(window, header)
+def read_all_chunks(stream: BinaryIO, chunky_version: ChunkyVersion, end: Optional[int] = None) -> List[AbstractChunk]:
+    """
+    Reads the chunk tree, including every data chunk's payload.
+
+    :param end: The position the chunks end at; defaults to the end of the stream
+    """
+    return _read_chunk_tree(stream, chunky_version, end, lazy=False)
+
+
+def read_all_chunks_lazy(stream: BinaryIO, chunky_version: ChunkyVersion, end: Optional[int] = None) -> List[AbstractChunk]:
+    """
+    Reads the chunk header tree, without reading any payloads; chunks record the offset of their data in the stream (see LazyDataChunk and LazyFolderChunk).
+
+    :param end: The position the chunks end at; defaults to the end of the stream
+    """
+    return _read_chunk_tree(stream, chunky_version, end, lazy=True)
+
+
+def _read_chunk_tree(stream: BinaryIO, chunky_version: ChunkyVersion, end: Optional[int], lazy: bool, index: Optional[ChunkIndex] = None) -> List[AbstractChunk]:
+    # Walks the tree in a single pass, with an explicit stack of (end, chunks, path, occurrences) for each open folder; no windows are created, so offsets are positions in the stream itself
+    if end is None:
+        start = stream.tell()
+        end = stream.seek(0, os.SEEK_END)
+        stream.seek(start)
+    unpack_header = ChunkHeader.version_class(chunky_version)._unpack
+    read_payload = getattr(stream, "read_view", stream.read)  # A MemoryViewReader's payloads are views of its buffer; not copies
+    root: List[AbstractChunk] = []
+    stack: List[Tuple[int, List[AbstractChunk], str, Dict[str, int]]] = [(end, root, "", {})]
+    folder_end, chunks, folder_path, occurrences = stack[-1]
+    position = stream.tell()
+    while True:
+        if position >= folder_end:
+            stack.pop()
+            if not stack:
+                return root
+            folder_end, chunks, folder_path, occurrences = stack[-1]
+            continue
+        header = unpack_header(stream)
+        offset = stream.tell()
+        position = offset + header.size
+        chunk: AbstractChunk
+        if header.type == ChunkType.Folder:
+            children: List[AbstractChunk] = []
+            chunk = LazyFolderChunk(children, header, offset) if lazy else FolderChunk(children, header)
+        elif header.type == ChunkType.Data:
+            if lazy:
+                chunk = LazyDataChunk(header, stream, offset)
+                stream.seek(position)  # Skip the payload
             else:
-                raise TypeError(header.type)
-        chunks.append(c)
-    return chunks
+                chunk = GenericDataChunk(header, check_payload_size(read_payload(header.size), header, offset))
+        else:
+            raise TypeError(header.type)
+        chunks.append(chunk)
+        path = ""
+        if index is not None:
+            key = chunk_key(header)
+            occurrence = occurrences[key] = occurrences.get(key, 0) + 1
+            path = index.add(folder_path, key, occurrence, chunk)
+        if header.type == ChunkType.Folder:
+            stack.append((position, children, path, {}))
+            folder_end, chunks, folder_path, occurrences = stack[-1]
+            position = offset  # The folder's chunks start at its data
 
 
 def write_all_chunks(stream: BinaryIO, chunks: List[AbstractChunk]) -> int:
@@ -3,14 +3,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-from ....chunky.chunk.chunk import AbstractChunk, GenericDataChunk, FolderChunk
+from ....chunky.chunk.chunk import AbstractChunk, GenericDataChunk, FolderChunk, ChunkPayload
 from ....chunky.chunk.header import ChunkType
 from ...util import find_chunks, find_chunk
 
 
 @dataclass
 class SkelInfoChunk(AbstractChunk):
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> SkelInfoChunk:
@@ -19,7 +19,7 @@ class SkelInfoChunk(AbstractChunk):
 
 @dataclass
 class BoneChunk(AbstractChunk):
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> BoneChunk:
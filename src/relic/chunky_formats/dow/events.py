@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-from relic.chunky import AbstractChunk, FolderChunk, GenericDataChunk
+from relic.chunky import AbstractChunk, FolderChunk, GenericDataChunk, ChunkPayload
 from relic.chunky.chunk import ChunkType
 from relic.chunky.chunky import RelicChunky, GenericRelicChunky
 from relic.chunky_formats.util import find_chunks, find_chunk
@@ -11,7 +11,7 @@ from relic.chunky_formats.util import find_chunks, find_chunk
 
 @dataclass
 class EvntChunk(AbstractChunk):
-    raw: bytes
+    raw: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> EvntChunk:
@@ -1,13 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-from relic.chunky import RelicChunky, GenericRelicChunky, ChunkType, GenericDataChunk, AbstractChunk
+from relic.chunky import RelicChunky, GenericRelicChunky, ChunkType, GenericDataChunk, ChunkPayload, AbstractChunk
 from relic.chunky_formats.util import find_chunk
 
 
 @dataclass
 class AegdChunk(AbstractChunk):
-    raw: bytes  # TODO
+    raw: ChunkPayload  # TODO
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> AegdChunk:
@@ -2,13 +2,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List
 
-from relic.chunky import RelicChunky, GenericRelicChunky, ChunkType, GenericDataChunk, AbstractChunk, FolderChunk
+from relic.chunky import RelicChunky, GenericRelicChunky, ChunkType, GenericDataChunk, ChunkPayload, AbstractChunk, FolderChunk
 from relic.chunky_formats.util import find_chunks, find_chunk, UnimplementedDataChunk
 
 
 @dataclass
 class ModfChunk(AbstractChunk):
-    raw: bytes
+    raw: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> ModfChunk:
@@ -17,7 +17,7 @@ class ModfChunk(AbstractChunk):
 
 @dataclass
 class MdatChunk(AbstractChunk):
-    raw: bytes
+    raw: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> MdatChunk:
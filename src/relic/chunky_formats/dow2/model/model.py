@@ -11,7 +11,7 @@ from serialization_tools.ioutil import has_data
 from serialization_tools.structx import Struct
 from serialization_tools.vstruct import VStruct
 
-from relic.chunky import FolderChunk, GenericDataChunk, RelicChunky, ChunkyVersion, GenericRelicChunky, ChunkType, AbstractChunk, ChunkHeaderV0301
+from relic.chunky import FolderChunk, GenericDataChunk, ChunkPayload, RelicChunky, ChunkyVersion, GenericRelicChunky, ChunkType, AbstractChunk, ChunkHeaderV0301
 from relic.chunky.serializer import read_chunky
 from relic.chunky_formats.convertable import ChunkConverterFactory
 from relic.chunky_formats.util import ChunkCollectionX
@@ -24,7 +24,7 @@ class BVolChunk(AbstractChunk):
     CHUNK_ID = "BVOL"
     VERSIONS = [2]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -38,7 +38,7 @@ class MrfmChunk(AbstractChunk):
     CHUNK_ID = "MRFM"
     VERSIONS = [1]
 
-    raw_bytes: bytes
+    raw_bytes: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> MrfmChunk:
@@ -369,7 +369,7 @@ class NodeChunk(AbstractChunk):
     CHUNK_ID = "NODE"
     VERSIONS = [2, 3]  # 3 is common
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -515,7 +515,7 @@ class SkelInfoChunk(AbstractChunk):
     CHUNK_TYPE = ChunkType.Data
     CHUNK_ID = "INFO"
     VERSIONS = [1]
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -528,7 +528,7 @@ class BoneChunk(AbstractChunk):
     CHUNK_TYPE = ChunkType.Data
     CHUNK_ID = "BONE"
     VERSIONS = [7]
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -581,7 +581,7 @@ class MrksChunk(AbstractChunk):
     CHUNK_ID = "MRKS"
     VERSIONS = [1]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -595,7 +595,7 @@ class ImodDataChunk(AbstractChunk):
     CHUNK_ID = "DATA"
     VERSIONS = [9]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -682,7 +682,7 @@ class FlgsChunk(AbstractChunk):
     CHUNK_ID = "FLGS"
     VERSIONS = [2]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -776,7 +776,7 @@ class CnbpChunk(AbstractChunk):
     CHUNK_ID = "CNBP"
     VERSIONS = [3]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -810,7 +810,7 @@ class DtbpChunk(AbstractChunk):
     CHUNK_ID = "DTBP"
     VERSIONS = [3]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -824,7 +824,7 @@ class TsetDataChunk(AbstractChunk):
     CHUNK_ID = "DATA"
     VERSIONS = [3]
 
-    data: bytes
+    data: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk):
@@ -855,7 +855,7 @@ class LsdChunk(AbstractChunk):
     CHUNK_TYPE = ChunkType.Data
     CHUNK_ID = "LSD "
     VERSIONS = [2]
-    raw: bytes
+    raw: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> LsdChunk:
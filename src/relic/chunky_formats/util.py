@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import List, Iterable, Optional, Protocol, Sized, Type, Union, ClassVar
+from typing import Dict, List, Iterable, Optional, Protocol, Tuple, Type, Union, ClassVar
 
-from relic.chunky import AbstractChunk, ChunkType, RelicChunky, GenericRelicChunky, FolderChunk, GenericDataChunk
+from relic.chunky import AbstractChunk, ChunkType, RelicChunky, GenericRelicChunky, FolderChunk, GenericDataChunk, ChunkPayload
 from relic.chunky_formats.convertable import SupportsDataChunkAutoConvert
 from relic.chunky_formats.protocols import ChunkDefinition
 
@@ -46,7 +46,7 @@ class UnimplementedFolderChunk(AbstractChunk):
 
 @dataclass
 class UnimplementedDataChunk(AbstractChunk):
-    raw: bytes
+    raw: ChunkPayload
 
     @classmethod
     def convert(cls, chunk: GenericDataChunk) -> UnimplementedDataChunk:
@@ -58,27 +58,32 @@ class ChunkCollection(Protocol):
 
 
 class ChunkCollectionX:
-    @classmethod
-    def list2col(cls, col: List[AbstractChunk]) -> ChunkCollectionX:
-        @dataclass
-        class Wrapper:
-            chunks: List[AbstractChunk]
+    """
+    Wraps a collection's chunks; grouped by (type, id) once, on construction, so lookups never scan the collection.
 
-        return ChunkCollectionX(Wrapper(col))
+    The chunks are copied when the wrapper is created; changes to the wrapped collection afterwards aren't seen.
+    """
 
-    def __init__(self, inner: ChunkCollection):
-        self.inner = inner
+    @classmethod
+    def list2col(cls, col: List[AbstractChunk]) -> ChunkCollectionX:
+        return cls(col)
+
+    def __init__(self, inner: Union[ChunkCollection, Iterable[AbstractChunk]]):
+        """
+        :param inner: A collection of chunks (E.G. a FolderChunk), or the chunks themselves
+        """
+        self.chunks: List[AbstractChunk] = list(inner.chunks if hasattr(inner, "chunks") else inner)
+        self._by_type: Dict[ChunkType, List[AbstractChunk]] = {}
+        self._by_key: Dict[Tuple[ChunkType, str], List[AbstractChunk]] = {}
+        for c in self.chunks:
+            self._by_type.setdefault(c.header.type, []).append(c)
+            self._by_key.setdefault((c.header.type, c.header.id), []).append(c)
 
     def __len__(self) -> int:
-        if isinstance(self.inner.chunks, Sized):
-            return len(self.inner.chunks)
-        else:
-            return sum(1 for _ in self.inner.chunks)
+        return len(self.chunks)
 
     def get_chunks_by_type(self, chunk_type: ChunkType) -> Iterable[AbstractChunk]:
-        for c in self.inner.chunks:
-            if c.header.type == chunk_type:
-                yield c
+        return iter(self._by_type.get(chunk_type, ()))
 
     @property
     def data_chunks(self) -> Iterable[AbstractChunk]:
@@ -115,9 +120,8 @@ class ChunkCollectionX:
             return self.get_chunk(chunk_id, chunk_type)
 
     def get_chunks(self, chunk_id: str, chunk_type: ChunkType) -> List[AbstractChunk]:
-        return [c for c in self.get_chunks_by_type(chunk_type) if c.header.id == chunk_id]
+        return list(self._by_key.get((chunk_type, chunk_id), ()))
 
     def get_chunk(self, chunk_id: str, chunk_type: ChunkType) -> Optional[AbstractChunk]:
-        for c in self.get_chunks(chunk_id, chunk_type):
-            return c
-        return None
+        chunks = self._by_key.get((chunk_type, chunk_id))
+        return chunks[0] if chunks else None
@@ -3,12 +3,21 @@ from .file import *
 from .folder import *
 from .toc import *
 from .vdrive import *
-from . import common, hierarchy, writer
+from . import common, compression, decompressor, extractor, filesystem, hierarchy, manifest, patcher, payload_cache, validation, vfs, writer
 from . import archive, file, folder, toc, vdrive
 
 __all__ = [
     "common",
+    "compression",
+    "decompressor",
+    "extractor",
+    "filesystem",
     "hierarchy",
+    "manifest",
+    "patcher",
+    "payload_cache",
+    "validation",
+    "vfs",
     "writer",
 ]
 
@@ -1,4 +1,5 @@
 from .archive import Archive, DowIArchive, DowIIArchive, DowIIIArchive
+from .compact import CompactArchive
 from .header import ArchiveHeader, ArchiveVersion, DowIArchiveHeader, DowIIArchiveHeader, DowIIIArchiveHeader, ArchiveMagicWord
 
 __all__ = [
@@ -6,6 +7,7 @@ __all__ = [
     "DowIArchive",
     "DowIIArchive",
     "DowIIIArchive",
+    "CompactArchive",
     "ArchiveHeader",
     "ArchiveVersion",
     "DowIArchiveHeader",
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
+from contextlib import suppress
 from dataclasses import dataclass
-from typing import BinaryIO, List, Type, Dict, TYPE_CHECKING
+from mmap import mmap, ACCESS_READ
+from types import TracebackType
+from typing import Any, BinaryIO, List, Type, Dict, Optional, Union, Iterable, Iterator, Tuple, cast, TYPE_CHECKING
 
 from .header import ArchiveHeader
-from ..common import ArchiveVersion
-from ..hierarchy import DriveCollection, ArchiveWalk, walk
+from ..common import ArchiveVersion, ArchiveIdentity
+from ..hierarchy import DriveCollection, ArchiveWalk, ArchivePathIndex, ArchiveQueryIndex, FlatHierarchy, walk, build_path_index, normalize_path
 from ...common import VersionLike
 
 if TYPE_CHECKING:
+    from ..file.file import File
+    from ..folder.folder import Folder
     from ..toc.toc import ArchiveTableOfContents
+    from ..toc.toc_cache import ArchiveTableOfContentsCache
     from ..toc.toc_headers import ArchiveTableOfContentsHeaders
     from ..toc.toc_ptr import ArchiveTableOfContentsPtr
+    from ..validation import ArchiveValidator
     from ..vdrive.virtual_drive import VirtualDrive
 
 
@@ -21,59 +29,254 @@ class Archive(DriveCollection):
     """Sparse represents whether data was loaded on creation."""
     _sparse: bool
 
-    def __init__(self, header: ArchiveHeader, drives: List[VirtualDrive], _sparse: bool):
+    def __init__(self, header: ArchiveHeader, drives: List[VirtualDrive], _sparse: bool, _data_view: Optional[memoryview] = None, _mapped: Optional[mmap] = None):
         self.header = header
         self._sparse = _sparse
         self.drives = drives
+        self._data_view = _data_view
+        self._mapped = _mapped
+        self._path_index: Optional[ArchivePathIndex] = None
+        self._flat_hierarchy: Optional[FlatHierarchy] = None
+        self._query_index: Optional[ArchiveQueryIndex] = None
+        self._validation: Optional[Future[bool]] = None
+
+    @property
+    def data_view(self) -> Optional[memoryview]:
+        """A view of the archive's data section; only available when the archive was unpacked from a memory map."""
+        return self._data_view
+
+    def close(self) -> None:
+        """
+        Closes the archive's memory map (if it was unpacked from one); file data which are views of the map are unloaded.
+
+        Raises a BufferError if other views of the map (E.G. of data_view, or of a file's data) are still held.
+        """
+        if self._mapped is None:
+            return
+        for _, _, _, files in self.walk():
+            for file in files:
+                if isinstance(file.data, memoryview):
+                    file.data.release()
+                    file.data = None
+        _close_map(self._mapped, self._data_view)
+        self._mapped, self._data_view = None, None
+
+    def __enter__(self) -> Archive:
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            with suppress(BufferError):  # Don't hide the error with one about views the error's traceback may still hold
+                self.close()
+
+    @property
+    def validation(self) -> Optional[Future[bool]]:
+        """The pending checksum validation, when the archive was unpacked with a background validator; its result raises an AssertionError if the checksums do not match."""
+        return self._validation
 
     def walk(self) -> ArchiveWalk:
         return walk(self)
 
+    def build_flat_hierarchy(self) -> FlatHierarchy:
+        """(Re)builds the flattened hierarchy used by iter_files, glob and by_extension; must be called if the hierarchy is modified."""
+        self._flat_hierarchy = FlatHierarchy.build(self)
+        self._query_index = None  # Built from the flattened hierarchy
+        return self._flat_hierarchy
+
+    @property
+    def flat_hierarchy(self) -> FlatHierarchy:
+        return self._flat_hierarchy if self._flat_hierarchy is not None else self.build_flat_hierarchy()
+
+    def iter_files(self, *, prefix: Optional[str] = None, pattern: Optional[str] = None, extensions: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, File]]:
+        """
+        Iterates over every file in the archive, with its full path; unlike walk, folders which cannot match the filters are skipped entirely.
+
+        See FlatHierarchy.walk for details on the filters.
+        """
+        return self.flat_hierarchy.walk(prefix=prefix, pattern=pattern, extensions=extensions)
+
+    @property
+    def query_index(self) -> ArchiveQueryIndex:
+        if self._query_index is None:
+            self._query_index = ArchiveQueryIndex.build(self.flat_hierarchy)
+        return self._query_index
+
+    def glob(self, pattern: str) -> List[Tuple[str, File]]:
+        """
+        Gets every file matching the glob pattern, sorted by path; E.G. archive.glob('data:art/ebps/**/*.whm').
+
+        See ArchiveQueryIndex.glob for details.
+        """
+        return self.query_index.glob(pattern)
+
+    def by_extension(self, *extensions: str) -> List[Tuple[str, File]]:
+        """Gets every file with any of the extensions, sorted by path; E.G. archive.by_extension('.rsh')."""
+        return self.query_index.by_extension(*extensions)
+
+    def build_path_index(self) -> ArchivePathIndex:
+        """(Re)builds the path lookup used by get/get_file/get_folder/exists; must be called if the hierarchy is modified."""
+        self._path_index = build_path_index(self)
+        return self._path_index
+
+    @property
+    def path_index(self) -> ArchivePathIndex:
+        return self._path_index if self._path_index is not None else self.build_path_index()
+
+    def get(self, path: str) -> Optional[Union[VirtualDrive, Folder, File]]:
+        """
+        Gets the drive, folder or file at the given path; paths are case-insensitive and accept either slash.
+
+        :param path: The full path, including the drive; E.G. 'data:/art/ebps/races'
+        :returns: The item at the path, or None if the path does not exist
+        """
+        return self.path_index.get(normalize_path(path))
+
+    def get_file(self, path: str) -> Optional[File]:
+        from ..file.file import File
+        item = self.get(path)
+        return item if isinstance(item, File) else None
+
+    def get_folder(self, path: str) -> Optional[Folder]:
+        from ..folder.folder import Folder
+        item = self.get(path)
+        return item if isinstance(item, Folder) else None
+
+    def exists(self, path: str) -> bool:
+        return normalize_path(path) in self.path_index
+
     @classmethod
-    def _unpack(cls, stream: BinaryIO, header: ArchiveHeader, sparse: bool = True):
-        from ..toc import ArchiveTableOfContents, ArchiveTableOfContentsPtr, ArchiveTableOfContentsHeaders
+    def _unpack_toc_headers(cls, stream: Union[BinaryIO, mmap], header: ArchiveHeader) -> ArchiveTableOfContentsHeaders:
+        from ..toc import ArchiveTableOfContentsPtr, ArchiveTableOfContentsHeaders
         version = header.version
         with header.toc_ptr.stream_jump_to(stream) as handle:
             toc_ptr = ArchiveTableOfContentsPtr.unpack_version(handle, version)
-            toc_headers = ArchiveTableOfContentsHeaders.unpack(handle, toc_ptr, version)
-            toc = ArchiveTableOfContents.create(toc_headers)
+            return ArchiveTableOfContentsHeaders.unpack(handle, toc_ptr, version)
+
+    @classmethod
+    def _unpack(cls, stream: Union[BinaryIO, mmap], header: ArchiveHeader, sparse: bool = True, toc_headers: Optional[ArchiveTableOfContentsHeaders] = None, *, decompress: bool = False, workers: Optional[int] = None,
+                index_paths: bool = True) -> Archive:
+        from ..toc import ArchiveTableOfContents
+        if toc_headers is None:
+            toc_headers = cls._unpack_toc_headers(stream, header)
+        toc = ArchiveTableOfContents.create(toc_headers)
 
         toc.load_toc()
         toc.build_tree()  # ensures walk is unique; avoiding dupes and speeding things up
+
+        mapped = stream if isinstance(stream, mmap) else None
+        data_view = _get_data_view(mapped, header) if mapped is not None else None
         if not sparse:
-            with header.data_ptr.stream_jump_to(stream) as handle:
-                toc.load_data(handle)
+            if data_view is not None:
+                toc.load_data(data_view, decompress, workers)  # Uncompressed files will hold views of the mapped data; not copies
+            else:
+                with header.data_ptr.stream_jump_to(stream) as handle:
+                    toc.load_data(handle, decompress, workers)
 
-        return cls(header, toc.drives, sparse)
+        archive = cls(header, toc.drives, sparse, data_view, mapped)
+        if index_paths:
+            archive.build_path_index()
+        return archive
 
     @classmethod
-    def unpack(cls, stream: BinaryIO, read_magic: bool = True, sparse: bool = True, *, validate: bool = True) -> Archive:
+    def unpack(cls, stream: BinaryIO, read_magic: bool = True, sparse: bool = True, *, validate: bool = True, memory_map: bool = False, toc_cache: Optional[ArchiveTableOfContentsCache] = None, validator: Optional[ArchiveValidator] = None,
+               decompress: bool = False, workers: Optional[int] = None, index_paths: bool = True) -> Archive:
+        """
+        Unpacks an archive from the stream.
+
+        :param stream: The binary stream to read from; must be backed by a file (support fileno) when memory_map is True
+        :param read_magic: When true, the magic word is read and validated
+        :param sparse: When true, file data is not loaded
+        :param validate: When true, header checksums are validated
+        :param memory_map: When true, the archive is read from a read-only memory map of the stream's file; file data will be views of the map instead of copies. The map stays open until the archive is closed (see close)
+        :param toc_cache: When specified, the table of contents is loaded from (or saved to) the cache; on a hit, TOC parsing and checksum validation are skipped. Ignored if the stream is not backed by a named file.
+        :param validator: When specified, checksums are validated by the validator (which may skip verified archives, or validate in the background; see Archive.validation) instead of the header
+        :param decompress: When true (and sparse is false), compressed file data is decompressed while loading
+        :param workers: The number of decompression threads (see ParallelDecompressor); only used when decompressing
+        :param index_paths: When true, the path index used by get/get_file/get_folder/exists is built while unpacking; otherwise, it's built on the first lookup (so names are only decoded as they're used)
+        """
+        identity = ArchiveIdentity.from_stream(stream) if toc_cache or validator else None
+        if not memory_map:
+            return cls._unpack_stream(stream, identity, read_magic, sparse, validate, toc_cache, validator, decompress, workers, index_paths)
+        mapped = _map_stream(stream)
+        try:
+            return cls._unpack_stream(cast(BinaryIO, mapped), identity, read_magic, sparse, validate, toc_cache, validator, decompress, workers, index_paths)
+        except BaseException:
+            with suppress(BufferError):  # Views of the map may still be held; then it's closed once they're collected
+                mapped.close()
+            raise
+
+    @classmethod
+    def _unpack_stream(cls, stream: BinaryIO, identity: Optional[ArchiveIdentity], read_magic: bool, sparse: bool, validate: bool,
+                       toc_cache: Optional[ArchiveTableOfContentsCache], validator: Optional[ArchiveValidator], decompress: bool, workers: Optional[int], index_paths: bool) -> Archive:
         header = ArchiveHeader.unpack(stream, read_magic)
-        if validate:
-            header.validate_checksums(stream)
+
+        cache_key = toc_cache.get_key(identity, header) if toc_cache is not None and identity else None
+        toc_headers = toc_cache.load(cache_key, validate) if toc_cache is not None and cache_key else None
+        validation = None
+        if toc_headers is None:
+            if validate:
+                if validator is None:
+                    header.validate_checksums(stream)
+                elif validator.background and identity:
+                    validation = validator.validate_in_background(identity.path, header, identity=identity)
+                else:
+                    validator.validate(stream, header, identity=identity)
+            toc_headers = cls._unpack_toc_headers(stream, header)
+            if toc_cache is not None and cache_key:
+                # A background validation may yet fail; so the entry can't be marked as validated
+                toc_cache.save(cache_key, toc_headers, validate and validation is None)
+
         class_type = _VERSION_MAP[header.version]
-        return class_type._unpack(stream, header, sparse)  # Defer to subclass (ensures packing works as expected)
+        archive = class_type._unpack(stream, header, sparse, toc_headers, decompress=decompress, workers=workers, index_paths=index_paths)  # Defer to subclass (ensures packing works as expected)
+        archive._validation = validation
+        return archive
+
+    def pack(self, stream: BinaryIO, write_magic: bool = True, **kwargs: Any) -> int:
+        """
+        Packs the archive; see ArchiveWriter.write.
+
+        File data must be loaded (E.G. unpacked with sparse=False) or memory mapped; otherwise, use ArchiveWriter.from_archive with the archive's path.
 
-    def pack(self, stream: BinaryIO, write_magic: bool = True) -> int:
-        raise NotImplementedError
+        :param kwargs: Passed to the writer; see ArchiveWriter.__init__
+        """
+        from ..writer import ArchiveWriter
+        return ArchiveWriter.from_archive(self, **kwargs).write(stream, write_magic)
 
 
 @dataclass(init=False)
 class DowIArchive(Archive):
-    def pack(self, stream: BinaryIO, write_magic: bool = True) -> int:
-        raise NotImplementedError
+    pass
 
 
 @dataclass(init=False)
 class DowIIArchive(Archive):
-    def pack(self, stream: BinaryIO, write_magic: bool = True) -> int:
-        raise NotImplementedError
+    pass
 
 
 @dataclass(init=False)
 class DowIIIArchive(Archive):
-    def pack(self, stream: BinaryIO, write_magic: bool = True) -> int:
-        raise NotImplementedError
+    pass
+
+
+def _map_stream(stream: BinaryIO) -> mmap:
+    # mmap supports read/seek/tell; so it can stand in for the stream while parsing
+    mapped = mmap(stream.fileno(), 0, access=ACCESS_READ)
+    mapped.seek(stream.tell())
+    return mapped
+
+
+def _close_map(mapped: mmap, data_view: Optional[memoryview]) -> None:
+    if data_view is not None:
+        data_view.release()
+    mapped.close()
+
+
+def _get_data_view(mapped: mmap, header: ArchiveHeader) -> memoryview:
+    start = header.data_ptr.offset
+    end = start + header.data_ptr.size if header.data_ptr.size is not None else len(mapped)
+    return memoryview(mapped)[start:end]
 
 
 _VERSION_MAP: Dict[VersionLike, Type[Archive]] = {
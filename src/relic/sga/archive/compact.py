@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from contextlib import suppress
+from dataclasses import dataclass, field
+from mmap import mmap
+from types import TracebackType
+from typing import BinaryIO, Optional, Type, cast, TYPE_CHECKING
+
+from .archive import _map_stream, _get_data_view, _close_map
+from .header import ArchiveHeader
+
+if TYPE_CHECKING:
+    from ..toc.compact import CompactArchiveTableOfContents
+
+
+@dataclass
+class CompactArchive:
+    """
+    An archive backed by a CompactArchiveTableOfContents.
+
+    Unlike Archive, no File/Folder objects are created while unpacking; see CompactArchiveTableOfContents for details.
+    """
+    header: ArchiveHeader
+    toc: CompactArchiveTableOfContents
+    _data_view: Optional[memoryview] = None
+    _mapped: Optional[mmap] = field(default=None, repr=False, compare=False)
+
+    @property
+    def data_view(self) -> Optional[memoryview]:
+        """A view of the archive's data section; only available when the archive was unpacked from a memory map."""
+        return self._data_view
+
+    def close(self) -> None:
+        """Closes the archive's memory map (if it was unpacked from one); raises a BufferError if views of the map (E.G. of data_view) are still held."""
+        if self._mapped is not None:
+            _close_map(self._mapped, self._data_view)
+            self._mapped, self._data_view = None, None
+
+    def __enter__(self) -> CompactArchive:
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            with suppress(BufferError):  # Don't hide the error with one about views the error's traceback may still hold
+                self.close()
+
+    @classmethod
+    def unpack(cls, stream: BinaryIO, read_magic: bool = True, *, validate: bool = True, memory_map: bool = False) -> CompactArchive:
+        from ..toc import ArchiveTableOfContentsPtr, CompactArchiveTableOfContents
+        mapped = _map_stream(stream) if memory_map else None
+        if mapped is not None:
+            stream = cast(BinaryIO, mapped)  # mmap supports read/seek/tell; see _map_stream
+        try:
+            header = ArchiveHeader.unpack(stream, read_magic)
+            if validate:
+                header.validate_checksums(stream)
+            with header.toc_ptr.stream_jump_to(stream) as handle:
+                toc_ptr = ArchiveTableOfContentsPtr.unpack_version(handle, header.version)
+                toc = CompactArchiveTableOfContents.unpack(handle, toc_ptr, header.version)
+        except BaseException:
+            if mapped is not None:
+                mapped.close()  # No views of the map exist yet
+            raise
+        data_view = _get_data_view(mapped, header) if mapped is not None else None
+        return cls(header, toc, data_view, mapped)
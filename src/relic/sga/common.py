@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
-from typing import Optional, Iterator, BinaryIO
+from typing import Optional, Iterator, BinaryIO, Union
 
 from serialization_tools.structx import Struct
 
@@ -51,3 +52,24 @@ class ArchiveRange:
 
     def __next__(self) -> int:
         return next(self.__iterable)
+
+
+@dataclass(frozen=True)
+class ArchiveIdentity:
+    """Identifies an archive on disk; if any field changes, the archive should be assumed to have changed."""
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: Union[str, os.PathLike]) -> ArchiveIdentity:
+        stat = os.stat(path)
+        return cls(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO) -> Optional[ArchiveIdentity]:
+        """Gets the identity of the file backing the stream, or None if the stream is not backed by a named file."""
+        path = getattr(stream, "name", None)
+        if not isinstance(path, (str, bytes, os.PathLike)) or not os.path.isfile(path):
+            return None
+        return cls.from_path(path)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Union
+
+from serialization_tools.size import KiB
+
+from .hierarchy import normalize_extension, split_extension
+
+PayloadData = Union[bytes, bytearray, memoryview]
+
+ALREADY_COMPRESSED_EXTENSIONS = frozenset([
+    ".fda",  # Relic's compressed audio
+    ".ogg", ".mp3", ".bik",
+    ".png", ".jpg", ".jpeg",
+    ".zip", ".gz", ".7z", ".rar", ".sga",
+])
+"""Formats which are already compressed; compressing them again rarely saves anything, but always costs time to decompress."""
+
+
+@dataclass(frozen=True)
+class CompressionMethod:
+    """How a payload is stored; compressed payloads are only kept if they're smaller than the data."""
+    compress: bool
+    level: int = zlib.Z_DEFAULT_COMPRESSION
+    wbits: int = 15
+    """The log2 of zlib's window size; 14 (16 KiB) or 15 (32 KiB). Dawn of War I records the window in each file's compression flag."""
+
+
+STORE = CompressionMethod(False)
+DEFLATE = CompressionMethod(True)
+
+
+class CompressionPolicy(ABC):
+    """Chooses how each file is stored when packing an archive; see ArchiveWriter."""
+
+    @abstractmethod
+    def choose(self, name: str, data: PayloadData) -> CompressionMethod:
+        """
+        :param name: The file's name; E.G. 'unit.whm'
+        :param data: The file's (decompressed) data
+        """
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class FixedCompressionPolicy(CompressionPolicy):
+    """Stores every file with the same method."""
+    method: CompressionMethod = DEFLATE
+
+    def choose(self, name: str, data: PayloadData) -> CompressionMethod:
+        return self.method
+
+
+@dataclass
+class AdaptiveCompressionPolicy(CompressionPolicy):
+    """
+    Chooses per file, from its extension, its size and an estimate of its compressibility.
+
+    Already compressed formats and small files are stored; so they cost nothing to load.
+    Otherwise, a sample of the data is compressed (quickly); data which doesn't compress well enough is stored, without compressing all of it.
+    """
+    level: int = zlib.Z_DEFAULT_COMPRESSION
+    extension_levels: Dict[str, int] = field(default_factory=dict)
+    """Overrides the level for specific extensions; E.G. {'.whm': 9}."""
+    stored_extensions: FrozenSet[str] = ALREADY_COMPRESSED_EXTENSIONS
+    min_size: int = 1 * KiB
+    """Files smaller than this are stored; the savings aren't worth the cost of decompressing them."""
+    small_window_size: int = 256 * KiB
+    """Files smaller than this use a 16 KiB window (which costs less memory to decompress), larger files use a 32 KiB window."""
+    sample_size: int = 64 * KiB
+    """How much of each file is compressed to estimate its compressibility; files no larger than this are sampled whole."""
+    sample_chunks: int = 4
+    """The number of evenly spaced chunks the sample is taken from; so a compressible header doesn't hide incompressible data."""
+    max_ratio: float = 0.9
+    """Files whose sample compresses to more than this fraction of its size are stored."""
+
+    def choose(self, name: str, data: PayloadData) -> CompressionMethod:
+        extension = normalize_extension(split_extension(name))
+        if extension in self.stored_extensions or len(data) < self.min_size:
+            return STORE
+        if self.estimate_ratio(data) > self.max_ratio:
+            return STORE
+        level = self.extension_levels.get(extension, self.level)
+        return CompressionMethod(True, level, 14 if len(data) < self.small_window_size else 15)
+
+    def estimate_ratio(self, data: PayloadData) -> float:
+        """Estimates the compressed size (as a fraction of the data's size) by compressing a sample, at the fastest level."""
+        sample = self.sample(data)
+        if len(sample) == 0:
+            return 1.0
+        return len(zlib.compress(sample, 1)) / len(sample)
+
+    def sample(self, data: PayloadData) -> bytes:
+        if len(data) <= self.sample_size:
+            return bytes(data)
+        view = memoryview(data)
+        chunk_size = self.sample_size // self.sample_chunks
+        stride = (len(data) - chunk_size) // max(self.sample_chunks - 1, 1)
+        return b"".join(view[i * stride:i * stride + chunk_size] for i in range(self.sample_chunks))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, Executor
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union, Deque, TYPE_CHECKING
+
+from .extractor import ExtractionRun
+
+if TYPE_CHECKING:
+    from .file.file import File
+
+FileDataFuture = Future[Union[bytes, memoryview]]
+FileDataResult = Tuple['File', FileDataFuture]
+
+
+def _resolved(result: Union[bytes, memoryview]) -> FileDataFuture:
+    future: FileDataFuture = Future()
+    future.set_result(result)
+    return future
+
+
+def _failed(error: BaseException) -> FileDataFuture:
+    future: FileDataFuture = Future()
+    future.set_exception(error)
+    return future
+
+
+class ParallelDecompressor:
+    """
+    Reads file data sequentially from a single stream, and decompresses it on a thread pool.
+
+    zlib releases the GIL while decompressing, so decompression scales with the number of workers.
+    Results are always yielded in the order the files were given; errors are captured in each file's future, and raised when its result is requested.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        :param workers: The number of decompression threads; defaults to the number of CPUs.
+        :param max_pending: The maximum number of files read ahead of the consumer; bounds memory use. Defaults to twice the number of workers.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+
+    @staticmethod
+    def _submit(executor: Executor, file: File, stream: Union[BinaryIO, memoryview], decompress: bool) -> FileDataFuture:
+        try:
+            buffer = file.read_data(stream)
+        except Exception as e:
+            return _failed(e)
+        return ParallelDecompressor._submit_buffer(executor, file, buffer, decompress)
+
+    @staticmethod
+    def _submit_buffer(executor: Executor, file: File, buffer: Union[bytes, memoryview], decompress: bool) -> FileDataFuture:
+        if decompress and file.expects_decompress:
+            return executor.submit(zlib.decompress, buffer)
+        else:
+            return _resolved(buffer)
+
+    def read_files(self, files: Iterable[File], stream: Union[BinaryIO, memoryview], decompress: bool = True) -> Iterator[FileDataResult]:
+        """
+        Reads (and decompresses) the data of each file.
+
+        :param files: The files to read, in the order results should be yielded
+        :param stream: The archive's data section; either a stream or a memoryview (see File.read_data)
+        :param decompress: When true, compressed data will be decompressed
+        :returns: An iterator of (file, future) pairs; the future's result is the file's data
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            yield from self._iter_bounded((file, self._submit(executor, file, stream, decompress)) for file in files)
+
+    def read_runs(self, runs: Iterable[ExtractionRun], stream: Union[BinaryIO, memoryview], decompress: bool = True) -> Iterator[FileDataResult]:
+        """
+        Like read_files, but reads each run of files (see extractor.plan_extraction) with a single sequential read.
+
+        An error while reading a run is captured in the future of each of its files; as in read_files.
+
+        :returns: An iterator of (file, future) pairs, in the order of the runs
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            yield from self._iter_bounded(self._submit_runs(executor, runs, stream, decompress))
+
+    @staticmethod
+    def _submit_runs(executor: Executor, runs: Iterable[ExtractionRun], stream: Union[BinaryIO, memoryview], decompress: bool) -> Iterator[FileDataResult]:
+        for run in runs:
+            try:
+                buffer = run.read(stream)
+            except Exception as e:
+                for file in run.files:
+                    yield file, _failed(e)
+                continue
+            for file, file_buffer in run.split(buffer):
+                yield file, ParallelDecompressor._submit_buffer(executor, file, file_buffer, decompress)
+
+    def _iter_bounded(self, submitted: Iterable[FileDataResult]) -> Iterator[FileDataResult]:
+        pending: Deque[FileDataResult] = deque()
+        for result in submitted:
+            pending.append(result)
+            if len(pending) >= self.max_pending:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+    def load_files(self, files: Iterable[File], stream: Union[BinaryIO, memoryview], decompress: bool = True) -> None:
+        """Loads the data of each file (see File.load_data); the first error encountered (in order) is raised."""
+        for file, future in self.read_files(files, stream, decompress):
+            file.data = future.result()
+            file._decompressed = decompress
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union, TYPE_CHECKING
+
+from serialization_tools.ioutil import Ptr
+from serialization_tools.size import KiB, MiB
+
+if TYPE_CHECKING:
+    from .file.file import File
+
+DEFAULT_MAX_GAP = 64 * KiB
+DEFAULT_MAX_RUN_SIZE = 16 * MiB
+
+
+@dataclass
+class ExtractionRun:
+    """A contiguous region of the data section, holding the data of one or more files; read with a single sequential read."""
+    offset: int
+    size: int
+    files: List[File] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.size
+
+    def read(self, stream: Union[BinaryIO, memoryview]) -> Union[bytes, memoryview]:
+        """Reads the run from the data section; if stream is a memoryview, a view of the run is returned instead of a copy."""
+        if isinstance(stream, memoryview):
+            return stream[self.offset:self.end]
+        with Ptr(self.offset).stream_jump_to(stream) as handle:
+            return handle.read(self.size)
+
+    def split(self, buffer: Union[bytes, memoryview]) -> Iterator[Tuple[File, memoryview]]:
+        """Splits the run's data (see read) into the (raw; still compressed) data of its files."""
+        buffer = memoryview(buffer)
+        for file in self.files:
+            start = file.header.data_sub_ptr.offset - self.offset
+            yield file, buffer[start:start + file.header.compressed_size]
+
+
+def plan_extraction(files: Iterable[File], max_gap: int = DEFAULT_MAX_GAP, max_run_size: int = DEFAULT_MAX_RUN_SIZE) -> List[ExtractionRun]:
+    """
+    Groups files into runs of (nearly) contiguous data, ordered by their offset in the data section.
+
+    :param files: The files to extract
+    :param max_gap: The largest gap (in bytes) between two files which will be read through instead of seeking over
+    :param max_run_size: The size a run may not grow beyond; bounds memory use. A single file larger than this is given its own run.
+    :returns: The runs, in data section order; reading them in order only ever seeks forward
+    """
+    runs: List[ExtractionRun] = []
+    run = None
+    for file in sorted(files, key=lambda f: f.header.data_sub_ptr.offset):
+        offset, size = file.header.data_sub_ptr.offset, file.header.compressed_size
+        if run is not None and offset <= run.end + max_gap and max(run.end, offset + size) - run.offset <= max_run_size:
+            run.size = max(run.end, offset + size) - run.offset
+            run.files.append(file)
+        else:
+            run = ExtractionRun(offset, size, [file])
+            runs.append(run)
+    return runs
+
+
+def iter_extraction(runs: Iterable[ExtractionRun], stream: Union[BinaryIO, memoryview]) -> Iterator[Tuple[File, Union[bytes, memoryview]]]:
+    """
+    Reads each run, and splits it into the (raw; still compressed) data of its files.
+
+    :param runs: The runs to read, see plan_extraction
+    :param stream: The archive's data section; either a stream or a memoryview (see File.read_data)
+    :returns: An iterator of (file, data) pairs, in data section order
+    """
+    for run in runs:
+        yield from run.split(run.read(stream))
@@ -1,8 +1,10 @@
 from .file import File
+from .reader import FileDataReader
 from .header import FileHeader, DowIFileHeader, DowIIFileHeader, DowIIIFileHeader, FileCompressionFlag
 
 __all__ = [
     "File",
+    "FileDataReader",
     "FileHeader",
     "FileCompressionFlag",
     "DowIFileHeader",
@@ -3,9 +3,11 @@ from __future__ import annotations
 import zlib
 from dataclasses import dataclass
 from pathlib import PurePosixPath
-from typing import BinaryIO, Dict, Optional, TYPE_CHECKING
+from typing import BinaryIO, Mapping, Optional, Union, TYPE_CHECKING
 
 from .header import FileHeader
+from ..hierarchy import LazyName
+from .reader import FileDataReader
 if TYPE_CHECKING:
     from ..folder.folder import Folder
     from ..toc.toc import ArchiveTableOfContents
@@ -13,10 +15,10 @@ if TYPE_CHECKING:
 
 
 @dataclass
-class File:
+class File(LazyName):
     header: FileHeader
     name: str
-    data: Optional[bytes] = None
+    data: Optional[Union[bytes, memoryview]] = None
     _decompressed: bool = False
     _parent: Optional[Folder] = None
     _drive: Optional[VirtualDrive] = None
@@ -51,25 +53,52 @@ class File:
         # noinspection PyTypeChecker
         return File(header, None, None, _decompressed)
 
-    def load_name_from_lookup(self, name_lookup: Dict[int, str]):
-        self.name = name_lookup[self.header.name_sub_ptr.offset]
+    def load_name_from_lookup(self, name_lookup: Mapping[int, str]):
+        """Sets the lookup the file's name is resolved from; the name is only looked up when it is first accessed."""
+        self._defer_name(name_lookup, self.header.name_sub_ptr.offset)
 
     def load_toc(self, toc: ArchiveTableOfContents):
         self.load_name_from_lookup(toc.names)
 
-    def read_data(self, stream: BinaryIO, decompress: bool = False) -> bytes:
-        with self.header.data_sub_ptr.stream_jump_to(stream) as handle:
-            buffer = handle.read(self.header.compressed_size)
-            if decompress and self.expects_decompress:
-                return zlib.decompress(buffer)
-            else:
-                return buffer
+    def read_data(self, stream: Union[BinaryIO, memoryview], decompress: bool = False) -> Union[bytes, memoryview]:
+        """
+        Reads the file's data from the archive's data section.
 
-    def load_data(self, stream: BinaryIO, decompress: bool = False):
+        :param stream: The data section; either a stream, or a memoryview (E.G. of a memory-mapped archive)
+        :param decompress: When true, compressed data will be decompressed
+        :returns: The file's data; if stream is a memoryview and no decompression occurred, a view of the data is returned instead of a copy
+        """
+        if isinstance(stream, memoryview):
+            start = self.header.data_sub_ptr.offset
+            buffer = stream[start:start + self.header.compressed_size]
+        else:
+            with self.header.data_sub_ptr.stream_jump_to(stream) as handle:
+                buffer = handle.read(self.header.compressed_size)
+        if decompress and self.expects_decompress:
+            return zlib.decompress(buffer)
+        else:
+            return buffer
+
+    def open(self, stream: Optional[Union[BinaryIO, memoryview]] = None, decompress: bool = True) -> FileDataReader:
+        """
+        Opens the file's data as a read-only stream; unlike read_data, compressed data is inflated incrementally, in bounded chunks.
+
+        :param stream: The data section; either a stream, or a memoryview (see read_data). If None, the file's loaded data is used.
+        :param decompress: When true, compressed data will be decompressed
+        :returns: A raw (unbuffered) stream; wrap it in an io.BufferedReader for line/peek support
+        """
+        if stream is None:
+            if not self.data_loaded:
+                raise ValueError(f"'{self.name}' has no data loaded; a stream must be specified")
+            source = memoryview(self.data)
+            return FileDataReader(source, 0, len(source), decompress and not self.decompressed, self.header.decompressed_size)
+        return FileDataReader(stream, self.header.data_sub_ptr.offset, self.header.compressed_size, decompress and self.expects_decompress, self.header.decompressed_size)
+
+    def load_data(self, stream: Union[BinaryIO, memoryview], decompress: bool = False):
         self.data = self.read_data(stream, decompress)
         self._decompressed = decompress
 
-    def get_decompressed_data(self) -> bytes:
+    def get_decompressed_data(self) -> Union[bytes, memoryview]:
         if self.decompressed:
             return self.data
         else:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import BinaryIO, ClassVar, Type, Dict
+from typing import BinaryIO, ClassVar, Type, Dict, List, Tuple, Any
 
 from serialization_tools.ioutil import Ptr, WindowPtr
 from serialization_tools.structx import Struct
@@ -40,9 +40,18 @@ class FileHeader:
         raise NotImplementedError
 
     @classmethod
-    def _unpack(cls, stream: BinaryIO) -> FileHeader:
+    def _unpack_tuple(cls, args: Tuple[Any, ...]) -> FileHeader:
         raise NotImplementedError
 
+    @classmethod
+    def _unpack(cls, stream: BinaryIO) -> FileHeader:
+        return cls._unpack_tuple(cls.LAYOUT.unpack_stream(stream))
+
+    @classmethod
+    def _unpack_table(cls, stream: BinaryIO, count: int) -> List[FileHeader]:
+        buffer = stream.read(cls.LAYOUT.size * count)
+        return [cls._unpack_tuple(args) for args in cls.LAYOUT.iter_unpack(buffer)]
+
     def _pack(self, stream: BinaryIO) -> int:
         raise NotImplementedError
 
@@ -51,12 +60,21 @@ class FileHeader:
 
     @classmethod
     def unpack(cls, stream: BinaryIO, version: VersionLike) -> FileHeader:
+        return cls.version_class(version)._unpack(stream)
+
+    @classmethod
+    def unpack_table(cls, stream: BinaryIO, version: VersionLike, count: int) -> List[FileHeader]:
+        """Unpacks a table of `count` headers with a single read."""
+        return cls.version_class(version)._unpack_table(stream, count)
+
+    @classmethod
+    def version_class(cls, version: VersionLike) -> Type[FileHeader]:
         header_class = _HEADER_VERSION_MAP.get(version)
 
         if not header_class:
             raise NotImplementedError(version)
 
-        return header_class._unpack(stream)
+        return header_class
 
 
 @dataclass
@@ -70,8 +88,8 @@ class DowIFileHeader(FileHeader):
 
 
     @classmethod
-    def _unpack(cls, stream: BinaryIO) -> DowIFileHeader:
-        name_offset, compression_flag_value, data_offset, decompressed_size, compressed_size = cls.LAYOUT.unpack_stream(stream)
+    def _unpack_tuple(cls, args: Tuple[Any, ...]) -> DowIFileHeader:
+        name_offset, compression_flag_value, data_offset, decompressed_size, compressed_size = args
         compression_flag = FileCompressionFlag(compression_flag_value)
         name_ptr = Ptr(name_offset)
         data_ptr = WindowPtr(data_offset, compressed_size)
@@ -96,8 +114,8 @@ class DowIIFileHeader(FileHeader):
         return self.compressed_size < self.decompressed_size
 
     @classmethod
-    def _unpack(cls, stream: BinaryIO) -> DowIIFileHeader:
-        name_off, data_off, comp_size, decomp_size, unk_a, unk_b = cls.LAYOUT.unpack_stream(stream)
+    def _unpack_tuple(cls, args: Tuple[Any, ...]) -> DowIIFileHeader:
+        name_off, data_off, comp_size, decomp_size, unk_a, unk_b = args
         # Name, File, Compressed, Decompressed, ???, ???
         name_ptr = Ptr(name_off)
         data_ptr = Ptr(data_off)
@@ -122,8 +140,8 @@ class DowIIIFileHeader(FileHeader):
         return self.unk_a == other.unk_a and self.unk_b == other.unk_b and self.unk_c == other.unk_c and self.unk_d == other.unk_d and self.unk_e == other.unk_e and super().__eq__(other)
 
     @classmethod
-    def _unpack(cls, stream: BinaryIO) -> DowIIIFileHeader:
-        name_off, unk_a, data_off, unk_b, comp_size, decomp_size, unk_c, unk_d, unk_e = cls.LAYOUT.unpack_stream(stream)
+    def _unpack_tuple(cls, args: Tuple[Any, ...]) -> DowIIIFileHeader:
+        name_off, unk_a, data_off, unk_b, comp_size, decomp_size, unk_c, unk_d, unk_e = args
         # assert unk_a == 0, (unk_a, 0)
         # assert unk_b == 0, (unk_b, 0)
         # UNK_D is a new compression flag?!
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import zlib
+from io import RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END, UnsupportedOperation
+from typing import BinaryIO, Optional, Union, TYPE_CHECKING
+
+from serialization_tools.size import KiB
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+_CHUNK_SIZE = 64 * KiB
+
+
+class FileDataReader(RawIOBase):
+    """
+    A read-only stream over a file's data; compressed data is inflated incrementally, in bounded chunks.
+
+    Memory use is bounded by the chunk size (plus the size of each read), regardless of the size of the file.
+    Seeking forward discards data; seeking backward restarts decompression from the beginning of the file.
+    """
+
+    def __init__(self, source: Union[BinaryIO, memoryview], offset: int, size: int, decompress: bool, decompressed_size: Optional[int] = None, chunk_size: int = _CHUNK_SIZE, close_source: bool = False):
+        """
+        :param source: The archive's data section; either a stream or a memoryview. The stream's position is preserved between reads.
+        :param offset: The offset of the file's data within the source
+        :param size: The size of the file's data within the source
+        :param decompress: When true, the data is inflated as it is read
+        :param decompressed_size: The size of the inflated data; required to seek relative to the end when decompressing
+        :param chunk_size: The amount of data read from the source at once
+        :param close_source: When true, the source (if it's a stream) is closed when the reader is closed
+        """
+        super().__init__()
+        self._source = source
+        self._offset = offset
+        self._size = size
+        self._decompress = decompress
+        self._length = decompressed_size if decompress else size
+        self._chunk_size = chunk_size
+        self._close_source = close_source
+        self._restart()
+
+    def _restart(self) -> None:
+        self._consumed = 0  # Bytes read from the source
+        self._position = 0  # Bytes returned to the reader
+        self._buffer: Union[bytes, memoryview] = b""
+        self._buffer_pos = 0
+        self._decompressor = zlib.decompressobj() if self._decompress else None
+
+    def _read_source(self, size: int) -> Union[bytes, memoryview]:
+        size = min(size, self._size - self._consumed)
+        start = self._offset + self._consumed
+        buffer: Union[bytes, memoryview]
+        if isinstance(self._source, memoryview):
+            buffer = self._source[start:start + size]
+        else:
+            prev = self._source.tell()
+            self._source.seek(start)
+            buffer = self._source.read(size)
+            self._source.seek(prev)
+        self._consumed += len(buffer)
+        return buffer
+
+    def _fill(self, size: int) -> bool:
+        """
+        Refills the internal buffer with at most `size` bytes; returns False at the end of the data.
+
+        :raises zlib.error: if the compressed data is truncated, or inflates to a size other than the decompressed size
+        :raises EOFError: if the source ends before the file's data does
+        """
+        if self._decompressor is None:
+            self._buffer = self._read_source(size)
+        else:
+            self._buffer = b""
+            while not self._buffer and not self._decompressor.eof:
+                data = self._decompressor.unconsumed_tail or self._read_source(self._chunk_size)
+                if not data:  # Like zlib.decompress; the data ended before the end of the zlib stream
+                    raise zlib.error(f"Error -5 while decompressing data: incomplete or truncated stream (inflated {self._position} bytes)")
+                self._buffer = self._decompressor.decompress(data, size)
+        self._buffer_pos = 0
+        if not self._buffer and self._length is not None and self._position != self._length:
+            if self._decompressor is None:
+                raise EOFError(f"The source ended after {self._position} of {self._length} bytes.")
+            raise zlib.error(f"Inflated {self._position} bytes; expected {self._length} (the decompressed size).")
+        return len(self._buffer) > 0
+
+    def close(self) -> None:
+        if not self.closed and self._close_source and not isinstance(self._source, memoryview):
+            self._source.close()
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        view = memoryview(buffer).cast("B")
+        size = len(view)
+        if size == 0:
+            return 0
+        if self._buffer_pos >= len(self._buffer) and not self._fill(max(size, self._chunk_size)):
+            return 0
+        part = self._buffer[self._buffer_pos:self._buffer_pos + size]
+        read = len(part)
+        view[:read] = part
+        self._buffer_pos += read
+        self._position += read
+        return read
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_SET:
+            target = offset
+        elif whence == SEEK_CUR:
+            target = self._position + offset
+        elif whence == SEEK_END:
+            if self._length is None:
+                raise UnsupportedOperation("Cannot seek from the end; the decompressed size is unknown.")
+            target = self._length + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence}, should be {SEEK_SET}, {SEEK_CUR} or {SEEK_END})")
+        if target < 0:
+            raise ValueError(f"Negative seek position {target}")
+        if target < self._position:
+            self._restart()
+        while self._position < target:
+            skipped = self.read(min(target - self._position, self._chunk_size))
+            if not skipped:
+                break  # Seeking past the end stops at the end
+        return self._position
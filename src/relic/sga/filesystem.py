@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .hierarchy import folder_basename, normalize_path
+from .payload_cache import PayloadCache
+from .vfs import ArchiveMount
+
+if TYPE_CHECKING:
+    from .archive.archive import Archive
+    from .file.file import File
+    from .folder.folder import Folder
+    from .vdrive.virtual_drive import VirtualDrive
+
+ArchiveFileSystemWalk = Iterator[Tuple[str, List[str], List[str]]]
+
+
+@dataclass(frozen=True)
+class ArchiveStat:
+    """The stat of a path in an archive; directories (drives and folders) have no size."""
+    path: str
+    is_dir: bool
+    compressed_size: int = 0
+    decompressed_size: int = 0
+
+    @property
+    def st_size(self) -> int:
+        return self.decompressed_size
+
+
+@dataclass
+class _Directory:
+    path: str
+    item: Optional[Union[VirtualDrive, Folder]]
+    folders: Dict[str, _Directory] = field(default_factory=dict)
+    files: Dict[str, File] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ArchiveDirEntry:
+    """Mirrors os.DirEntry; see ArchiveFileSystem.scandir."""
+    name: str
+    path: str
+    _fs: ArchiveFileSystem = field(repr=False, compare=False)
+    _directory: Optional[_Directory] = field(default=None, repr=False, compare=False)
+
+    def is_dir(self) -> bool:
+        return self._directory is not None
+
+    def is_file(self) -> bool:
+        return self._directory is None
+
+    def stat(self) -> ArchiveStat:
+        return self._fs.stat(self.path)
+
+
+class ArchiveFileSystem:
+    """
+    A read-only, os-style view of an archive; E.G. listdir('data:/art'), stat('data:/art/ebps/races.lua').
+
+    Child tables for every drive and folder are built once, up front; so listing and lookups never walk the hierarchy.
+    The root ('') lists the archive's drives (E.G. 'data:'); like Archive.get, paths are case-insensitive and accept either slash.
+    """
+
+    def __init__(self, archive: Archive, path: Optional[Union[str, os.PathLike[str]]] = None, cache: Optional[PayloadCache] = None):
+        """
+        :param archive: The archive to view
+        :param path: The archive's file; required to open files unless the archive was memory mapped or unpacked with its data
+        :param cache: When specified, payloads returned by read are cached
+        """
+        self.archive = archive
+        self._mount = ArchiveMount(0, 0, archive, Path(path) if path is not None else None, cache)
+        self._root = _Directory("", None)
+        self._directories: Dict[str, _Directory] = {"": self._root}
+        self._files: Dict[str, Tuple[str, File]] = {}
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        from .vdrive.virtual_drive import VirtualDrive
+        # Items are pushed in reverse; so each table is filled in archive order
+        pending: List[Tuple[_Directory, Union[VirtualDrive, Folder]]] = [(self._root, drive) for drive in reversed(self.archive.drives)]
+        while pending:
+            parent, item = pending.pop()
+            if isinstance(parent.item, VirtualDrive) and item.name == "":
+                directory = parent  # The drive's root folder; its files and folders are the drive's
+            else:
+                name = item.path + ":" if isinstance(item, VirtualDrive) else folder_basename(item.name)
+                directory = _Directory(_join(parent.path, name), item)
+                parent.folders[name] = directory
+                self._directories[normalize_path(directory.path)] = directory
+            for file in item.files:
+                directory.files[file.name] = file
+                file_path = _join(directory.path, file.name)
+                self._files[normalize_path(file_path)] = file_path, file
+            pending.extend((directory, folder) for folder in reversed(item.sub_folders))
+
+    def _get_directory(self, path: str) -> _Directory:
+        key = normalize_path(path) if path else ""
+        directory = self._directories.get(key)
+        if directory is None:
+            if key in self._files:
+                raise NotADirectoryError(path)
+            raise FileNotFoundError(path)
+        return directory
+
+    def _get_file(self, path: str) -> Tuple[str, File]:
+        result = self._files.get(normalize_path(path))
+        if result is None:
+            if normalize_path(path) in self._directories:
+                raise IsADirectoryError(path)
+            raise FileNotFoundError(path)
+        return result
+
+    def exists(self, path: str) -> bool:
+        key = normalize_path(path) if path else ""
+        return key in self._directories or key in self._files
+
+    def isdir(self, path: str) -> bool:
+        return (normalize_path(path) if path else "") in self._directories
+
+    def isfile(self, path: str) -> bool:
+        return normalize_path(path) in self._files
+
+    def listdir(self, path: str = "") -> List[str]:
+        directory = self._get_directory(path)
+        return list(directory.folders) + list(directory.files)
+
+    def scandir(self, path: str = "") -> Iterator[ArchiveDirEntry]:
+        directory = self._get_directory(path)
+        for name, sub_directory in directory.folders.items():
+            yield ArchiveDirEntry(name, sub_directory.path, self, sub_directory)
+        for name in directory.files:
+            yield ArchiveDirEntry(name, _join(directory.path, name), self)
+
+    def stat(self, path: str) -> ArchiveStat:
+        key = normalize_path(path) if path else ""
+        directory = self._directories.get(key)
+        if directory is not None:
+            return ArchiveStat(directory.path, True)
+        file_path, file = self._get_file(path)
+        return ArchiveStat(file_path, False, file.header.compressed_size, file.header.decompressed_size)
+
+    def open(self, path: str, decompress: bool = True) -> BinaryIO:
+        """Opens the file as a read-only stream; see File.open."""
+        _, file = self._get_file(path)
+        return self._mount.open(file, decompress)
+
+    def read(self, path: str, decompress: bool = True) -> Union[bytes, memoryview]:
+        _, file = self._get_file(path)
+        return self._mount.read(file, decompress)
+
+    def walk(self, top: str = "", topdown: bool = True) -> ArchiveFileSystemWalk:
+        """Mirrors os.walk; yields (path, folder names, file names) for every directory under (and including) top."""
+        directory = self._get_directory(top)
+        if topdown:
+            pending = [directory]
+            while pending:
+                directory = pending.pop()
+                folder_names = list(directory.folders)
+                yield directory.path, folder_names, list(directory.files)
+                # Like os.walk, folder names may be removed (in place) to prune the walk
+                pending.extend(directory.folders[name] for name in reversed(folder_names) if name in directory.folders)
+        else:
+            unvisited: List[Tuple[_Directory, bool]] = [(directory, False)]
+            while unvisited:
+                directory, visited = unvisited.pop()
+                if visited:
+                    yield directory.path, list(directory.folders), list(directory.files)
+                else:
+                    unvisited.append((directory, True))
+                    unvisited.extend((sub_directory, False) for sub_directory in reversed(directory.folders.values()))
+
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent}/{name}" if parent else name
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import PurePosixPath
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import List, Mapping, Optional, TYPE_CHECKING
 
-from ..hierarchy import DriveChild, FolderCollection, FileCollection, FolderChild, walk
+from ..hierarchy import DriveChild, FolderCollection, FileCollection, FolderChild, LazyName, walk
 
 if TYPE_CHECKING:
     from ..file.file import File
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
 
 
 @dataclass
-class Folder(FolderCollection, FileCollection, FolderChild, DriveChild):
+class Folder(FolderCollection, FileCollection, FolderChild, DriveChild, LazyName):
     header: FolderHeader
     name: str
 
@@ -50,8 +50,9 @@ class Folder(FolderCollection, FileCollection, FolderChild, DriveChild):
         self.load_files(toc.files)
         self.load_name_from_lookup(toc.names)
 
-    def load_name_from_lookup(self, name_lookup: Dict[int, str]):
-        self.name = name_lookup[self.header.name_offset]
+    def load_name_from_lookup(self, name_lookup: Mapping[int, str]):
+        """Sets the lookup the folder's name is resolved from; the name is only looked up when it is first accessed."""
+        self._defer_name(name_lookup, self.header.name_offset)
 
     def load_folders(self, folders: List[Folder]):
         if self.header.sub_folder_range.start < len(folders):
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import re
+from bisect import bisect_left
 from dataclasses import dataclass
 from pathlib import PurePath
-from typing import List, Optional, Union, Tuple, Iterable, TYPE_CHECKING
+from typing import List, Mapping, NamedTuple, Optional, Union, Tuple, Iterable, Iterator, Dict, FrozenSet, Pattern, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .file import File
@@ -35,6 +37,28 @@ class DriveChild:
     _drive: Optional[VirtualDrive]
 
 
+class LazyName:
+    """
+    A file or folder whose name can be looked up (in the TOC's name table) when it is first read, instead of when it is loaded.
+
+    'name' remains an ordinary (dataclass) field; a deferred name is only missing from the instance until it is looked up, so __init__, __eq__ and __repr__ all see the resolved name.
+    """
+    name: str
+
+    def _defer_name(self, name_lookup: Mapping[int, str], offset: int) -> None:
+        self.__dict__.pop("name", None)
+        self.__dict__["_deferred_name"] = name_lookup, offset
+
+    if not TYPE_CHECKING:  # Hidden from type checkers; otherwise any attribute would type check
+        def __getattr__(self, attr: str) -> str:
+            deferred = self.__dict__.pop("_deferred_name", None) if attr == "name" else None
+            if deferred is None:
+                raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+            name_lookup, offset = deferred
+            self.name = name_lookup[offset]
+            return self.name
+
+
 ArchivePath = PurePath
 
 if TYPE_CHECKING:
@@ -75,3 +99,288 @@ def walk(collection: Union[DriveCollection, FolderCollection, FileCollection]) -
             d = d or root_drive
             f = f or folder or root_folder
             yield d, f, folds, files
+
+
+if TYPE_CHECKING:
+    ArchivePathIndex = Dict[str, Union[VirtualDrive, Folder, File]]
+else:
+    ArchivePathIndex = Dict[str, Union['VirtualDrive', 'Folder', 'File']]
+
+
+def normalize_path(path: Union[str, PurePath]) -> str:
+    """
+    Normalizes an archive path for lookups; mimicking the game, paths are case-insensitive and accept either slash.
+
+    E.G. 'Data:\\Art\\EBPs/races' and 'data:/art/ebps/races/' both become 'data:/art/ebps/races'
+    """
+    path = str(path).replace("\\", "/").lower()
+    drive, sep, path = path.rpartition(":")
+    parts = "/".join(part for part in path.split("/") if part and part != ".")
+    return f"{drive}:/{parts}" if sep else parts
+
+
+def folder_basename(name: str) -> str:
+    """Folder names are paths relative to their drive; E.G. 'art\\ebps' becomes 'ebps'."""
+    return name.replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
+
+
+def build_path_index(collection: Union[DriveCollection, FolderCollection, FileCollection]) -> ArchivePathIndex:
+    index: ArchivePathIndex = {}
+    for drive in (collection.drives if isinstance(collection, DriveCollection) else []):
+        index.setdefault(normalize_path(drive.full_path), drive)
+        for file in drive.files:  # walk skips files at the root of a drive
+            index.setdefault(normalize_path(file.full_path), file)
+    for _, _, folders, files in walk(collection):
+        for folder in folders:
+            index.setdefault(normalize_path(folder.full_path), folder)
+        for file in files:
+            index.setdefault(normalize_path(file.full_path), file)
+    return index
+
+
+_GLOB_CHARS = "*?["
+
+
+def split_extension(path: str) -> str:
+    """
+    Gets the extension of the last part of a path; E.G. 'art/ebps/unit.whm' becomes '.whm'.
+
+    Unlike os.path.splitext, a leading dot starts an extension; so '*.whm' never matches a file without the '.whm' extension.
+    """
+    name = path.rsplit("/", 1)[-1]
+    dot = name.rfind(".")
+    return name[dot:] if dot >= 0 else ""
+
+
+def normalize_extension(extension: str) -> str:
+    """E.G. 'WHM' and '.whm' both become '.whm'; '' (no extension) is unchanged."""
+    extension = extension.lower()
+    return extension if not extension or extension.startswith(".") else "." + extension
+
+
+def glob_prefix(pattern: str) -> str:
+    """Gets the literal directory prefix of a (normalized) glob pattern; E.G. 'data:/art/ebps/**/*.whm' becomes 'data:/art/ebps'."""
+    parts = pattern.split("/")
+    for i, part in enumerate(parts):
+        if any(c in part for c in _GLOB_CHARS):
+            return "/".join(parts[:i])
+    return "/".join(parts[:-1])
+
+
+def compile_glob(pattern: str) -> Pattern[str]:
+    """
+    Compiles a glob pattern into a regex over normalized paths (see normalize_path).
+
+    '*' and '?' never match a slash; '**' matches any number of folders (including none).
+    """
+    pattern = normalize_path(pattern)
+    regex, i = "", 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if c == "*":
+            regex += "[^/]*"
+        elif c == "?":
+            regex += "[^/]"
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            regex += "[" + ("^" + body[1:] if body.startswith("!") else body) + "]"
+            i = end
+        else:
+            regex += re.escape(c)
+        i += 1
+    return re.compile(regex + r"\Z")
+
+
+def _is_within(key: str, prefix: str) -> bool:
+    # Whether key is prefix, or under it
+    prefix = prefix.rstrip("/")
+    return key.rstrip("/") == prefix or key.startswith(prefix + "/")
+
+
+class _PendingFolder(NamedTuple):
+    folder: Optional[Union[VirtualDrive, Folder]]
+    """The folder (or drive) to visit; None to close the subtree of the folder at folder_index."""
+    path: str = ""
+    folder_index: int = -1
+
+
+@dataclass
+class FlatHierarchy:
+    """
+    A flattened, pre-order copy of an archive's hierarchy; walked with a loop instead of recursive generators.
+
+    Folder i's subtree is folders[i:subtree_ends[i]]; its own files are files[file_starts[i]:file_ends[i]].
+    Drives are stored as folders (at the root of their subtree). Full paths (and their normalized keys) are computed once, when built.
+    """
+    folders: List[Union[VirtualDrive, Folder]]
+    folder_paths: List[str]
+    folder_keys: List[str]
+    subtree_ends: List[int]
+    file_starts: List[int]
+    file_ends: List[int]
+    subtree_extensions: List[FrozenSet[str]]
+    files: List[File]
+    file_paths: List[str]
+    file_keys: List[str]
+
+    @classmethod
+    def build(cls, collection: Union[DriveCollection, VirtualDrive, Folder]) -> FlatHierarchy:
+        from .vdrive import VirtualDrive
+        flat = cls([], [], [], [], [], [], [], [], [], [])
+        roots: List[Union[VirtualDrive, Folder]] = list(collection.drives) if isinstance(collection, DriveCollection) else [collection]
+        # Iterative pre-order; a pending item without a folder closes the subtree of the folder at its index
+        pending: List[_PendingFolder] = []
+        for root in reversed(roots):
+            path = root.path + ":/" if isinstance(root, VirtualDrive) else str(root.full_path).replace("\\", "/")
+            pending.append(_PendingFolder(root, path))
+        while pending:
+            item, path, index = pending.pop()
+            if item is None:  # Closing a subtree
+                end = flat.subtree_ends[index] = len(flat.folders)
+                extensions = set(split_extension(key) for key in flat.file_keys[flat.file_starts[index]:flat.file_ends[index]])
+                child = index + 1
+                while child < end:  # Children are closed before their parent
+                    extensions.update(flat.subtree_extensions[child])
+                    child = flat.subtree_ends[child]
+                flat.subtree_extensions[index] = frozenset(extensions)
+                continue
+            index = len(flat.folders)
+            flat.folders.append(item)
+            flat.folder_paths.append(path)
+            flat.folder_keys.append(normalize_path(path))
+            flat.subtree_ends.append(-1)
+            flat.subtree_extensions.append(frozenset())
+            flat.file_starts.append(len(flat.files))
+            separator = "" if path.endswith("/") else "/"
+            for file in item.files:
+                file_path = path + separator + file.name
+                flat.files.append(file)
+                flat.file_paths.append(file_path)
+                flat.file_keys.append(normalize_path(file_path))
+            flat.file_ends.append(len(flat.files))
+            pending.append(_PendingFolder(None, folder_index=index))
+            for folder in reversed(item.sub_folders):
+                # Folder names are paths relative to their drive; so they're joined to the drive, not the parent folder
+                drive = folder._drive
+                base = drive.path + ":/" if drive is not None else ""
+                pending.append(_PendingFolder(folder, base + folder.name.replace("\\", "/")))
+        return flat
+
+    def walk(self, *, prefix: Optional[str] = None, pattern: Optional[str] = None, extensions: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, File]]:
+        """
+        Iterates over every file in the hierarchy (in pre-order); subtrees which cannot match the filters are skipped without being visited.
+
+        :param prefix: Only files under this path are included; E.G. 'data:/art/ebps'
+        :param pattern: Only files matching this glob pattern are included (see compile_glob); E.G. 'data:/art/**/*.whm'
+        :param extensions: Only files with one of these extensions are included; E.G. ['.whm', 'rsh']
+        :returns: An iterator of (full path, file) pairs
+        """
+        prefixes = []
+        if prefix is not None:
+            prefixes.append(normalize_path(prefix))
+        regex = None
+        if pattern is not None:
+            regex = compile_glob(pattern)
+            prefixes.append(glob_prefix(normalize_path(pattern)))
+        wanted = frozenset(normalize_extension(e) for e in extensions) if extensions is not None else None
+
+        folder_keys, subtree_ends, file_keys = self.folder_keys, self.subtree_ends, self.file_keys
+        i, count = 0, len(self.folders)
+        while i < count:
+            key = folder_keys[i]
+            # Skip the subtree if it can't contain a match; it must be under every prefix, or on the way to it
+            if any(not _is_within(key, p) and not _is_within(p, key) for p in prefixes) or (wanted is not None and wanted.isdisjoint(self.subtree_extensions[i])):
+                i = subtree_ends[i]
+                continue
+            for f in range(self.file_starts[i], self.file_ends[i]):
+                file_key = file_keys[f]
+                if wanted is not None and split_extension(file_key) not in wanted:
+                    continue
+                if prefixes and not all(_is_within(file_key, p) for p in prefixes):
+                    continue
+                if regex is not None and not regex.match(file_key):
+                    continue
+                yield self.file_paths[f], self.files[f]
+            i += 1
+
+
+def glob_extension(pattern: str) -> Optional[str]:
+    """Gets the extension every match of a (normalized) glob pattern must have, if any; E.G. 'data:/art/**/*.whm' gives '.whm'."""
+    extension = split_extension(pattern)
+    if not extension or any(c in extension for c in _GLOB_CHARS + "]"):
+        return None
+    return extension
+
+
+@dataclass
+class ArchiveQueryIndex:
+    """
+    Secondary indexes over an archive's files; so a glob or extension query costs (roughly) the number of results, instead of a walk of the archive.
+
+    File keys (see normalize_path) are sorted, so every file under a folder is a contiguous range, found by bisection.
+    Each extension maps to the (sorted) positions of its files; a glob with a literal extension only checks files under its prefix with that extension.
+    """
+    keys: List[str]
+    entries: List[Tuple[str, File]]
+    """(Full path, file) pairs; aligned with keys."""
+    extensions: Dict[str, List[int]]
+
+    @classmethod
+    def build(cls, flat: FlatHierarchy) -> ArchiveQueryIndex:
+        order = sorted(range(len(flat.files)), key=flat.file_keys.__getitem__)
+        index = cls([flat.file_keys[i] for i in order], [(flat.file_paths[i], flat.files[i]) for i in order], {})
+        for position, key in enumerate(index.keys):
+            index.extensions.setdefault(split_extension(key), []).append(position)
+        return index
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Gets the range of positions of every file under the (normalized) prefix; a file's own path is also its prefix."""
+        prefix = prefix.rstrip("/")
+        if not prefix:
+            return 0, len(self.keys)
+        start = bisect_left(self.keys, prefix)
+        if start < len(self.keys) and self.keys[start] == prefix:
+            return start, start + 1
+        # '0' follows '/'; so keys under the prefix are before prefix + '0'
+        return bisect_left(self.keys, prefix + "/"), bisect_left(self.keys, prefix + "0")
+
+    def glob(self, pattern: str) -> List[Tuple[str, File]]:
+        """
+        Gets every file matching the glob pattern (see compile_glob), sorted by path.
+
+        :param pattern: E.G. 'data:/art/ebps/**/*.whm'; like Archive.get, paths are case-insensitive and accept either slash
+        :returns: A list of (full path, file) pairs
+        """
+        pattern = normalize_path(pattern)
+        regex = compile_glob(pattern)
+        start, end = self.prefix_range(glob_prefix(pattern))
+        extension = glob_extension(pattern)
+        candidates: Iterable[int]
+        if extension is not None:
+            positions = self.extensions.get(extension, [])
+            candidates = positions[bisect_left(positions, start):bisect_left(positions, end)]
+        else:
+            candidates = range(start, end)
+        keys, entries = self.keys, self.entries
+        return [entries[i] for i in candidates if regex.match(keys[i])]
+
+    def by_extension(self, *extensions: str) -> List[Tuple[str, File]]:
+        """
+        Gets every file with any of the extensions, sorted by path.
+
+        :param extensions: E.G. '.rsh', 'WHM'; extensions are case-insensitive and the leading dot is optional
+        :returns: A list of (full path, file) pairs
+        """
+        positions = set()
+        for extension in set(normalize_extension(e) for e in extensions):
+            positions.update(self.extensions.get(extension, []))
+        return [self.entries[i] for i in sorted(positions)]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional, Union, TYPE_CHECKING
+
+from .common import ArchiveIdentity
+
+if TYPE_CHECKING:
+    from .file.file import File
+
+MANIFEST_NAME = ".sga-manifest.json"
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Records where an extracted file came from; crc32 is the checksum of the file's raw (possibly compressed) data in the archive."""
+    archive: ArchiveIdentity
+    offset: int
+    compressed_size: int
+    decompressed_size: int
+    crc32: int
+
+    @classmethod
+    def create(cls, identity: ArchiveIdentity, file: File, data: Union[bytes, memoryview]) -> ManifestEntry:
+        """:param data: The file's raw data, as stored in the archive (see File.read_data)"""
+        return cls(identity, file.header.data_sub_ptr.offset, file.header.compressed_size, file.header.decompressed_size, zlib.crc32(data))
+
+    def matches_header(self, file: File) -> bool:
+        return self.offset == file.header.data_sub_ptr.offset and self.compressed_size == file.header.compressed_size and self.decompressed_size == file.header.decompressed_size
+
+    def matches_data(self, file: File, data: Union[bytes, memoryview]) -> bool:
+        return self.compressed_size == file.header.compressed_size and self.decompressed_size == file.header.decompressed_size and self.crc32 == zlib.crc32(data)
+
+
+class ExtractionManifest:
+    """
+    Records the files extracted from an archive; allowing a later extraction to skip files which have not changed.
+
+    While the archive's identity is unchanged (since the file was extracted), a file whose entry matches its header (and whose output exists) is up to date; no data needs to be read.
+    Once the archive changes (E.G. after a patch), offsets are no longer trustworthy; files must be read, and are only up to date if their checksum matches.
+    Entries are only added after a file is written; saving periodically allows an interrupted extraction to resume.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike[str]], entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike[str]]) -> ExtractionManifest:
+        """Loads the manifest at the path; a missing or unreadable manifest is treated as empty."""
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data["version"] != _FORMAT_VERSION:
+                return cls(path)
+            archives = [ArchiveIdentity(**identity) for identity in data["archives"]]
+            entries = {name: ManifestEntry(archives[archive], *fields) for name, (archive, *fields) in data["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return cls(path)
+        return cls(path, entries)
+
+    def save(self) -> None:
+        archives: Dict[ArchiveIdentity, int] = {}  # Identities are shared by most entries; so they are only stored once
+        files = {}
+        for name, entry in self.entries.items():
+            archive = archives.setdefault(entry.archive, len(archives))
+            files[name] = [archive, entry.offset, entry.compressed_size, entry.decompressed_size, entry.crc32]
+        data = {
+            "version": _FORMAT_VERSION,
+            "archives": [asdict(identity) for identity in archives],
+            "files": files
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(temp_path, self.path)  # Never leave a partially written manifest behind
+
+    def is_up_to_date(self, name: str, file: File, output_path: Union[str, os.PathLike[str]], identity: ArchiveIdentity) -> bool:
+        """
+        Checks whether the file is up to date, without reading its data.
+
+        :param name: The file's name in the manifest (its path relative to the output)
+        :param file: The file in the archive
+        :param output_path: Where the file was extracted to
+        :param identity: The identity of the archive being extracted
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry.archive != identity or not entry.matches_header(file):
+            return False
+        try:
+            return os.stat(output_path).st_size == file.header.decompressed_size
+        except OSError:
+            return False
+
+    def can_verify(self, name: str, file: File, output_path: Union[str, os.PathLike[str]]) -> bool:
+        """Checks whether the file may be up to date, but its data must be read (see matches_data) to be sure."""
+        entry = self.entries.get(name)
+        if entry is None or entry.compressed_size != file.header.compressed_size:
+            return False
+        try:
+            return os.stat(output_path).st_size == file.header.decompressed_size
+        except OSError:
+            return False
+
+    def matches_data(self, name: str, file: File, data: Union[bytes, memoryview]) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry.matches_data(file, data)
+
+    def update(self, name: str, identity: ArchiveIdentity, file: File, data: Union[bytes, memoryview]) -> None:
+        """Records the file as extracted (or verified); data is the file's raw data, as stored in the archive."""
+        self.entries[name] = ManifestEntry.create(identity, file, data)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from serialization_tools.size import KiB
+
+from .archive.archive import Archive
+from .writer import ArchiveWriter, PackEntry, PackSource
+
+DEFAULT_TOC_RESERVE = 64 * KiB
+
+
+@dataclass(frozen=True)
+class PatchResult:
+    in_place: bool
+    """False when the new TOC didn't fit before the data section, and the archive was compacted (rewritten) instead."""
+    size: int
+    """The archive's size after the patch."""
+    dead_bytes: int
+    """The bytes of the data section no longer referenced by any file; reclaimed by ArchivePatcher.compact."""
+
+
+def measure_dead_bytes(archive: Archive, data_size: int) -> int:
+    """Measures the bytes of the data section which aren't referenced by any file; files may share (or overlap) payloads."""
+    ranges = sorted((file.header.data_sub_ptr.offset, file.header.data_sub_ptr.offset + file.header.compressed_size) for _, file in archive.iter_files())
+    live, covered_to = 0, 0
+    for start, end in ranges:
+        start = max(start, covered_to)
+        if end > start:
+            live += end - start
+            covered_to = end
+    return max(data_size - live, 0)
+
+
+class ArchivePatcher:
+    """
+    Updates an archive on disk without repacking it; changed and added files are appended to the data section, and the TOC and header are rewritten.
+
+    Unchanged payloads are never read or recompressed; replaced (or removed) payloads are left as dead space, until the archive is compacted.
+    The archive's TOC must fit in the space before its data section; archives written by the patcher (see compact) reserve space for the TOC to grow.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike[str]], *, validate: bool = False, toc_reserve: int = DEFAULT_TOC_RESERVE, **kwargs: Any) -> None:
+        """
+        :param path: The archive to update
+        :param validate: When true, the archive's checksums are validated when it's loaded
+        :param toc_reserve: The bytes reserved after the TOC when the archive is compacted; see ArchiveWriter.write
+        :param kwargs: Passed to the writer; see ArchiveWriter.__init__
+        """
+        self.path = Path(path)
+        self.toc_reserve = toc_reserve
+        self._writer_kwargs = kwargs
+        self._load(validate)
+
+    def _load(self, validate: bool = False) -> None:
+        with open(self.path, "rb") as handle:
+            self.archive = Archive.unpack(handle, validate=validate)
+        self.writer = ArchiveWriter.from_archive(self.archive, self.path, keep_payloads=True, **self._writer_kwargs)
+
+    @property
+    def dead_bytes(self) -> int:
+        data_size = os.path.getsize(self.path) - self.archive.header.data_ptr.offset
+        return measure_dead_bytes(self.archive, data_size)
+
+    def add_file(self, path: str, source: PackSource, compress: Optional[bool] = None) -> PackEntry:
+        """Adds (or replaces) a file; see ArchiveWriter.add_file. The archive isn't modified until commit is called."""
+        return self.writer.add_file(path, source, compress, replace=True)
+
+    def remove_file(self, path: str) -> PackEntry:
+        """Removes a file; see ArchiveWriter.remove_file. The archive isn't modified until commit is called."""
+        return self.writer.remove_file(path)
+
+    def commit(self) -> PatchResult:
+        """
+        Writes pending changes to the archive; in place if possible, otherwise by compacting it.
+
+        The archive is reloaded afterwards; so further changes may be made.
+        """
+        with open(self.path, "r+b") as handle:
+            in_place = self.writer.patch(handle, self.archive.header)
+        if in_place:
+            self._load()
+        else:
+            self.compact()
+        return PatchResult(in_place, os.path.getsize(self.path), self.dead_bytes)
+
+    def compact(self, output: Optional[Union[str, os.PathLike[str]]] = None) -> int:
+        """
+        Rewrites the archive without dead space, including any pending changes; unchanged payloads are copied as-is (never recompressed).
+
+        :param output: Where to write the compacted archive; defaults to replacing the archive (via a temporary file, so it's never left half written)
+        :returns: The compacted archive's size
+        """
+        output = Path(output) if output is not None else self.path
+        temp_path = output.with_name(output.name + ".tmp")
+        with open(temp_path, "w+b") as handle:
+            size = self.writer.write(handle, toc_reserve=self.toc_reserve)
+        os.replace(temp_path, output)
+        if output == self.path:
+            self._load()
+        return size
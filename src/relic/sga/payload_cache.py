@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from serialization_tools.size import MiB
+
+DEFAULT_BUDGET = 64 * MiB
+
+
+@dataclass(frozen=True)
+class PayloadCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    """The number of bytes currently cached."""
+    count: int
+    """The number of payloads currently cached."""
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class PayloadCache:
+    """
+    A thread-safe, least-recently-used cache of file payloads (typically decompressed data), bounded by a byte budget.
+
+    A cache may be shared; E.G. by every mount of an OverlayFileSystem, or by the workers of a conversion pipeline.
+    Concurrent misses for the same key may each load the payload; the last one loaded is kept.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        """
+        :param budget: The maximum number of bytes cached; payloads larger than the budget are never cached.
+        """
+        self.budget = budget
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> PayloadCacheStats:
+        with self._lock:
+            return PayloadCacheStats(self._hits, self._misses, self._evictions, self._size, len(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Gets a cached payload (marking it as recently used), or None if it is not cached."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: Hashable, payload: bytes) -> None:
+        size = len(payload)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            if size > self.budget:
+                return
+            self._entries[key] = payload
+            self._size += size
+            while self._size > self.budget:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], bytes]) -> bytes:
+        """Gets a cached payload; on a miss, the payload is loaded (outside the lock) and cached."""
+        payload = self.get(key)
+        if payload is None:
+            payload = loader()
+            self.put(key, payload)
+        return payload
+
+    def clear(self) -> None:
+        """Discards every cached payload, and resets the stats."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._misses = self._evictions = 0
@@ -1,11 +1,19 @@
+from .compact import CompactArchiveTableOfContents, CompactFolderTable, CompactFileTable
+from .name_table import NameTable
 from .toc import ArchiveTableOfContents
+from .toc_cache import ArchiveTableOfContentsCache
 from .toc_headers import ArchiveTableOfContentsHeaders
 from .toc_ptr import ArchiveTableOfContentsPtr, TocItemPtr, DowIArchiveToCPtr, DowIIArchiveToCPtr, DowIIIArchiveToCPtr
 
 __all__ = [
     "ArchiveTableOfContentsHeaders",
+    "ArchiveTableOfContentsCache",
     "ArchiveTableOfContentsPtr",
     "ArchiveTableOfContents",
+    "CompactArchiveTableOfContents",
+    "CompactFolderTable",
+    "CompactFileTable",
+    "NameTable",
     "TocItemPtr",
     "DowIArchiveToCPtr",
     "DowIIArchiveToCPtr",
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from typing import BinaryIO, Dict, List, Optional, Type, TYPE_CHECKING
+
+from serialization_tools.ioutil import Ptr, WindowPtr
+
+from ..common import ArchiveRange
+from ..file.header import FileHeader, DowIFileHeader, FileCompressionFlag
+from ..folder.header import FolderHeader
+from ..vdrive.header import VirtualDriveHeader
+from .name_table import NameTable
+from .toc_headers import ArchiveTableOfContentsHeaders
+from .toc_ptr import ArchiveTableOfContentsPtr
+from ...common import VersionLike
+
+if TYPE_CHECKING:
+    from ..file.file import File
+    from ..folder.folder import Folder
+    from ..vdrive.virtual_drive import VirtualDrive
+
+NO_PARENT = -1
+NO_DRIVE = -1
+
+# Columns use explicitly sized typecodes; 'L' and 'l' are 8 bytes on most 64-bit platforms, but every TOC field fits in 32 bits
+_UINT32 = "I"
+_INT32 = "i"
+_FILE_HEADER_FIELDS = frozenset(f.name for f in fields(FileHeader))
+
+
+def _column(typecode: str, count: int, fill: int = 0) -> array[int]:
+    return array(typecode, [fill]) * count
+
+
+def _assign_parent(parents: array[int], child_range: ArchiveRange, parent: int) -> None:
+    # Mirrors Folder.load_folders/load_files; ranges starting past the table are ignored
+    if child_range.start < len(parents):
+        end = min(child_range.end, len(parents))
+        parents[child_range.start:end] = _column(parents.typecode, end - child_range.start, parent)
+
+
+@dataclass
+class CompactFolderTable:
+    """Folder headers stored as parallel columns; one entry per folder."""
+    name_offsets: array[int]
+    sub_folder_starts: array[int]
+    sub_folder_ends: array[int]
+    file_starts: array[int]
+    file_ends: array[int]
+    parents: array[int]  # Index of the parent folder, or NO_PARENT
+    drives: array[int]  # Index of the drive, or NO_DRIVE
+
+    def __len__(self) -> int:
+        return len(self.name_offsets)
+
+    @classmethod
+    def create(cls, headers: List[FolderHeader]) -> CompactFolderTable:
+        return cls(
+            array(_UINT32, (h.name_offset for h in headers)),
+            array(_UINT32, (h.sub_folder_range.start for h in headers)),
+            array(_UINT32, (h.sub_folder_range.end for h in headers)),
+            array(_UINT32, (h.file_range.start for h in headers)),
+            array(_UINT32, (h.file_range.end for h in headers)),
+            _column(_INT32, len(headers), NO_PARENT),
+            _column(_INT32, len(headers), NO_DRIVE)
+        )
+
+
+@dataclass
+class CompactFileTable:
+    """File headers stored as parallel columns; one entry per file."""
+    name_offsets: array[int]
+    data_offsets: array[int]
+    compressed_sizes: array[int]
+    decompressed_sizes: array[int]
+    compressed: array[int]  # 1 if the file expects decompression, 0 otherwise
+    parents: array[int]  # Index of the parent folder, or NO_PARENT
+    drives: array[int]  # Index of the drive, or NO_DRIVE
+    extras: Dict[str, array[int]]  # The version's other header fields (E.G. Dawn of War I's compression_flag); so full headers can be recreated on demand
+
+    def __len__(self) -> int:
+        return len(self.name_offsets)
+
+    @classmethod
+    def unpack(cls, stream: BinaryIO, header_class: Type[FileHeader], count: int) -> CompactFileTable:
+        extra_fields = [f.name for f in fields(header_class) if f.name not in _FILE_HEADER_FIELDS]
+        table = cls(array(_UINT32), array(_UINT32), array(_UINT32), array(_UINT32), array("B"), _column(_INT32, count, NO_PARENT), _column(_INT32, count, NO_DRIVE), {name: array(_UINT32) for name in extra_fields})
+        buffer = stream.read(header_class.LAYOUT.size * count)
+        for args in header_class.LAYOUT.iter_unpack(buffer):
+            header = header_class._unpack_tuple(args)  # Discarded immediately; only the columns are kept
+            table.name_offsets.append(header.name_sub_ptr.offset)
+            table.data_offsets.append(header.data_sub_ptr.offset)
+            table.compressed_sizes.append(header.compressed_size)
+            table.decompressed_sizes.append(header.decompressed_size)
+            table.compressed.append(1 if header.compressed else 0)
+            for name, column in table.extras.items():
+                value = getattr(header, name)
+                column.append(value.value if isinstance(value, Enum) else value)
+        return table
+
+
+@dataclass
+class CompactArchiveTableOfContents:
+    """
+    A struct-of-arrays alternative to ArchiveTableOfContents.
+
+    Folders and files are stored as columns instead of objects; File/Folder objects are only created when requested.
+    Created objects are detached proxies; their parent and drive are set (so full_path works), but their sub_folders and files are left empty.
+    Drive and folder proxies are cached; so files (and folders) share their parent's proxy, and each is created once.
+    Use child_folders/child_files to navigate the hierarchy.
+    """
+    version: VersionLike
+    drives: List[VirtualDriveHeader]
+    folders: CompactFolderTable
+    files: CompactFileTable
+    names: NameTable
+    _drive_proxies: Dict[int, VirtualDrive] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _folder_proxies: Dict[int, Folder] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def unpack(cls, stream: BinaryIO, ptr: ArchiveTableOfContentsPtr, version: Optional[VersionLike] = None) -> CompactArchiveTableOfContents:
+        version = version or ptr.version
+
+        local_ptr = ptr.virtual_drive_ptr
+        with local_ptr.stream_jump_to(stream) as handle:
+            drives = VirtualDriveHeader.unpack_table(handle, version, local_ptr.count)
+
+        local_ptr = ptr.folder_ptr
+        with local_ptr.stream_jump_to(stream) as handle:
+            folders = CompactFolderTable.create(FolderHeader.unpack_table(handle, version, local_ptr.count))
+
+        local_ptr = ptr.file_ptr
+        with local_ptr.stream_jump_to(stream) as handle:
+            files = CompactFileTable.unpack(handle, FileHeader.version_class(version), local_ptr.count)
+
+        names = ArchiveTableOfContentsHeaders.unpack_names(stream, ptr.name_ptr)
+
+        toc = cls(version, drives, folders, files, names)
+        toc._link_parents()
+        return toc
+
+    def _link_parents(self) -> None:
+        folders = self.folders
+        for i in range(len(folders)):
+            _assign_parent(folders.parents, ArchiveRange(folders.sub_folder_starts[i], folders.sub_folder_ends[i]), i)
+            _assign_parent(self.files.parents, ArchiveRange(folders.file_starts[i], folders.file_ends[i]), i)
+        for i in reversed(range(len(self.drives))):  # Where drive ranges overlap, the first drive wins
+            _assign_parent(folders.drives, self.drives[i].sub_folder_range, i)
+            _assign_parent(self.files.drives, self.drives[i].file_range, i)
+
+    @property
+    def folder_count(self) -> int:
+        return len(self.folders)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    def child_folders(self, index: int) -> range:
+        return range(self.folders.sub_folder_starts[index], self.folders.sub_folder_ends[index])
+
+    def child_files(self, index: int) -> range:
+        return range(self.folders.file_starts[index], self.folders.file_ends[index])
+
+    def root_folders(self, drive: int) -> List[int]:
+        header = self.drives[drive]
+        return [i for i in range(header.sub_folder_range.start, min(header.sub_folder_range.end, self.folder_count)) if self.folders.parents[i] == NO_PARENT]
+
+    def root_files(self, drive: int) -> List[int]:
+        header = self.drives[drive]
+        return [i for i in range(header.file_range.start, min(header.file_range.end, self.file_count)) if self.files.parents[i] == NO_PARENT]
+
+    def file_header(self, index: int) -> FileHeader:
+        header_class = FileHeader.version_class(self.version)
+        files = self.files
+        name_ptr, data_offset, compressed_size = Ptr(files.name_offsets[index]), files.data_offsets[index], files.compressed_sizes[index]
+        extras = {name: column[index] for name, column in files.extras.items()}
+        if header_class is DowIFileHeader:  # Mirrors DowIFileHeader._unpack_tuple
+            return DowIFileHeader(name_ptr, WindowPtr(data_offset, compressed_size), files.decompressed_sizes[index], compressed_size, FileCompressionFlag(extras["compression_flag"]))
+        return header_class(name_ptr, Ptr(data_offset), files.decompressed_sizes[index], compressed_size, **extras)
+
+    def folder_header(self, index: int) -> FolderHeader:
+        header_class = FolderHeader.version_class(self.version)
+        folders = self.folders
+        sub_folder_range = ArchiveRange(folders.sub_folder_starts[index], folders.sub_folder_ends[index])
+        file_range = ArchiveRange(folders.file_starts[index], folders.file_ends[index])
+        return header_class(folders.name_offsets[index], sub_folder_range, file_range)
+
+    def drive(self, index: int) -> VirtualDrive:
+        from ..vdrive.virtual_drive import VirtualDrive
+        drive = self._drive_proxies.get(index)
+        if drive is None:
+            drive = self._drive_proxies[index] = VirtualDrive(self.drives[index], [], [])
+        return drive
+
+    def _optional_drive(self, index: int) -> Optional[VirtualDrive]:
+        return self.drive(index) if index != NO_DRIVE else None
+
+    def folder(self, index: int) -> Folder:
+        from ..folder.folder import Folder
+        proxies, parents = self._folder_proxies, self.folders.parents
+        # Uncached ancestors are created first (root-most first); iteratively, so deep hierarchies can't exhaust the stack
+        chain: List[int] = []
+        current = index
+        while current != NO_PARENT and current not in proxies:
+            if len(chain) > len(parents):
+                raise ValueError(f"The parents of folder {index} form a cycle.")
+            chain.append(current)
+            current = parents[current]
+        for i in reversed(chain):
+            header = self.folder_header(i)
+            parent = proxies[parents[i]] if parents[i] != NO_PARENT else None
+            proxies[i] = Folder(header, self.names[header.name_offset], [], [], parent, self._optional_drive(self.folders.drives[i]))
+        return proxies[index]
+
+    def file(self, index: int) -> File:
+        from ..file.file import File
+        header = self.file_header(index)
+        parent_index = self.files.parents[index]
+        parent = self.folder(parent_index) if parent_index != NO_PARENT else None
+        return File(header, self.names[header.name_sub_ptr.offset], _parent=parent, _drive=self._optional_drive(self.files.drives[index]))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+from typing import BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+
+_NULL = b"\0"
+_KIBI = 1024
+_BUFFER_SIZE = 64 * _KIBI
+
+
+class NameTable(Mapping[int, str]):
+    """
+    The names of a table of contents; a mapping of name offsets (relative to the start of the name block) to names.
+
+    The raw name block is kept as a single buffer; names are only decoded (and interned) when they are looked up.
+    """
+
+    def __init__(self, buffer: bytes, encoding: str = "ascii"):
+        """
+        :param buffer: The raw name block; null-terminated names, stored back to back
+        :param encoding: The encoding of the names
+        """
+        self.buffer = buffer
+        self.encoding = encoding
+        self._names: Dict[int, str] = {}
+        self._offsets: Optional[List[int]] = None
+
+    @classmethod
+    def unpack(cls, stream: BinaryIO, count: int) -> NameTable:
+        """Reads `count` null-terminated names from the stream; names are not decoded."""
+        buffer = bytearray()
+        nulls = 0
+        while nulls < count:
+            chunk = stream.read(_BUFFER_SIZE)
+            if not chunk:
+                break  # Truncated; names past the end of the stream will raise a KeyError when looked up
+            nulls += chunk.count(_NULL)
+            buffer += chunk
+        if nulls >= count:  # Trim anything read past the last name
+            end = len(buffer)
+            for _ in range(nulls - count + 1):
+                end = buffer.rfind(_NULL, 0, end)
+            del buffer[end + 1:]
+        return cls(bytes(buffer))
+
+    @property
+    def offsets(self) -> List[int]:
+        """The offset of every name; built on first use."""
+        if self._offsets is None:
+            offsets, offset = [], 0
+            while (end := self.buffer.find(_NULL, offset)) != -1:
+                offsets.append(offset)
+                offset = end + 1
+            self._offsets = offsets
+        return self._offsets
+
+    def __getitem__(self, offset: int) -> str:
+        name = self._names.get(offset)
+        if name is None:
+            # Only offsets at the start of a name are valid
+            if not 0 <= offset < len(self.buffer) or (offset > 0 and self.buffer[offset - 1] != 0):
+                raise KeyError(offset)
+            end = self.buffer.find(_NULL, offset)
+            if end == -1:
+                raise KeyError(offset)
+            name = self._names[offset] = sys.intern(self.buffer[offset:end].decode(self.encoding))
+        return name
+
+    def __contains__(self, offset: object) -> bool:
+        if not isinstance(offset, int):
+            return False
+        try:
+            self[offset]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self.buffer)} bytes)"
+
+    def __getstate__(self) -> Tuple[bytes, str]:
+        return self.buffer, self.encoding  # Decoded names are rebuilt on demand
+
+    def __setstate__(self, state: Tuple[bytes, str]) -> None:
+        self.buffer, self.encoding = state
+        self._names = {}
+        self._offsets = None
+
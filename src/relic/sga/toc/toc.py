@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, BinaryIO, TYPE_CHECKING
+from typing import List, Mapping, BinaryIO, Optional, Union, TYPE_CHECKING
 
 from .toc_headers import ArchiveTableOfContentsHeaders
 
@@ -16,7 +16,7 @@ class ArchiveTableOfContents:
     drives: List[VirtualDrive]
     folders: List[Folder]
     files: List[File]
-    names: Dict[int, str]
+    names: Mapping[int, str]
 
     @classmethod
     def create(cls, toc_headers: ArchiveTableOfContentsHeaders) -> ArchiveTableOfContents:
@@ -30,9 +30,20 @@ class ArchiveTableOfContents:
 
         return ArchiveTableOfContents(drives, folders, files, toc_headers.names)
 
-    def load_data(self, stream: BinaryIO):
-        for _ in self.files:
-            _.load_data(stream)
+    def load_data(self, stream: Union[BinaryIO, memoryview], decompress: bool = False, workers: Optional[int] = None):
+        """
+        Loads the data of every file.
+
+        :param stream: The archive's data section; either a stream or a memoryview (see File.read_data)
+        :param decompress: When true, compressed data will be decompressed
+        :param workers: The number of decompression threads (see ParallelDecompressor); only used when decompressing
+        """
+        if decompress and workers != 1:
+            from ..decompressor import ParallelDecompressor
+            ParallelDecompressor(workers).load_files(self.files, stream)
+        else:
+            for _ in self.files:
+                _.load_data(stream, decompress)
 
     def load_toc(self):
         for _ in self.drives:
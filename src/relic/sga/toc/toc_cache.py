@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import pickle
+import zlib
+from hashlib import sha1
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .toc_headers import ArchiveTableOfContentsHeaders
+from ..archive.header import ArchiveHeader
+from ..common import ArchiveIdentity
+
+_FORMAT_VERSION = 1
+_SIDECAR_EXT = ".toc-cache"
+
+ArchiveTableOfContentsCacheKey = Tuple[ArchiveIdentity, bytes]
+
+
+class ArchiveTableOfContentsCache:
+    """
+    A persistent cache of parsed table of contents; allowing TOC parsing and checksum validation to be skipped when an archive is reopened.
+
+    Entries are keyed by the archive's identity (path, size and modified time) and its packed header (which includes any checksums).
+    Entries are pickled; only point the cache at directories you trust.
+    """
+
+    def __init__(self, directory: Optional[Union[str, os.PathLike]] = None):
+        """
+        :param directory: The directory to store entries in; if None, entries are written as sidecar files next to their archives.
+        """
+        self.directory = Path(directory) if directory is not None else None
+
+    @staticmethod
+    def get_key(identity: ArchiveIdentity, header: ArchiveHeader) -> ArchiveTableOfContentsCacheKey:
+        with BytesIO() as stream:
+            header.pack(stream)
+            return identity, stream.getvalue()
+
+    def get_cache_path(self, key: ArchiveTableOfContentsCacheKey) -> Path:
+        identity = key[0]
+        if self.directory is None:
+            return Path(identity.path + _SIDECAR_EXT)
+        name = sha1(identity.path.encode("utf-8")).hexdigest()
+        return self.directory / (name + _SIDECAR_EXT)
+
+    def load(self, key: ArchiveTableOfContentsCacheKey, validated: bool = False) -> Optional[ArchiveTableOfContentsHeaders]:
+        """
+        Loads a cached table of contents.
+
+        :param key: The key of the archive, see get_key
+        :param validated: When true, entries which were stored without validating the archive's checksums are ignored
+        :returns: The cached table of contents, or None if no (matching) entry exists
+        """
+        try:
+            with open(self.get_cache_path(key), "rb") as handle:
+                format_version, entry_key, entry_validated, toc_headers = pickle.loads(zlib.decompress(handle.read()))
+        except Exception:
+            return None  # Missing, unreadable or malformed entries (E.G. pickled by an older version of a class) are treated as a cache miss
+        if format_version != _FORMAT_VERSION or entry_key != key or not isinstance(toc_headers, ArchiveTableOfContentsHeaders):
+            return None
+        if validated and not entry_validated:
+            return None
+        return toc_headers
+
+    def save(self, key: ArchiveTableOfContentsCacheKey, toc_headers: ArchiveTableOfContentsHeaders, validated: bool = False):
+        path = self.get_cache_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = zlib.compress(pickle.dumps((_FORMAT_VERSION, key, validated, toc_headers), pickle.HIGHEST_PROTOCOL))
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(buffer)
+        os.replace(temp_path, path)  # Never leave a partially written entry behind
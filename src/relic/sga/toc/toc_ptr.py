@@ -47,12 +47,16 @@ class ArchiveTableOfContentsPtr:
 
     @classmethod
     def unpack_version(cls, stream: BinaryIO, version: VersionLike) -> 'ArchiveTableOfContentsPtr':
+        return cls.version_class(version).unpack(stream)
+
+    @classmethod
+    def version_class(cls, version: VersionLike) -> Type['ArchiveTableOfContentsPtr']:
         toc_ptr_class = _ToCPtr_VERSION_MAP.get(version)
 
         if not toc_ptr_class:
             raise NotImplementedError(version)
 
-        return toc_ptr_class.unpack(stream)
+        return toc_ptr_class
 
     @classmethod
     def unpack(cls, stream: BinaryIO) -> 'ArchiveTableOfContentsPtr':
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from hashlib import md5
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Dict, List, Optional, Tuple, Type, Union
+
+from serialization_tools.ioutil import Ptr
+from serialization_tools.size import MiB
+
+from .archive.header import ArchiveHeader, DowIArchiveHeader, DowIIArchiveHeader
+from .common import ArchiveIdentity
+
+_FORMAT_VERSION = 1
+_BUFFER_SIZE = 1 * MiB
+
+ChecksumHeader = Union[DowIArchiveHeader, DowIIArchiveHeader]
+
+
+def _hex_checksums(header: ChecksumHeader) -> Tuple[str, str]:
+    return header.checksums[0].hex(), header.checksums[1].hex()
+
+
+def gen_checksums(stream: BinaryIO, header: ChecksumHeader, fast: bool = True, buffer_size: int = _BUFFER_SIZE) -> Tuple[Optional[bytes], bytes]:
+    """
+    Generates an archive's checksums; equivalent to header.validate_checksums, but in a single pass over the stream.
+
+    MD5 is sequential, so a single checksum cannot be split into segments; instead, both checksums are fed from the same reads (the TOC checksum's range is a prefix of the full checksum's range).
+    Hashing runs on worker threads (hashlib releases the GIL), overlapping with reading the next buffer and with each other.
+
+    :param stream: The archive's stream; its position is preserved
+    :param header: The archive's header
+    :param fast: When true, the (slow) full checksum is skipped and returned as None
+    :param buffer_size: The size of each read
+    :returns: The full checksum (from the TOC to the end of the stream) and the TOC checksum
+    """
+    full_hasher = None if fast else md5(header.MD5_EIGENVALUES[0])
+    toc_hasher = md5(header.MD5_EIGENVALUES[1])
+    toc_remaining = header.toc_ptr.size
+    with ThreadPoolExecutor(2) as executor:
+        with Ptr(header.toc_ptr.offset).stream_jump_to(stream) as handle:
+            pending: List[Future[None]] = []
+            while not fast or toc_remaining > 0:
+                buffer = handle.read(min(buffer_size, toc_remaining) if fast else buffer_size)
+                if not buffer:
+                    break
+                for future in pending:  # Each hasher must finish the previous buffer before it can be given the next
+                    future.result()
+                pending.clear()
+                if toc_remaining > 0:
+                    pending.append(executor.submit(toc_hasher.update, memoryview(buffer)[:toc_remaining]))
+                    toc_remaining -= len(buffer)
+                if full_hasher:
+                    pending.append(executor.submit(full_hasher.update, buffer))
+            for future in pending:
+                future.result()
+    return full_hasher.digest() if full_hasher else None, toc_hasher.digest()
+
+
+class ChecksumCache:
+    """
+    A persistent record of archives whose checksums have been verified; keyed by the archive's identity.
+
+    An entry is only used while both the archive's identity and the checksums stored in its header are unchanged.
+    """
+
+    def __init__(self, path: Optional[Union[str, os.PathLike[str]]] = None):
+        """
+        :param path: The file to store the cache in; if None, the cache is not persisted.
+        """
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[ArchiveIdentity, Tuple[Tuple[str, str], bool]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.load()
+
+    def load(self) -> None:
+        """Loads the cache from its file; a missing or unreadable file is treated as empty."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data["version"] != _FORMAT_VERSION:
+                return
+            entries = {ArchiveIdentity(**identity): (tuple(checksums), full) for identity, checksums, full in data["archives"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        with self._lock:
+            self._entries = entries
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            archives = [[asdict(identity), list(checksums), full] for identity, (checksums, full) in self._entries.items()]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": _FORMAT_VERSION, "archives": archives}, handle)
+        os.replace(temp_path, self.path)  # Never leave a partially written cache behind
+
+    def is_verified(self, identity: ArchiveIdentity, header: ChecksumHeader, fast: bool = True) -> bool:
+        """Checks whether the archive has already been verified; a full verification also satisfies a fast one."""
+        with self._lock:
+            entry = self._entries.get(identity)
+        if entry is None:
+            return False
+        checksums, full = entry
+        return checksums == _hex_checksums(header) and (full or fast)
+
+    def add(self, identity: ArchiveIdentity, header: ChecksumHeader, fast: bool = True) -> bool:
+        """
+        Records the archive as verified; fast should match the validation that was performed.
+
+        :returns: True if the entry changed (and so the cache should be saved)
+        """
+        checksums = _hex_checksums(header)
+        with self._lock:
+            previous = self._entries.get(identity)
+            full = not fast or previous == (checksums, True)  # A fast validation doesn't downgrade a full one
+            self._entries[identity] = checksums, full
+        return previous != (checksums, full)
+
+
+class ArchiveValidator:
+    """
+    Validates archive checksums; skipping archives which have already been verified, and optionally validating in the background.
+
+    Archives without checksums (Dawn of War III) are always valid.
+    """
+
+    def __init__(self, cache: Optional[ChecksumCache] = None, background: bool = False, buffer_size: int = _BUFFER_SIZE):
+        """
+        :param cache: Records verified archives; if None, every archive is hashed.
+        :param background: When true, Archive.unpack validates on a background thread; see Archive.validation
+        :param buffer_size: The size of each read while hashing
+        """
+        self.cache = cache
+        self.background = background
+        self.buffer_size = buffer_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def validate(self, stream: BinaryIO, header: ArchiveHeader, *, fast: bool = True, force: bool = False, identity: Optional[ArchiveIdentity] = None, _assert: bool = True) -> bool:
+        """
+        Validates header checksums against the contents of the stream (see ArchiveHeader.validate_checksums).
+
+        :param stream: The archive's stream; its position is preserved
+        :param header: The archive's header
+        :param fast: When true, the (slow) full checksum is skipped
+        :param force: When true, the cache is ignored; the archive is always hashed
+        :param identity: The archive's identity, for the cache; if None, it is taken from the stream (see ArchiveIdentity.from_stream)
+        :param _assert: When true, an assertion is raised instead of returning False
+        """
+        if not isinstance(header, (DowIArchiveHeader, DowIIArchiveHeader)):
+            return header.validate_checksums(stream, fast=fast, _assert=_assert)
+        if identity is None and self.cache is not None:
+            identity = ArchiveIdentity.from_stream(stream)
+        if identity and self.cache is not None and not force and self.cache.is_verified(identity, header, fast):
+            return True
+
+        full, toc = gen_checksums(stream, header, fast, self.buffer_size)
+        expected, result = header.checksums, (full if full is not None else header.checksums[0], toc)
+        valid = expected == result
+        if _assert:
+            assert valid, (expected, result)
+        if valid and identity and self.cache is not None and self.cache.add(identity, header, fast):
+            self.cache.save()
+        return valid
+
+    def validate_in_background(self, path: Union[str, os.PathLike[str]], header: ArchiveHeader, *, fast: bool = True, force: bool = False, identity: Optional[ArchiveIdentity] = None) -> Future[bool]:
+        """
+        Validates the archive at the path on a background thread, using its own handle.
+
+        :returns: A future whose result is True; if validation fails, an AssertionError is raised when the result is requested.
+
+        The validator's worker thread is kept until shutdown; use the validator as a context manager to release it.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="sga-validation")
+
+        def _validate() -> bool:
+            with open(path, "rb") as handle:
+                return self.validate(handle, header, fast=fast, force=force, identity=identity)
+
+        return self._executor.submit(_validate)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait)
+            self._executor = None
+
+    def __enter__(self) -> ArchiveValidator:
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]) -> None:
+        self.shutdown()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import ClassVar, BinaryIO, Dict, Type
+from typing import ClassVar, BinaryIO, Dict, Type, List, Tuple, Any
 
 from serialization_tools.structx import Struct
 
@@ -22,21 +22,42 @@ class VirtualDriveHeader:
 
     @classmethod
     def unpack(cls, stream: BinaryIO, version: VersionLike) -> 'VirtualDriveHeader':
+        return cls.version_class(version)._unpack(stream)
+
+    @classmethod
+    def unpack_table(cls, stream: BinaryIO, version: VersionLike, count: int) -> List['VirtualDriveHeader']:
+        """Unpacks a table of `count` headers with a single read."""
+        return cls.version_class(version)._unpack_table(stream, count)
+
+    @classmethod
+    def version_class(cls, version: VersionLike) -> Type['VirtualDriveHeader']:
         header_class = _HEADER_VERSION_MAP.get(version)
 
         if not header_class:
             raise NotImplementedError(version)
 
-        return header_class._unpack(stream)
+        return header_class
 
     def _pack(self, stream: BinaryIO) -> int:
         args = self.path.encode("ascii"), self.name.encode("ascii"), self.sub_folder_range.start, self.sub_folder_range.end, \
-               self.file_range.start, self.file_range.end, 0
+               self.file_range.start, self.file_range.end, self.unk
         return self.LAYOUT.pack_stream(stream, *args)
 
+    def pack(self, stream: BinaryIO) -> int:
+        return self._pack(stream)
+
     @classmethod
     def _unpack(cls, stream: BinaryIO) -> 'VirtualDriveHeader':
-        path, name, sub_folder_start, sub_folder_end, file_start, file_end, unk = cls.LAYOUT.unpack_stream(stream)
+        return cls._unpack_tuple(cls.LAYOUT.unpack_stream(stream))
+
+    @classmethod
+    def _unpack_table(cls, stream: BinaryIO, count: int) -> List['VirtualDriveHeader']:
+        buffer = stream.read(cls.LAYOUT.size * count)
+        return [cls._unpack_tuple(args) for args in cls.LAYOUT.iter_unpack(buffer)]
+
+    @classmethod
+    def _unpack_tuple(cls, args: Tuple[Any, ...]) -> 'VirtualDriveHeader':
+        path, name, sub_folder_start, sub_folder_end, file_start, file_end, unk = args
         path, name = path.decode("ascii").rstrip("\00"), name.decode("ascii").rstrip("\00")
         sub_folder_range = ArchiveRange(sub_folder_start, sub_folder_end)
         file_range = ArchiveRange(file_start, file_end)
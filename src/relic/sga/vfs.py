@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Generic, Iterator, List, Mapping, Optional, Tuple, TypeVar, Union, cast, TYPE_CHECKING
+
+from .file.file import File
+from .file.reader import FileDataReader
+from .hierarchy import normalize_path
+from .payload_cache import PayloadCache
+
+if TYPE_CHECKING:
+    from .archive.archive import Archive
+    from .folder.folder import Folder
+    from .vdrive.virtual_drive import VirtualDrive
+
+OverlayItem = Union['VirtualDrive', 'Folder', File, Path]
+ArchiveItem = Union['VirtualDrive', 'Folder', File]
+_ItemT = TypeVar("_ItemT", bound=OverlayItem)
+_MountT = TypeVar("_MountT", bound="Mount[Any]")
+
+_CACHE_TOKENS = count()  # Identifies mounts in shared caches; unlike id(), tokens are never reused
+
+
+@dataclass(eq=False)
+class Mount(Generic[_ItemT]):
+    """
+    A source of files in an OverlayFileSystem; mounts with a higher priority override those with a lower priority.
+
+    Mounts are generic over the items of their index; only those items are passed back to read and open.
+    """
+    priority: int
+    order: int  # Breaks ties; later mounts override earlier mounts of the same priority
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.priority, self.order
+
+    def build_index(self) -> Mapping[str, _ItemT]:
+        raise NotImplementedError
+
+    def read(self, item: _ItemT, decompress: bool = True) -> Union[bytes, memoryview]:
+        raise NotImplementedError
+
+    def open(self, item: _ItemT, decompress: bool = True) -> BinaryIO:
+        raise NotImplementedError
+
+
+@dataclass(eq=False)
+class ArchiveMount(Mount[ArchiveItem]):
+    archive: Archive
+    path: Optional[Path] = None
+    """The archive's file; required to read data, unless the archive was memory mapped or unpacked with its data."""
+    cache: Optional[PayloadCache] = None
+    """When specified, payloads read from the archive are cached."""
+    _cache_token: int = field(default_factory=lambda: next(_CACHE_TOKENS), init=False, repr=False)
+
+    def build_index(self) -> Mapping[str, ArchiveItem]:
+        return self.archive.path_index
+
+    def read(self, item: ArchiveItem, decompress: bool = True) -> Union[bytes, memoryview]:
+        file = _as_file(item)
+        if self.cache is None:
+            return self._read(file, decompress)
+        key = self._cache_token, file.header.data_sub_ptr.offset, decompress
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        payload = self._read(file, decompress)
+        if isinstance(payload, bytes):  # Views (of a memory map or of loaded data) are already free to re-read
+            self.cache.put(key, payload)
+        return payload
+
+    def _read(self, file: File, decompress: bool) -> Union[bytes, memoryview]:
+        if file.data is not None:
+            return file.get_decompressed_data() if decompress else file.data
+        if self.archive.data_view is not None:
+            return file.read_data(self.archive.data_view, decompress)
+        with open(self._get_path(), "rb") as handle:
+            with self.archive.header.data_ptr.stream_jump_to(handle) as data_stream:
+                return file.read_data(data_stream, decompress)
+
+    def open(self, item: ArchiveItem, decompress: bool = True) -> BinaryIO:
+        return cast(BinaryIO, self._open(_as_file(item), decompress))  # FileDataReader is a binary (raw) stream
+
+    def _open(self, file: File, decompress: bool) -> FileDataReader:
+        if file.data_loaded:
+            return file.open(decompress=decompress)
+        if self.archive.data_view is not None:
+            return file.open(self.archive.data_view, decompress)
+        # The reader owns the handle; data offsets are relative to the data section, so the offset is adjusted instead of using a window
+        handle = open(self._get_path(), "rb")
+        offset = self.archive.header.data_ptr.offset + file.header.data_sub_ptr.offset
+        return FileDataReader(handle, offset, file.header.compressed_size, decompress and file.expects_decompress, file.header.decompressed_size, close_source=True)
+
+    def _get_path(self) -> Path:
+        if self.path is None:
+            raise ValueError(f"Cannot read from '{self.archive.header.name}'; the archive was mounted without a path.")
+        return self.path
+
+
+@dataclass(eq=False)
+class DirectoryMount(Mount[Path]):
+    directory: Path
+    drive: str
+    """The drive the directory is mounted as; E.G. a mod's 'Data' folder is mounted as 'data'."""
+
+    def build_index(self) -> Mapping[str, Path]:
+        root = normalize_path(self.drive + ":")
+        index: Dict[str, Path] = {root: self.directory}
+        for directory, folders, files in os.walk(self.directory):
+            parent = Path(directory)
+            relative = parent.relative_to(self.directory).as_posix()
+            prefix = root if relative == "." else f"{root}{relative.lower()}/"
+            for name in folders + files:
+                index.setdefault(prefix + name.lower(), parent / name)
+        return index
+
+    def read(self, path: Path, decompress: bool = True) -> bytes:
+        return path.read_bytes()
+
+    def open(self, path: Path, decompress: bool = True) -> BinaryIO:
+        return open(path, "rb")
+
+
+@dataclass(frozen=True)
+class OverlayEntry:
+    """A path resolved by an OverlayFileSystem; the item is a drive, folder or file from an archive, or a path from a directory."""
+    path: str
+    mount: Mount[Any]
+    item: OverlayItem
+
+    @property
+    def is_file(self) -> bool:
+        return isinstance(self.item, File) or (isinstance(self.item, Path) and self.item.is_file())
+
+    def read(self, decompress: bool = True) -> Union[bytes, memoryview]:
+        return self.mount.read(self.item, decompress)
+
+    def open(self, decompress: bool = True) -> BinaryIO:
+        return self.mount.open(self.item, decompress)
+
+
+@dataclass
+class OverlayFileSystem:
+    """
+    Merges archives and loose-file directories into a single, read-only view; mimicking how the game resolves assets across SGAs and mod folders.
+
+    Paths are resolved against a merged index (built on first use, and rebuilt after mounts change); so lookups are O(1), regardless of the number of mounts.
+    Like Archive.get, paths include their drive, are case-insensitive and accept either slash; E.G. 'data:/art/ebps/races'.
+    """
+    mounts: List[Mount[Any]] = field(default_factory=list)
+    cache: Optional[PayloadCache] = None
+    """When specified, payloads read from mounted archives are cached; shared by every archive mount."""
+    _index: Optional[Dict[str, OverlayEntry]] = field(default=None, init=False, repr=False)
+    _candidates: Optional[Dict[str, List[OverlayEntry]]] = field(default=None, init=False, repr=False)
+    _order: Iterator[int] = field(default_factory=count, init=False, repr=False)  # Never reused; so the latest mount always wins ties, even after unmounting
+
+    def mount_archive(self, archive: Archive, path: Optional[Union[str, os.PathLike[str]]] = None, priority: int = 0) -> ArchiveMount:
+        """
+        :param archive: The archive to mount
+        :param path: The archive's file; required to read file data unless the archive was memory mapped or unpacked with its data
+        :param priority: Mounts with a higher priority override mounts with a lower priority; ties are won by the latest mount
+        """
+        return self._add(ArchiveMount(priority, next(self._order), archive, Path(path) if path is not None else None, self.cache))
+
+    def mount_directory(self, directory: Union[str, os.PathLike[str]], drive: str = "data", priority: int = 0) -> DirectoryMount:
+        """
+        :param directory: The directory of loose files to mount
+        :param drive: The drive the directory is mounted as
+        :param priority: Mounts with a higher priority override mounts with a lower priority; ties are won by the latest mount
+        """
+        return self._add(DirectoryMount(priority, next(self._order), Path(directory), drive))
+
+    def _add(self, mount: _MountT) -> _MountT:
+        self.mounts.append(mount)
+        self.invalidate()
+        return mount
+
+    def unmount(self, mount: Mount[Any]) -> None:
+        self.mounts.remove(mount)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discards the merged index; must be called if a mounted archive or directory is modified."""
+        self._index = self._candidates = None
+
+    def build_index(self) -> Tuple[Dict[str, OverlayEntry], Dict[str, List[OverlayEntry]]]:
+        """Merges the index of every mount; returns the winning entry, and every entry, of each path."""
+        index: Dict[str, OverlayEntry] = {}
+        candidates: Dict[str, List[OverlayEntry]] = {}
+        for mount in sorted(self.mounts, key=lambda m: m.key, reverse=True):  # Highest priority first; the first entry of a path wins
+            for path, item in mount.build_index().items():
+                entry = OverlayEntry(path, mount, item)
+                index.setdefault(path, entry)
+                candidates.setdefault(path, []).append(entry)
+        self._index, self._candidates = index, candidates
+        return index, candidates
+
+    @property
+    def index(self) -> Dict[str, OverlayEntry]:
+        return self._index if self._index is not None else self.build_index()[0]
+
+    def resolve(self, path: str) -> Optional[OverlayEntry]:
+        """Gets the winning entry for the path, or None if no mount contains the path."""
+        return self.index.get(normalize_path(path))
+
+    def resolve_all(self, path: str) -> List[OverlayEntry]:
+        """Gets every entry for the path, from the winner to the most overridden."""
+        candidates = self._candidates if self._candidates is not None else self.build_index()[1]
+        return list(candidates.get(normalize_path(path), []))
+
+    def exists(self, path: str) -> bool:
+        return normalize_path(path) in self.index
+
+    def read(self, path: str, decompress: bool = True) -> Union[bytes, memoryview]:
+        return self._resolve_file(path).read(decompress)
+
+    def open(self, path: str, decompress: bool = True) -> BinaryIO:
+        return self._resolve_file(path).open(decompress)
+
+    def _resolve_file(self, path: str) -> OverlayEntry:
+        entry = self.resolve(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        if not entry.is_file:
+            raise IsADirectoryError(path)
+        return entry
+
+
+def _as_file(item: ArchiveItem) -> File:
+    if not isinstance(item, File):
+        raise IsADirectoryError(item.name)
+    return item
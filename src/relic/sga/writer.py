@@ -1,297 +1,644 @@
-# TODO Dig through this and see how much can be moved to TOC and if any of it must be a separate file
-
-# # Cycles aren't supported (and will crash)
-# # Multiple parents will be copied
-#
-#
-# def flatten_folders(collection: AbstractDirectory, flattened: List[Folder]) -> Tuple[int, int]:
-#     start = len(flattened)
-#     flattened.extend(collection.folders)
-#     stop = len(flattened)
-#     return start, stop
-#
-#
-# def flatten_files(collection: AbstractDirectory, flattened: List[File]) -> Tuple[int, int]:
-#     start = len(flattened)
-#     flattened.extend(collection.files)
-#     stop = len(flattened)
-#     return start, stop
-#
-#
-# # Offset, Count (Items), Size (Bytes)
-# def write_virtual_drives(stream: BinaryIO, archive: Archive, version: Version, name_table: Dict[any, int],
-#                          recalculate: bool = False) -> Tuple[int, int, int]:
-#     running_folder = 0
-#     running_file = 0
-#     written = 0
-#
-#     offset = stream.tell()
-#     for drive in archive.drives:
-#         folder_count = drive.folder_count(recalculate)
-#         file_count = drive.file_count(recalculate)
-#
-#         folder = ArchiveRange(running_folder, running_folder + folder_count)
-#         files = ArchiveRange(running_file, running_file + file_count)
-#
-#         running_folder += folder_count
-#         running_file += file_count
-#
-#         header = VirtualDriveHeader(drive.path, drive.name, folder, files, folder.start)
-#         written += header.pack(stream, version)
-#
-#     return offset, len(archive.drives), written
-#
-#
-# def write_names(stream: BinaryIO, archive: Archive) -> Tuple[int, int, int, Dict[str, int]]:
-#     offset = stream.tell()
-#     running_total = 0
-#     lookup = {}
-#     written = 0
-#
-#     def try_write_null_terminated(name: str) -> int:
-#         if name in lookup:
-#             return 0
-#         # We must use relative offset to data_origin
-#         lookup[name] = stream.tell() - offset
-#         terminated_name = name
-#         if name[-1] != "\0":
-#             terminated_name += "\0"
-#         encoded = terminated_name.encode("ascii")
-#         return stream.write(encoded)
-#
-#     # This will not re-use repeated names; we could change it, but I won't since my brain is over-optimizing this
-#     #   By allowing names to repeat, we avoid perform hash checks in a dictionary (or equality comparisons in a list)
-#     for drive in archive.drives:
-#         for _, folders, files in drive.walk():
-#             for f in folders:
-#                 written += try_write_null_terminated(f.name)
-#                 running_total += 1
-#             for f in files:
-#                 written += try_write_null_terminated(f.name)
-#                 running_total += 1
-#
-#     return offset, running_total, written, lookup
-#
-#
-# # Offset, Count (Items), Size (Bytes)
-# def write_folders(stream: BinaryIO, archive: Archive, version: Version, name_lookup: Dict[str, int],
-#                   recalculate: bool = False) -> Tuple[
-#     int, int, int]:
-#     running_folder = 0
-#     running_file = 0
-#     written = 0
-#     total_folders = 0
-#     offset = stream.tell()
-#     for drive in archive.drives:
-#         for _, folders, _ in drive.walk():
-#             for folder in folders:
-#                 total_folders += 1
-#                 folder_count = folder.folder_count(recalculate)
-#                 file_count = folder.file_count(recalculate)
-#
-#                 folder_range = ArchiveRange(running_folder, running_folder + folder_count)
-#                 file_range = ArchiveRange(running_file, running_file + file_count)
-#
-#                 running_folder += folder_count
-#                 running_file += file_count
-#
-#                 name_offset = name_lookup[folder.name]
-#
-#                 header = FolderHeader(name_offset, folder_range, file_range)
-#                 written += header.pack(stream, version)
-#
-#     return offset, total_folders, written
-#
-#
-# def get_v2_compflag(comp_data: bytes, decomp_data: bytes):
-#     if len(comp_data) == len(decomp_data):
-#         return FileCompressionFlag.Decompressed
-#     flag = (comp_data[0] & 0xF0) >> 4
-#     lookup = {7: FileCompressionFlag.Compressed32, 6: FileCompressionFlag.Compressed16}
-#     return lookup[flag]
-#
-#
-# def get_v9_compflag(comp_data: bytes, decomp_data: bytes):
-#     if len(comp_data) == len(decomp_data):
-#         return 0
-#     flag = (comp_data[0] & 0xF0) >> 4
-#     lookup = {7: FileCompressionFlag.Compressed32, 6: FileCompressionFlag.Compressed16}
-#     return lookup[flag]
-#
-#
-# # Lookup ~ Offset, Copmressed, Decompressed, Version Args
-# # Offset, Count, Byte Size
-# def write_file_data(stream: BinaryIO, archive: Archive, version: Version, auto_compress: bool = True) -> Tuple[
-#     int, int, int, Dict[File, FileHeader]]:
-#     offset = stream.tell()
-#
-#     KIBI = 1024
-#     Kb16 = 16 * KIBI
-#     Kb32 = 32 * KIBI
-#
-#     lookup = {}
-#
-#     def write_info(compressed_data: bytes, decompressed_data: bytes) -> FileHeader:
-#         # We must use relative offset to data_origin
-#         data_offset = stream.tell() - offset
-#
-#         if version == ArchiveVersion.Dow:
-#             compression_flag = get_v2_compflag(decompressed_data, decompressed_data)
-#             header = DowIFileHeader(None, data_offset, len(decompressed_data), len(compressed_data), compression_flag)
-#         elif version == ArchiveVersion.Dow2:
-#             header = DowIIFileHeader(None, data_offset, len(decompressed_data), len(compressed_data), 0, 0)
-#         elif version == ArchiveVersion.Dow3:
-#             # TODO rename unk_d to compression_flag
-#             compression_flag = get_v9_compflag(decompressed_data, decompressed_data)
-#             header = DowIIIFileHeader(None, data_offset, len(decompressed_data), len(compressed_data), 0, 0, 0, compression_flag, 0)
-#         else:
-#             raise NotImplementedError(version)
-#         stream.write(compressed_data)
-#         return header
-#
-#     for drive in archive.drives:
-#         for _, _, files in drive.walk():
-#             for file in files:
-#                 comp_data = file.data
-#                 decomp_data = file.get_decompressed()
-#
-#                 if not auto_compress:  # Just dump it and GO!
-#                     header = write_info(comp_data, decomp_data)
-#                 else:
-#                     # This is rather arbitrary, but these are my rules for auto-copmression:
-#                     # Don't compress files that...
-#                     #   Are compressed (duh)
-#                     #   Are smaller than the largest (16-KibiBytes) compression window
-#                     # When Compressing Files...
-#                     #   If the data size is less than 256 KibiBytes
-#                     #       Use 16-KbB Window
-#                     #   Otherwise
-#                     #       Use 32-KbB Window
-#                     if len(comp_data) != len(decomp_data):  # Compressed; just write as is
-#                         header = write_info(comp_data, decomp_data)
-#                     elif len(decomp_data) < Kb16:  # Too small
-#                         header = write_info(comp_data, decomp_data)
-#                     else:
-#                         if len(decomp_data) < KIBI:  # Use Window 16KbB
-#                             compressor = zlib.compressobj(wbits=14)
-#                         else:  # Use Window 32KbB
-#                             compressor = zlib.compressobj(wbits=15)
-#                         # Compress; because we are using compression obj, we need to use a temp
-#                         with BytesIO() as temp:
-#                             temp.write(compressor.compress(comp_data))
-#                             temp.write(compressor.flush())
-#                             temp.seek(0)
-#                             comp_data = temp.read()
-#                         header = write_info(comp_data, decomp_data)
-#                 lookup[file] = header
-#
-#     stop = stream.tell()
-#     size = stop - offset
-#     return offset, len(lookup), size, lookup
-#
-#
-# def write_files(stream: BinaryIO, archive: Archive, version: Version, name_lookup: Dict[str, int],
-#                 data_lookup: Dict[File, FileHeader]) -> Tuple[int, int, int]:
-#     offset = stream.tell()
-#     written = 0
-#     file_count = 0
-#
-#     for drive in archive.drives:
-#         for _, _, files in drive.walk():
-#             for file in files:
-#                 header = data_lookup[file]
-#                 header.name_subptr = name_lookup[file.name]
-#                 written += header.pack_version(stream, version)
-#                 file_count += 1
-#
-#     return offset, file_count, written
-#
-#
-# def write_table_of_contents(stream: BinaryIO, archive: Archive, version: Version,
-#                             data_lookup: Dict[File, FileHeader], recalculate_totals: bool = True) -> Tuple[int, int]:
-#     if recalculate_totals:
-#         for d in archive.drives:
-#             d.folder_count(True)
-#             d.file_count(True)
-#
-#     toc_offset = stream.tell()
-#     toc_size = ArchiveToC.get_size(version)
-#     stream.write(bytes([0x00] * toc_size))
-#
-#     # Names needs to be computer first, but DOW's layout is Drives, Folders, Files, Names (not that it HAS to be)
-#     #   I follow their pattern for consistency if nothing else
-#     #       THIS ONLY WORKS BECAUSE OFFSETS ARE RELATIVE TO THE NAME OFFSET
-#     with BytesIO() as name_buffer:
-#         _, name_count, name_size, name_lookup = write_names(name_buffer, archive)
-#
-#         vd_offset, vd_count, vd_size = write_virtual_drives(stream, archive, version, name_lookup)
-#         vd_part = OffsetInfo(toc_offset, vd_offset - toc_offset, vd_count)
-#
-#         fold_offset, fold_count, fold_size = write_folders(stream, archive, version, name_lookup)
-#         fold_part = OffsetInfo(toc_offset, fold_offset - toc_offset, fold_count)
-#
-#         file_offset, file_count, file_size = write_files(stream, archive, version, name_lookup, data_lookup)
-#         file_part = OffsetInfo(toc_offset, file_offset - toc_offset, file_count)
-#
-#         name_offset = stream.tell()
-#         name_buffer.seek(0)
-#         stream.write(name_buffer.read())
-#         name_part = FilenameOffsetInfo(toc_offset, name_offset - toc_offset, name_count, name_size)
-#
-#         end = stream.tell()
-#         # Writeback proper TOC
-#         toc = ArchiveTableOfContents(vd_part, fold_part, file_part, name_part)
-#         stream.seek(toc_offset)
-#         toc.pack(stream, version)
-#
-#         stream.seek(end)
-#         return toc_offset, end - toc_offset
-#
-#
-# def write_archive(stream: BinaryIO, archive: Archive, auto_compress: bool = True, recalculate_totals: bool = True) -> int:
-#     version = archive.info.header.version
-#
-#     if version not in [ArchiveVersion.Dow, ArchiveVersion.Dow2, ArchiveVersion.Dow3]:
-#         raise NotImplementedError(version)
-#
-#     start = stream.tell()
-#     # PRIMARY HEADER
-#     archive.info.header.pack(stream)
-#
-#     # SUB HEADER SETUP
-#     #   We need to do a write-back once we know the offsets, sizes, what have you
-#     subheader_offset = stream.tell()
-#
-#     subheader = ArchiveSubHeader.default(version)
-#     subheader.pack(stream, version)  # Write filler data
-#
-#     # TOC & DATA
-#     if version == ArchiveVersion.Dow:
-#         # Unfortunately, we depend on Data Buffer to write TOC, and TOC 'MUST' come immediately after the Sub Header in Sga-V2.0
-#         #   So we write data to a memory buffer before rewriting to a
-#         with BytesIO() as data_buffer:
-#             _, _, _, data_lookup = write_file_data(data_buffer, archive, version, auto_compress)
-#             toc_offset, toc_size = write_table_of_contents(stream, archive, version, data_lookup, recalculate_totals)
-#             data_offset = stream.tell()
-#             data_buffer.seek(0)
-#             stream.write(data_buffer.read())
-#         subheader = ArchiveSubHeader(toc_size, data_offset, toc_offset)
-#
-#     elif version in [ArchiveVersion.Dow2, ArchiveVersion.Dow3]:
-#         # Since these formats can point to TOC specifically, I write to the stream directly
-#         data_offset, _, data_size, data_lookup = write_file_data(stream, archive, version, auto_compress)
-#         toc_offset, toc_size = write_table_of_contents(stream, archive, version, data_lookup, recalculate_totals)
-#         if version == ArchiveVersion.Dow2:
-#             subheader = ArchiveSubHeader(toc_size, data_offset, toc_offset, 1, 0, 0)
-#         elif version == ArchiveVersion.Dow3:
-#             subheader = ArchiveSubHeader(toc_size, data_offset, toc_offset, None, None, None, 0, 0, 1,
-#                                          bytes([0x00] * 256), data_size)
-#         else:
-#             raise NotImplementedError(version)  # In case I add to the list in the above if and forget to add it here
-#
-#     end = stream.tell()
-#     stream.seek(subheader_offset)
-#     subheader.pack(stream, version)
-#
-#     stream.seek(end)
-#     return end - start
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from io import BytesIO
+from mmap import mmap, ACCESS_READ
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, Hashable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from serialization_tools.ioutil import Ptr, WindowPtr
+
+from .archive.header import ArchiveHeader, DowIArchiveHeader, DowIIArchiveHeader, DowIIIArchiveHeader
+from .common import ArchiveRange, ArchiveVersion
+from .compression import CompressionMethod, CompressionPolicy, FixedCompressionPolicy, STORE
+from .file.header import FileHeader, FileCompressionFlag, DowIFileHeader, DowIIFileHeader, DowIIIFileHeader
+from .folder.header import FolderHeader
+from .hierarchy import folder_basename
+from .toc.toc_ptr import ArchiveTableOfContentsPtr, TocItemPtr
+from .validation import gen_checksums
+from .vdrive.header import VirtualDriveHeader
+from ..common import VersionLike
+
+if TYPE_CHECKING:
+    from .archive.archive import Archive
+    from .file.file import File
+    from .folder.folder import Folder
+
+PackSource = Union[bytes, bytearray, memoryview, str, os.PathLike[str], Callable[[], Union[bytes, memoryview]]]
+"""A file's data; raw data, the path of a file to read, or a callable which returns the data (called on a worker thread)."""
+
+_NO_CHECKSUMS = (b"\0" * 16, b"\0" * 16)
+_MAX_INDEX: Dict[VersionLike, int] = {  # Dawn of War I & II store table ranges (and counts) as unsigned shorts
+    ArchiveVersion.Dow: 0xFFFF,
+    ArchiveVersion.Dow2: 0xFFFF,
+}
+
+
+@dataclass
+class PackEntry:
+    name: str
+    source: PackSource
+    compress: Optional[Union[bool, CompressionMethod]] = None
+    """Whether (or how) the data should be compressed; if None, the writer's policy chooses. Data is only stored compressed if it shrinks."""
+    decompressed_size: Optional[int] = None
+    """When specified, the source is the payload as stored (E.G. copied from another archive) and is written as-is; it is compressed if its size differs."""
+    template: Optional[FileHeader] = field(default=None, repr=False)
+    """A header of the archive's version whose unknown fields are preserved; E.G. when repacking an archive."""
+    data_offset: Optional[int] = None
+    """When patching (see ArchiveWriter.patch), the payload is already in the archive's data section at this offset, as described by the template; it is never read."""
+
+
+@dataclass(frozen=True)
+class PackStats:
+    """Describes the payloads written by ArchiveWriter.write (or ArchiveWriter.patch); see ArchiveWriter.stats."""
+    files: int
+    """The number of files whose payload was written (or shared); files kept by a patch aren't counted."""
+    payloads: int
+    """The number of unique payloads written."""
+    bytes_written: int
+    """The size of the unique payloads written."""
+    bytes_saved: int
+    """The size of the payloads which weren't written, because an identical payload was shared instead."""
+
+    @property
+    def duplicates(self) -> int:
+        return self.files - self.payloads
+
+
+Payload = Tuple[Union[bytes, memoryview], int, FileCompressionFlag]
+"""A payload as stored, its decompressed size and its (Dawn of War I) compression flag."""
+
+
+class _ArchiveSource:
+    # An archive on disk, shared by every payload read from it; it's memory mapped on first use (so payloads can be read concurrently, without a handle each), and unmapped once written
+    def __init__(self, path: Path):
+        self.path = path
+        self._mapped: Optional[mmap] = None
+        self._lock = threading.Lock()
+
+    def read(self, offset: int, size: int) -> bytes:
+        with self._lock:
+            if self._mapped is None:
+                with open(self.path, "rb") as handle:
+                    self._mapped = mmap(handle.fileno(), 0, access=ACCESS_READ)
+            mapped = self._mapped
+        return mapped[offset:offset + size]  # A copy; so no view outlives the map
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mapped is not None:
+                self._mapped.close()
+                self._mapped = None
+
+
+@dataclass
+class _ArchivePayload:
+    # Reads a file's payload (as stored) from an archive on disk; so repacking a sparse archive never holds every payload in memory
+    source: _ArchiveSource
+    offset: int
+    size: int
+
+    def __call__(self) -> bytes:
+        return self.source.read(self.offset, self.size)
+
+
+@dataclass(eq=False)
+class _Node:
+    name: str
+    """The folder's name; folder names are paths relative to their drive (E.G. 'art\\ebps')."""
+    folders: Dict[str, _Node] = field(default_factory=dict)  # Keyed by the (lowercase) last part of the folder's name
+    files: Dict[str, PackEntry] = field(default_factory=dict)  # Keyed by the (lowercase) file name
+
+
+@dataclass(eq=False)
+class _DriveNode(_Node):
+    path: str = "data"
+    unk: bytes = b""
+    root_folder: bool = True
+    """Whether the drive's files and folders are written under a root folder named ''; as the game expects. Always written if the drive has files of its own."""
+
+
+@dataclass(eq=False)
+class _FolderRecord:
+    node: _Node
+    sub_folder_range: ArchiveRange = field(default_factory=lambda: ArchiveRange(0, 0))  # Set once the folder's children are numbered; see ArchiveWriter._flatten
+    file_range: ArchiveRange = field(default_factory=lambda: ArchiveRange(0, 0))
+
+
+@dataclass
+class _TocLayout:
+    version: VersionLike
+    drives: List[Tuple[_DriveNode, ArchiveRange, ArchiveRange]]
+    folders: List[_FolderRecord]
+    entries: List[PackEntry]
+    names: bytes
+    name_count: int
+    folder_name_offsets: List[int]
+    file_name_offsets: List[int]
+
+    @property
+    def offsets(self) -> Tuple[int, int, int, int]:
+        # The TOC is laid out as: pointers, drives, folders, files, names; offsets are relative to the TOC
+        drive_offset = ArchiveTableOfContentsPtr.version_class(self.version).LAYOUT.size
+        folder_offset = drive_offset + VirtualDriveHeader.version_class(self.version).LAYOUT.size * len(self.drives)
+        file_offset = folder_offset + FolderHeader.version_class(self.version).LAYOUT.size * len(self.folders)
+        name_offset = file_offset + FileHeader.version_class(self.version).LAYOUT.size * len(self.entries)
+        return drive_offset, folder_offset, file_offset, name_offset
+
+    @property
+    def size(self) -> int:
+        # The TOC's size doesn't depend on the data; so it's known before any data is written
+        return self.offsets[3] + len(self.names)
+
+    def pack(self, file_headers: List[FileHeader]) -> bytes:
+        drive_offset, folder_offset, file_offset, name_offset = self.offsets
+        drive_class, folder_class = VirtualDriveHeader.version_class(self.version), FolderHeader.version_class(self.version)
+        with BytesIO() as toc:
+            toc_ptr = ArchiveTableOfContentsPtr.version_class(self.version)(TocItemPtr(drive_offset, len(self.drives)), TocItemPtr(folder_offset, len(self.folders)), TocItemPtr(file_offset, len(self.entries)), TocItemPtr(name_offset, self.name_count))
+            toc_ptr.pack(toc)
+            for drive, sub_folder_range, file_range in self.drives:
+                drive_class(drive.path, drive.name, sub_folder_range, file_range, drive.unk).pack(toc)
+            for record, record_name_offset in zip(self.folders, self.folder_name_offsets):
+                folder_class(record_name_offset, record.sub_folder_range, record.file_range).pack(toc)
+            for header in file_headers:
+                header.pack(toc)
+            toc.write(self.names)
+            return toc.getvalue()
+
+
+def load_source(source: PackSource) -> Union[bytes, memoryview]:
+    if isinstance(source, bytearray):
+        return memoryview(source)
+    if isinstance(source, (bytes, memoryview)):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        return Path(source).read_bytes()
+    return source()
+
+
+def get_compression_flag(payload: Union[bytes, memoryview], decompressed_size: int) -> FileCompressionFlag:
+    """Gets the (Dawn of War I) compression flag of a stored payload; the flag is the window size, taken from the zlib header."""
+    if len(payload) == decompressed_size:
+        return FileCompressionFlag.Decompressed
+    window = payload[0] >> 4  # CINFO; log2(window size) - 8
+    return FileCompressionFlag.Compressed16 if window == 6 else FileCompressionFlag.Compressed32
+
+
+def _encode_payload(entry: PackEntry, data: Union[bytes, memoryview], method: Optional[CompressionMethod]) -> Payload:
+    if entry.decompressed_size is not None:
+        return data, entry.decompressed_size, get_compression_flag(data, entry.decompressed_size)
+    if method is not None and method.compress and len(data) > 0:
+        compressor = zlib.compressobj(method.level, zlib.DEFLATED, method.wbits)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) < len(data):
+            return compressed, len(data), get_compression_flag(compressed, len(data))
+    return data, len(data), FileCompressionFlag.Decompressed
+
+
+_ChooseMethod = Callable[[PackEntry, Union[bytes, memoryview]], Optional[CompressionMethod]]
+_PreparedPayload = Tuple[Optional[Payload], Hashable]
+"""A payload (None if it's a duplicate; see _PayloadClaims) and its dedup key (None without dedup)."""
+
+
+class _PayloadClaims:
+    """
+    Deduplicates payloads by the hash of their input; the first worker to hash an input encodes it, and workers which hash the same input skip it.
+
+    The key includes how the input is encoded; so shared payloads are always identical, and identical inputs are only ever compressed once.
+    A claim only holds its payload until it's written (see release); so memory use stays bounded by the writer's max_pending.
+    """
+
+    def __init__(self) -> None:
+        self._claims: Dict[Hashable, Optional[Future[Payload]]] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, entry: PackEntry, choose: _ChooseMethod) -> _PreparedPayload:
+        # Runs on a worker thread; hashlib and zlib release the GIL, so payloads are hashed and compressed in parallel
+        data = load_source(entry.source)
+        method = choose(entry, data)
+        key = hashlib.blake2b(data).digest(), entry.decompressed_size, method
+        with self._lock:
+            if key in self._claims:
+                return None, key  # A duplicate; the payload is prepared (or was written) by the claim's owner
+            claim: Future[Payload] = Future()
+            self._claims[key] = claim
+        try:
+            claim.set_result(_encode_payload(entry, data, method))
+        except BaseException as e:
+            claim.set_exception(e)
+            raise
+        return claim.result(), key
+
+    def get(self, key: Hashable) -> Payload:
+        # A duplicate may be written before its owner; the owner claimed the key while running, so waiting on it can't deadlock the pool
+        claim = self._claims[key]
+        assert claim is not None, key  # Released claims were written; so their duplicates share the written payload
+        return claim.result()
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            self._claims[key] = None
+
+
+def _prepare_payload(entry: PackEntry, choose: _ChooseMethod) -> _PreparedPayload:
+    # Runs on a worker thread; zlib releases the GIL, so payloads are compressed in parallel
+    data = load_source(entry.source)
+    return _encode_payload(entry, data, choose(entry, data)), None
+
+
+def _split_path(path: str) -> Tuple[str, List[str]]:
+    # 'data:/art/ebps/unit.whm' becomes ('data', ['art', 'ebps', 'unit.whm']); paths without a drive are on the 'data' drive
+    drive, sep, path = str(path).replace("\\", "/").rpartition(":")
+    parts = [part for part in path.split("/") if part and part != "."]
+    if not parts:
+        raise ValueError(f"'{path}' does not name a file.")
+    return (drive if sep else "data"), parts
+
+
+class ArchiveWriter:
+    """
+    Writes an archive in a single streaming pass; payloads are loaded (and compressed) on a thread pool, and written sequentially, in order.
+
+    Only the hierarchy (and each file's source) is kept in memory; payloads are written as soon as they're ready, with at most max_pending held at once.
+    The layout is header, TOC, data; the TOC's size is known up front (it doesn't depend on the data), so space is reserved for it and it is written after the data.
+    The header is then rewritten, with the TOC and data pointers and (for Dawn of War I & II) the MD5 checksums; which requires a second (sequential) read of the TOC and data.
+
+    Identical payloads are stored once (see dedup); file headers only store a data offset and sizes, so duplicate files share the payload's offset.
+    """
+
+    def __init__(self, version: VersionLike, name: str, *, compress: bool = True, level: int = zlib.Z_DEFAULT_COMPRESSION, policy: Optional[CompressionPolicy] = None, workers: Optional[int] = None, max_pending: Optional[int] = None, header: Optional[ArchiveHeader] = None, dedup: bool = True):
+        """
+        :param version: The archive's version; Dawn of War I, II or III
+        :param name: The archive's name
+        :param compress: Whether files are compressed by default (see PackEntry.compress); ignored if a policy is specified
+        :param level: The zlib compression level; ignored if a policy is specified (except for files added with compress=True)
+        :param policy: Chooses how each file (added with compress=None) is stored; E.G. an AdaptiveCompressionPolicy. Defaults to compressing (or storing) every file.
+        :param workers: The number of compression threads; defaults to the number of CPUs.
+        :param max_pending: The maximum number of payloads loaded ahead of the writer; bounds memory use. Defaults to twice the number of workers.
+        :param header: A header of the archive's version whose unknown fields are preserved; E.G. when repacking an archive.
+        :param dedup: When true, each input is hashed, and files with identical inputs (and compression) share a single payload; E.G. textures shared by re-skins.
+        """
+        if version not in _ARCHIVE_HEADER_VERSIONS:
+            raise NotImplementedError(version)
+        self.version = version
+        self.name = name
+        self.level = level
+        self.policy = policy if policy is not None else FixedCompressionPolicy(CompressionMethod(True, level) if compress else STORE)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self.header = header
+        self.dedup = dedup
+        self.stats: Optional[PackStats] = None
+        """The stats of the last write (or patch)."""
+        self._drives: Dict[str, _DriveNode] = {}
+        self._sources: List[_ArchiveSource] = []
+
+    @classmethod
+    def from_archive(cls, archive: Archive, path: Optional[Union[str, os.PathLike[str]]] = None, keep_payloads: bool = False, **kwargs: Any) -> ArchiveWriter:
+        """
+        Creates a writer which repacks the archive; each file's compression is preserved, and loaded payloads which are still compressed are not recompressed.
+
+        :param archive: The archive to repack
+        :param path: The archive's file; required if any file's data is not loaded (E.G. the archive was unpacked sparsely), its payload is read from the file when it is written.
+        :param keep_payloads: When true, each entry records its payload's offset (see PackEntry.data_offset); so the archive can be patched in place
+        :param kwargs: Passed to the writer; see ArchiveWriter.__init__
+        """
+        writer = cls(archive.header.version, archive.header.name, header=archive.header, **kwargs)
+        source = _ArchiveSource(Path(path)) if path is not None else None
+        if source is not None:
+            writer._sources.append(source)
+        for drive in archive.drives:
+            drive_node = writer.add_drive(drive.path, drive.name, drive.header.unk)
+            drive_node.root_folder = False  # Unless the archive has one; so its layout is kept
+            # Like VirtualDrive.build_tree; a drive may still list the files (and folders) of its folders
+            for file in (f for f in drive.files if not f._parent):
+                writer._add_entry(drive_node, _archive_entry(archive, file, source, keep_payloads))
+            pending: List[Tuple[Folder, _Node]] = [(folder, drive_node) for folder in reversed(drive.sub_folders) if not folder._parent]
+            while pending:
+                folder, parent = pending.pop()
+                node: _Node
+                if parent is drive_node and folder.name == "":  # The drive's root folder; its files and folders are the drive's
+                    drive_node.root_folder = True
+                    node = drive_node
+                else:
+                    node = parent.folders[folder_basename(folder.name).lower()] = _Node(folder.name)
+                for file in folder.files:
+                    writer._add_entry(node, _archive_entry(archive, file, source, keep_payloads))
+                pending.extend((sub_folder, node) for sub_folder in reversed(folder.sub_folders))
+        return writer
+
+    def add_drive(self, path: str = "data", name: Optional[str] = None, unk: bytes = b"") -> _DriveNode:
+        """
+        Adds a drive (if it was not already added); drives are created as needed by add_file, but this allows setting the drive's name.
+
+        :param path: The drive's path; E.G. 'data'
+        :param name: The drive's name; defaults to the archive's name
+        :param unk: The drive header's unknown field
+        """
+        drive = self._drives.get(path.lower())
+        if drive is None:
+            drive = self._drives[path.lower()] = _DriveNode(name if name is not None else self.name, path=path, unk=unk)
+        return drive
+
+    def _get_folder(self, drive_path: str, parts: List[str]) -> _Node:
+        node: _Node = self.add_drive(drive_path)
+        for i, part in enumerate(parts):
+            child = node.folders.get(part.lower())
+            if child is None:
+                child = node.folders[part.lower()] = _Node("\\".join(parts[:i + 1]))  # The game separates folder names with backslashes
+            node = child
+        return node
+
+    @staticmethod
+    def _add_entry(node: _Node, entry: PackEntry, replace_existing: bool = False) -> PackEntry:
+        key = entry.name.lower()
+        if key in node.files and not replace_existing:
+            raise ValueError(f"'{entry.name}' was already added to '{node.name}'.")
+        node.files[key] = entry  # A replaced entry keeps its position
+        return entry
+
+    def get_entry(self, path: str) -> Optional[PackEntry]:
+        drive_path, parts = _split_path(path)
+        node: Optional[_Node] = self._drives.get(drive_path.lower())
+        for part in parts[:-1]:
+            if node is None:
+                return None
+            node = node.folders.get(part.lower())
+        return node.files.get(parts[-1].lower()) if node is not None else None
+
+    def remove_file(self, path: str) -> PackEntry:
+        """
+        Removes a file; its (now empty) folders are kept.
+
+        :raises FileNotFoundError: if the file was not added
+        """
+        drive_path, parts = _split_path(path)
+        if self.get_entry(path) is None:
+            raise FileNotFoundError(path)
+        return self._get_folder(drive_path, parts[:-1]).files.pop(parts[-1].lower())
+
+    def add_file(self, path: str, source: PackSource, compress: Optional[Union[bool, CompressionMethod]] = None, replace: bool = False) -> PackEntry:
+        """
+        Adds a file; folders are created as needed.
+
+        :param path: The file's full path; E.G. 'data:/art/ebps/races/unit.whm'. Paths are case-insensitive and accept either slash; paths without a drive are added to the 'data' drive.
+        :param source: The file's data (see PackSource); only loaded when the archive is written
+        :param compress: Whether (or how) the file should be compressed; if None, the writer's policy chooses
+        :param replace: When true, a file already added at the path is replaced; otherwise, a ValueError is raised
+        """
+        drive_path, parts = _split_path(path)
+        return self._add_entry(self._get_folder(drive_path, parts[:-1]), PackEntry(parts[-1], source, compress), replace)
+
+    def add_directory(self, directory: Union[str, os.PathLike[str]], drive: str = "data", compress: Optional[Union[bool, CompressionMethod]] = None) -> int:
+        """
+        Adds every file under the directory (E.G. a mod's 'Data' folder), in sorted order; files are only read when the archive is written.
+
+        :returns: The number of files added
+        """
+        directory = Path(directory)
+        added = 0
+        for root, folders, files in os.walk(directory):
+            folders.sort()
+            relative = Path(root).relative_to(directory).as_posix()
+            prefix = f"{drive}:/" if relative == "." else f"{drive}:/{relative}/"
+            for name in sorted(files):
+                self.add_file(prefix + name, Path(root) / name, compress)
+                added += 1
+        return added
+
+    def _flatten(self) -> Tuple[List[Tuple[_DriveNode, ArchiveRange, ArchiveRange]], List[_FolderRecord], List[PackEntry]]:
+        # Each drive's range spans all of its folders and files; each folder's sub folders (and files) must be contiguous, so folders are numbered breadth-first
+        # The game resolves files through folders; so the drive's own files are written in its root folder (named '')
+        drives: List[Tuple[_DriveNode, ArchiveRange, ArchiveRange]] = []
+        folders: List[_FolderRecord] = []
+        entries: List[PackEntry] = []
+        for drive in self._drives.values():
+            folder_start, file_start = len(folders), len(entries)
+            if drive.root_folder or drive.files:
+                pending: Deque[_FolderRecord] = deque([_FolderRecord(_Node("", drive.folders, drive.files))])
+            else:
+                pending = deque(_FolderRecord(node) for node in drive.folders.values())
+            folders.extend(pending)
+            while pending:
+                record = pending.popleft()
+                record.file_range = _range(len(entries), len(entries) + len(record.node.files))
+                entries.extend(record.node.files.values())
+                children = [_FolderRecord(node) for node in record.node.folders.values()]
+                record.sub_folder_range = _range(len(folders), len(folders) + len(children))
+                folders.extend(children)
+                pending.extend(children)
+            drives.append((drive, ArchiveRange(folder_start, len(folders)), ArchiveRange(file_start, len(entries))))
+        return drives, folders, entries
+
+    def _layout(self) -> _TocLayout:
+        version = self.version
+        drives, folders, entries = self._flatten()
+
+        name_offsets: Dict[str, int] = {}
+        names = bytearray()
+
+        def add_name(name: str) -> int:
+            offset = name_offsets.get(name)
+            if offset is None:
+                offset = name_offsets[name] = len(names)
+                names.extend(name.encode("ascii") + b"\0")
+            return offset
+
+        folder_name_offsets = [add_name(record.node.name) for record in folders]
+        file_name_offsets = [add_name(entry.name) for entry in entries]
+        limit = _MAX_INDEX.get(version)
+        if limit is not None and max(len(folders), len(entries), len(name_offsets)) > limit:
+            raise ValueError(f"Archive version '{version}' is limited to {limit} folders, files and names; got {len(folders)} folders, {len(entries)} files and {len(name_offsets)} names.")
+        return _TocLayout(version, drives, folders, entries, bytes(names), len(name_offsets), folder_name_offsets, file_name_offsets)
+
+    def write(self, stream: BinaryIO, write_magic: bool = True, toc_reserve: int = 0) -> int:
+        """
+        Writes the archive to the stream, at its current position.
+
+        Every payload is written; including those of entries which specify a data_offset (see PackEntry.data_offset and ArchiveWriter.patch).
+
+        :param stream: The stream to write to; must be seekable and readable (E.G. a file opened with 'w+b'), so the header can be rewritten; anything after the archive is truncated
+        :param write_magic: When true, the magic word is written; offsets are always absolute, so when false, the magic word should have already been written
+        :param toc_reserve: The number of bytes reserved after the TOC; so the archive can later be patched in place, even if its TOC grows (see ArchiveWriter.patch)
+        :returns: The number of bytes written
+        """
+        layout = self._layout()
+        start = stream.tell()
+        self._create_header(WindowPtr(0, layout.size), 0, 0, _NO_CHECKSUMS).pack(stream, write_magic)  # A placeholder; rewritten once the offsets are known
+        toc_pos = stream.tell()
+        data_pos = toc_pos + layout.size + toc_reserve
+        stream.seek(data_pos)  # Reserve the TOC
+        file_headers = self._write_data(stream, layout, data_pos, keep_payloads=False)
+        end = stream.tell()
+        stream.truncate()
+        stream.seek(toc_pos)
+        stream.write(layout.pack(file_headers))
+        self._write_header(stream, start, WindowPtr(toc_pos, layout.size), data_pos, end, write_magic)
+        return end - start
+
+    def patch(self, stream: BinaryIO, header: ArchiveHeader) -> bool:
+        """
+        Updates an archive in place; instead of rewriting it.
+
+        Entries which specify a data_offset (see ArchiveWriter.from_archive) keep their payload; it is never read.
+        Other payloads are appended to the end of the data section, then the TOC is rewritten (in place) and the header is updated.
+        Payloads which are no longer referenced are left as dead space; see ArchivePatcher.compact.
+
+        For Dawn of War I & II, updating the header's (full) checksum still requires a sequential read of the whole archive.
+
+        :param stream: The archive's stream; must be seekable, readable and writable (E.G. a file opened with 'r+b'), and start at the archive's magic word
+        :param header: The archive's current header
+        :returns: True if the archive was patched; False (and nothing is written) if the new TOC won't fit in the space before the data section
+        """
+        layout = self._layout()
+        toc_pos, data_pos = header.toc_ptr.offset, header.data_ptr.offset
+        if layout.size > data_pos - toc_pos:
+            return False
+        stream.seek(0, os.SEEK_END)
+        file_headers = self._write_data(stream, layout, data_pos, keep_payloads=True)
+        end = stream.tell()
+        stream.seek(toc_pos)
+        stream.write(layout.pack(file_headers))
+        stream.write(b"\0" * (data_pos - toc_pos - layout.size))  # Clear what remains of the old TOC
+        self._write_header(stream, 0, WindowPtr(toc_pos, layout.size), data_pos, end, True)
+        return True
+
+    def _write_header(self, stream: BinaryIO, start: int, toc_ptr: WindowPtr, data_pos: int, end: int, write_magic: bool) -> None:
+        header = self._create_header(toc_ptr, data_pos, end - data_pos, _NO_CHECKSUMS)
+        if isinstance(header, (DowIArchiveHeader, DowIIArchiveHeader)):
+            full, toc = gen_checksums(stream, header, fast=False)
+            assert full is not None  # Only skipped by a fast validation
+            header.checksums = full, toc
+        stream.seek(start)
+        header.pack(stream, write_magic)
+        stream.seek(end)
+
+    def _write_data(self, stream: BinaryIO, layout: _TocLayout, data_pos: int, keep_payloads: bool) -> List[FileHeader]:
+        headers: List[FileHeader] = []
+        pending: Deque[Tuple[PackEntry, Optional[Future[_PreparedPayload]]]] = deque()
+        name_offsets = layout.file_name_offsets
+        claims = _PayloadClaims() if self.dedup else None
+        prepare = claims.prepare if claims is not None else _prepare_payload
+        written: Dict[Hashable, Tuple[int, int, int, FileCompressionFlag]] = {}  # The data offset, sizes and flag of each unique payload
+        files = payloads = bytes_written = bytes_saved = 0
+
+        def write_next() -> None:
+            nonlocal files, payloads, bytes_written, bytes_saved
+            entry, future = pending.popleft()
+            if future is None:  # The payload is already in the data section
+                template, data_offset = entry.template, entry.data_offset
+                assert template is not None and data_offset is not None  # Checked when queued
+                flag = getattr(template, "compression_flag", FileCompressionFlag.Decompressed)  # Only Dawn of War I has a flag
+                header = self._create_file_header(entry, name_offsets[len(headers)], data_offset, template.compressed_size, template.decompressed_size, flag)
+            else:
+                payload, key = future.result()
+                files += 1
+                if key in written:  # Shares the payload's offset
+                    data_offset, compressed_size, decompressed_size, flag = written[key]
+                    bytes_saved += compressed_size
+                else:
+                    if payload is None:
+                        assert claims is not None  # Only claims skip duplicate payloads
+                        payload = claims.get(key)
+                    data, decompressed_size, flag = payload
+                    data_offset, compressed_size = stream.tell() - data_pos, len(data)  # Data offsets are relative to the data section
+                    stream.write(data)
+                    payloads += 1
+                    bytes_written += compressed_size
+                    if claims is not None:
+                        written[key] = data_offset, compressed_size, decompressed_size, flag
+                        claims.release(key)
+                header = self._create_file_header(entry, name_offsets[len(headers)], data_offset, compressed_size, decompressed_size, flag)
+            headers.append(header)
+
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="sga-writer") as executor:
+                for entry in layout.entries:
+                    if keep_payloads and entry.data_offset is not None:
+                        if entry.template is None:
+                            raise ValueError(f"'{entry.name}' has a data offset, but no template to describe its payload.")
+                        pending.append((entry, None))
+                    else:
+                        pending.append((entry, executor.submit(prepare, entry, self._choose_method)))
+                    if len(pending) >= self.max_pending:
+                        write_next()
+                while pending:
+                    write_next()
+        finally:
+            for source in self._sources:
+                source.close()  # Reopened if the writer is used again; until then, the archives can be replaced (see ArchivePatcher.compact)
+        self.stats = PackStats(files, payloads, bytes_written, bytes_saved)
+        return headers
+
+    def _choose_method(self, entry: PackEntry, data: Union[bytes, memoryview]) -> Optional[CompressionMethod]:
+        # Runs on a worker thread; copied payloads are written as-is, so they have no method
+        if entry.decompressed_size is not None:
+            return None
+        if entry.compress is None:
+            return self.policy.choose(entry.name, data)
+        if isinstance(entry.compress, CompressionMethod):
+            return entry.compress
+        return CompressionMethod(True, self.level) if entry.compress else STORE
+
+    def _create_file_header(self, entry: PackEntry, name_offset: int, data_offset: int, compressed_size: int, decompressed_size: int, flag: FileCompressionFlag) -> FileHeader:
+        file_class = FileHeader.version_class(self.version)
+        name_ptr, data_ptr = Ptr(name_offset), Ptr(data_offset)
+        if file_class is DowIFileHeader:
+            data_ptr = WindowPtr(data_offset, compressed_size)  # Mirrors DowIFileHeader._unpack_tuple
+            if isinstance(entry.template, DowIFileHeader) and entry.decompressed_size is not None:
+                flag = entry.template.compression_flag  # Copied payloads keep their flag; it's what the game trusts
+        if isinstance(entry.template, file_class):
+            header = replace(entry.template, name_sub_ptr=name_ptr, data_sub_ptr=data_ptr, decompressed_size=decompressed_size, compressed_size=compressed_size)
+            if isinstance(header, DowIFileHeader):
+                header.compression_flag = flag
+            return header
+        elif file_class is DowIIIFileHeader:
+            return DowIIIFileHeader(name_ptr, data_ptr, decompressed_size, compressed_size, 0, 0, 0, 0, 0)
+        elif file_class is DowIIFileHeader:
+            return DowIIFileHeader(name_ptr, data_ptr, decompressed_size, compressed_size, 0, 0)
+        else:
+            return DowIFileHeader(name_ptr, data_ptr, decompressed_size, compressed_size, flag)
+
+    def _create_header(self, toc_ptr: WindowPtr, data_offset: int, data_size: int, checksums: Tuple[bytes, bytes]) -> ArchiveHeader:
+        template = self.header
+        if self.version == ArchiveVersion.Dow:
+            return DowIArchiveHeader(self.name, toc_ptr, WindowPtr(data_offset), checksums)
+        elif self.version == ArchiveVersion.Dow2:
+            dow2_unk = template.unk if isinstance(template, DowIIArchiveHeader) else 0
+            return DowIIArchiveHeader(self.name, toc_ptr, WindowPtr(data_offset), checksums, dow2_unk)
+        else:
+            dow3_unk = template.unk if isinstance(template, DowIIIArchiveHeader) else b"\0" * 256
+            return DowIIIArchiveHeader(self.name, toc_ptr, WindowPtr(data_offset, data_size), dow3_unk)
+
+
+def _range(start: int, end: int) -> ArchiveRange:
+    return ArchiveRange(start, end) if start != end else ArchiveRange(0, 0)  # Empty ranges are written as 0-0
+
+
+def _archive_entry(archive: Archive, file: File, source: Optional[_ArchiveSource], keep_payload: bool = False) -> PackEntry:
+    entry = _archive_payload_entry(archive, file, source)
+    if keep_payload:
+        entry.data_offset = file.header.data_sub_ptr.offset
+    return entry
+
+
+def _archive_payload_entry(archive: Archive, file: File, source: Optional[_ArchiveSource]) -> PackEntry:
+    if file.data is not None:
+        if file.decompressed:
+            return PackEntry(file.name, file.data, file.header.compressed, template=file.header)
+        return PackEntry(file.name, file.data, decompressed_size=file.header.decompressed_size, template=file.header)
+    if archive.data_view is not None:
+        return PackEntry(file.name, file.read_data(archive.data_view), decompressed_size=file.header.decompressed_size, template=file.header)
+    if source is None:
+        raise ValueError(f"'{file.name}' has no data loaded; the archive must be unpacked with sparse=False, or its path specified.")
+    payload = _ArchivePayload(source, archive.header.data_ptr.offset + file.header.data_sub_ptr.offset, file.header.compressed_size)
+    return PackEntry(file.name, payload, decompressed_size=file.header.decompressed_size, template=file.header)
+
+
+_ARCHIVE_HEADER_VERSIONS = (ArchiveVersion.Dow, ArchiveVersion.Dow2, ArchiveVersion.Dow3)
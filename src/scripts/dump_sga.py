@@ -1,4 +1,5 @@
 import os
+import zlib
 from os.path import splitext, dirname, basename
 from pathlib import Path
 from typing import Iterable
@@ -8,6 +9,11 @@ from serialization_tools.walkutil import BlackList, WhiteList, filter_by_path, f
 from relic.config import DowIIIGame, DowIIGame, DowGame, filter_latest_dow_game, get_dow_root_directories
 
 from relic.sga.archive import ArchiveMagicWord, Archive
+from relic.sga.common import ArchiveIdentity
+from relic.sga.extractor import plan_extraction, iter_extraction
+from relic.sga.manifest import ExtractionManifest, MANIFEST_NAME
+
+_MANIFEST_SAVE_INTERVAL = 256
 
 
 def __safe_makedirs(path: str, use_dirname: bool = True):
@@ -42,8 +48,11 @@ def dump_archive(input_folder: os.PathLike, output_folder: os.PathLike, overwrit
         with open(input_file_path, "rb") as in_handle:
             archive = Archive.unpack(in_handle)
             archive_name = splitext(basename(input_file_path))[0]
+            identity = ArchiveIdentity.from_path(input_file_path)
+            manifest = ExtractionManifest.load(output_folder_path / archive_name / MANIFEST_NAME)
             with archive.header.data_ptr.stream_jump_to(in_handle) as data_stream:
                 print(f"\tDumping '{archive_name}'")
+                files_to_write, output_paths = [], {}
                 for _, _, _, files in archive.walk():
                     for file in files:
                         relative_file_path = file.full_path
@@ -52,17 +61,18 @@ def dump_archive(input_folder: os.PathLike, output_folder: os.PathLike, overwrit
                             relative_file_path = str(relative_file_path).replace(":", "")
 
                         output_file_path = output_folder_path / archive_name / relative_file_path
+                        manifest_name = Path(relative_file_path).as_posix()
 
                         msg = f"Writing '{relative_file_path}'"
-                        skip = False
+                        skip = verify = False
                         if output_file_path.exists():
                             if update:
-                                if output_file_path.stat().st_size == file.header.decompressed_size:
-                                    msg = f"Skipping (Up to date - Decompressed Size Match)"
-                                    skip = True
-                                elif output_file_path.stat().st_size == file.header.compressed_size:
-                                    msg = f"Skipping (Up to date - Compressed Size Match)"
+                                if manifest.is_up_to_date(manifest_name, file, output_file_path, identity):
+                                    msg = f"Skipping (Up to date - Manifest Match)"
                                     skip = True
+                                elif manifest.can_verify(manifest_name, file, output_file_path):
+                                    msg = f"Verifying"  # The archive has changed; the file must be read to compare checksums
+                                    verify = True
                                 else:
                                     msg = f"Updating"
                             elif not overwrite:
@@ -72,11 +82,26 @@ def dump_archive(input_folder: os.PathLike, output_folder: os.PathLike, overwrit
                         print(f"\t\t{msg} '{relative_file_path}'")
                         if skip:
                             continue
-                        __safe_makedirs(str(output_file_path))
-                        with open(output_file_path, "wb") as out_handle:
-                            data = file.read_data(data_stream, True)
-                            out_handle.write(data)
-                        print(f"\t\t\tWrote to '{output_file_path}'")
+                        files_to_write.append(file)
+                        output_paths[id(file)] = manifest_name, output_file_path, verify
+
+                # Files are written in data order (not walk order); avoiding seeking back and forth over the archive
+                # The manifest is saved periodically (and when interrupted); so a later update can resume where this stopped
+                try:
+                    for i, (file, data) in enumerate(iter_extraction(plan_extraction(files_to_write), data_stream)):
+                        manifest_name, output_file_path, verify = output_paths[id(file)]
+                        if verify and manifest.matches_data(manifest_name, file, data):
+                            print(f"\t\t\tSkipping (Up to date - Checksum Match) '{manifest_name}'")
+                        else:
+                            __safe_makedirs(str(output_file_path))
+                            with open(output_file_path, "wb") as out_handle:
+                                out_handle.write(zlib.decompress(data) if file.expects_decompress else data)
+                            print(f"\t\t\tWrote to '{output_file_path}'")
+                        manifest.update(manifest_name, identity, file, data)
+                        if (i + 1) % _MANIFEST_SAVE_INTERVAL == 0:
+                            manifest.save()
+                finally:
+                    manifest.save()
 
     # write_binary(walk, output_folder, decompress, write_ext)
 
@@ -5,7 +5,8 @@ from os.path import splitext, join
 from typing import List, Union, Dict, Callable, Protocol
 
 from relic.chunky import ChunkyMagic, GenericRelicChunky
-from relic.chunky.serializer import read_chunky
+from relic.chunky.serializer import MemoryViewReader, read_chunky
+from relic.sga import Archive
 from scripts.universal.common import print_reading, print_wrote, print_error, PrintOptions
 
 
@@ -63,6 +64,35 @@ def extract_dir(input_path: str, output_path: str, extractor: ChunkyExtractor, e
             extract_file(src, dest, extractor, extractor_args=extractor_args, indent_level=1, print_opts=print_opts, exts=exts, magic=magic)
 
 
+def extract_archive(input_file: str, output_path: str, extractor: ChunkyExtractor, extractor_args: Dict = None, print_opts: PrintOptions = None, exts: Union[str, List[str]] = None, magic: bool = False):
+    # Only the archive's files with matching extensions are read; they're found with the archive's extension index, instead of a walk
+    extractor_args = extractor_args or {}
+    print_opts = print_opts or PrintOptions()
+    with open(input_file, "rb") as in_handle:
+        archive = Archive.unpack(in_handle)
+        if exts:
+            entries = archive.by_extension(*([exts] if isinstance(exts, str) else exts))
+        else:
+            entries = list(archive.iter_files())
+        with archive.header.data_ptr.stream_jump_to(in_handle) as data_stream:
+            for file_path, file in entries:
+                dest = join(output_path, splitext(file_path.replace(":", ""))[0])
+                try:
+                    payload = memoryview(file.read_data(data_stream, True))  # Chunks are views of the payload; never copied
+                    if magic and not print_opts.strict and not ChunkyMagic.check_magic_word(MemoryViewReader(payload)):
+                        continue
+                    print_reading(file_path, 1, print_opts)
+                    chunky = read_chunky(payload)
+                    extractor(dest, chunky, **extractor_args)
+                    print_wrote(file_path, 2, print_opts)
+                except KeyboardInterrupt:
+                    raise  # NEVER BLOCK KEYBOARD INTERRUPT
+                except BaseException as e:
+                    if print_opts.error_fail:
+                        raise
+                    print_error(e, print_opts=print_opts, indent=2)
+
+
 def get_runner(extractor: ChunkyExtractor, extractor_args_getter: Callable[[argparse.Namespace], Dict], exts: Union[str, List[str]] = None, magic: bool = True):
     def run_extract(run_args: argparse.Namespace):
         inputs = []
@@ -81,7 +111,11 @@ def get_runner(extractor: ChunkyExtractor, extractor_args_getter: Callable[[argp
 
         def do(i_path: str, o_path: str):
             try:
-                if path.isfile(i_path):
+                if path.isfile(i_path) and splitext(i_path)[1].lower() == ".sga":
+                    if not print_opts.quiet:
+                        print_reading(i_path)
+                    extract_archive(i_path, o_path, extractor, extractor_args, print_opts, exts=exts, magic=magic)
+                elif path.isfile(i_path):
                     extract_file(i_path, o_path, extractor, extractor_args, print_opts, exts=exts, magic=magic)
                 else:
                     if not print_opts.quiet:
@@ -1,15 +1,19 @@
 import argparse
 from os.path import basename, splitext
 from pathlib import Path
-from typing import Dict
+from typing import BinaryIO, Dict, Union
 
 from relic.sga import Archive
+from relic.sga.decompressor import ParallelDecompressor
+from relic.sga.extractor import plan_extraction
 from scripts.universal.common import PrintOptions, print_error, print_any, SharedExtractorParser
 from scripts.universal.sga.common import get_runner
 
 
 def add_args(parser: argparse.ArgumentParser):
     parser.add_argument("-u", "--unique", action="store_true", help="Include the Archive name in the result path.")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map archives instead of reading them; avoids copying file data.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="The number of threads used to decompress files. (Defaults to the number of CPUs.)")
 
 
 def build_parser():
@@ -19,43 +23,45 @@ def build_parser():
 
 
 def extract_args(args: argparse.Namespace) -> Dict:
-    return {'prepend_archive_path': args.unique}
+    return {'prepend_archive_path': args.unique, 'memory_map': args.mmap, 'workers': args.workers}
 
 
-def unpack_archive(in_path: str, out_path: str, print_opts: PrintOptions = None, prepend_archive_path: bool = True, indent_level: int = 0, **kwargs):
+def unpack_archive(in_path: str, out_path: str, print_opts: PrintOptions = None, prepend_archive_path: bool = True, indent_level: int = 0, memory_map: bool = False, workers: int = None, **kwargs):
     out_path = Path(out_path)
-    with open(in_path, "rb") as in_handle:
-        archive = Archive.unpack(in_handle)
+    decompressor = ParallelDecompressor(workers)
+    with open(in_path, "rb") as in_handle, Archive.unpack(in_handle, memory_map=memory_map) as archive:
         archive_name = splitext(basename(in_path))[0]
-        with archive.header.data_ptr.stream_jump_to(in_handle) as data_stream:
+        if prepend_archive_path:
+            out_path /= archive_name
+        with archive.header.data_ptr.stream_jump_to(in_handle) as data_window:
+            data_stream = archive.data_view if archive.data_view is not None else data_window
             print_any(f"Unpacking \"{archive_name}\"...", indent_level, print_opts)
-            for _, _, _, files in archive.walk():
-                for file in files:
-                    try:
-                        relative_file_path = file.full_path
-
-                        if ':' in relative_file_path.parts[0]:
-                            relative_file_path = str(relative_file_path).replace(":", "")
-
-                        rel_out_path = Path(out_path)
-                        if prepend_archive_path:
-                            rel_out_path /= archive_name
-
-                        rel_out_path /= relative_file_path
-
-                        rel_out_path.parent.mkdir(parents=True, exist_ok=True)
-                        print_any(f"Reading \"{relative_file_path}\"...", indent_level + 1, print_opts)
-                        with open(rel_out_path, "wb") as out_handle:
-                            data = file.read_data(data_stream, True)
-                            out_handle.write(data)
-                        print_any(f"Writing \"{rel_out_path}\"...", indent_level + 2, print_opts)
-                    except KeyboardInterrupt:
-                        raise
-                    except BaseException as e:
-                        if not print_opts or print_opts.error_fail:
-                            raise
-                        else:
-                            print_error(e, indent_level, print_opts)
+            # Written in a separate frame; so no views of a memory-mapped archive outlive it, and the archive can be closed
+            _write_files(archive, data_stream, decompressor, out_path, print_opts, indent_level)
+
+
+def _write_files(archive: Archive, data_stream: Union[BinaryIO, memoryview], decompressor: ParallelDecompressor, out_path: Path, print_opts: PrintOptions = None, indent_level: int = 0):
+    entries = list(archive.iter_files())
+    file_paths = {id(file): path for path, file in entries}
+    files = (file for _, file in entries)
+    for file, data_future in decompressor.read_runs(plan_extraction(files), data_stream):
+        try:
+            relative_file_path = file_paths[id(file)].replace(":", "")
+            rel_out_path = out_path / relative_file_path
+
+            rel_out_path.parent.mkdir(parents=True, exist_ok=True)
+            print_any(f"Reading \"{relative_file_path}\"...", indent_level + 1, print_opts)
+            data = data_future.result()
+            with open(rel_out_path, "wb") as out_handle:
+                out_handle.write(data)
+            print_any(f"Writing \"{rel_out_path}\"...", indent_level + 2, print_opts)
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            if not print_opts or print_opts.error_fail:
+                raise
+            else:
+                print_error(e, indent_level, print_opts)
 
 
 Runner = get_runner(unpack_archive, extract_args)
@@ -1,12 +1,15 @@
+import pickle
+import zlib
 from abc import abstractmethod
 from io import BytesIO
 
 import pytest
 
-from relic.sga.archive import Archive, ArchiveMagicWord
+from relic.sga.archive import Archive, ArchiveHeader, ArchiveMagicWord
+from relic.sga.common import ArchiveIdentity
 from relic.sga.hierarchy import ArchiveWalk
 from tests.helpers import TF
-from tests.relic.sga.datagen import DowII, DowI, DowIII
+from tests.relic.sga.datagen import DOW1_ARCHIVE, DOW1_ARCHIVE_PACKED, DOW2_ARCHIVE, DOW2_ARCHIVE_PACKED, DOW3_ARCHIVE, DOW3_ARCHIVE_PACKED
 
 
 class ArchiveTests:
@@ -48,20 +51,12 @@ class ArchiveTests:
     @abstractmethod
     def test_pack(self, archive: Archive, expected: bytes):
         for write_magic in TF:
-            try:
-                with BytesIO() as stream:
-                    packed = archive.pack(stream, write_magic)
-            except NotImplementedError:
-                pass  # Currently not implemented; we'll expect this for now
-            else:
-                assert expected == packed
-
-
-def fast_gen_dow1_archive(*args):
-    return DowI.gen_sample_archive(*args), DowI.gen_sample_archive_buffer(*args)
-
-
-DOW1_ARCHIVE, DOW1_ARCHIVE_PACKED = fast_gen_dow1_archive("Dow1 Test Archive", "Tests", "And Now For Something Completely Different.txt", b"Just kidding, it's Monty Python.")
+            with BytesIO() as stream:
+                if not write_magic:
+                    ArchiveMagicWord.write_magic_word(stream)  # Offsets are absolute; so the magic word must still precede the archive
+                packed = archive.pack(stream, write_magic)
+                assert expected == stream.getvalue()
+                assert packed == len(expected) - (0 if write_magic else ArchiveMagicWord.layout.size)
 
 
 def DOW1_ARCHIVE_WALK() -> ArchiveWalk:
@@ -94,13 +89,6 @@ class TestDowIArchive(ArchiveTests):
         super().test_walk(archive, expected)
 
 
-def fast_gen_dow2_archive(*args):
-    return DowII.gen_sample_archive(*args), DowII.gen_sample_archive_buffer(*args)
-
-
-DOW2_ARCHIVE, DOW2_ARCHIVE_PACKED = fast_gen_dow2_archive("Dow2 Test Archive", "Tests", "A Favorite Guardsmen VL.txt", b"Where's that artillery!?")
-
-
 def DOW2_ARCHIVE_WALK() -> ArchiveWalk:
     a = DOW2_ARCHIVE
     d = a.drives[0]
@@ -131,13 +119,6 @@ class TestDowIIArchive(ArchiveTests):
         super().test_walk(archive, expected)
 
 
-def fast_gen_dow3_archive(*args):
-    return DowIII.gen_sample_archive(*args), DowIII.gen_sample_archive_buffer(*args)
-
-
-DOW3_ARCHIVE, DOW3_ARCHIVE_PACKED = fast_gen_dow3_archive("Dow3 Test Archive", "Tests", "Some Witty FileName.txt", b"NGL; I'm running out of dumb/clever test data.")
-
-
 def DOW3_ARCHIVE_WALK() -> ArchiveWalk:
     a = DOW3_ARCHIVE
     d = a.drives[0]
@@ -166,3 +147,105 @@ class TestDowIIIArchive(ArchiveTests):
                              [(DOW3_ARCHIVE, DOW3_ARCHIVE_WALK())])
     def test_walk(self, archive: Archive, expected: ArchiveWalk):
         super().test_walk(archive, expected)
+
+
+@pytest.mark.parametrize(["stream_data", "expected"],
+                         [(DOW1_ARCHIVE_PACKED, DOW1_ARCHIVE),
+                          (DOW2_ARCHIVE_PACKED, DOW2_ARCHIVE),
+                          (DOW3_ARCHIVE_PACKED, DOW3_ARCHIVE)])
+def test_unpack_memory_map(stream_data: bytes, expected: Archive, tmp_path):
+    path = tmp_path / "archive.sga"
+    path.write_bytes(stream_data)
+    with open(path, "rb") as stream:
+        archive = Archive.unpack(stream, sparse=False, memory_map=True)
+        assert archive.data_view is not None
+        for (_, _, _, a_files), (_, _, _, e_files) in zip(archive.walk(), expected.walk()):
+            for a_file, e_file in zip(a_files, e_files):
+                assert isinstance(a_file.data, memoryview)
+                assert a_file.data == e_file.data
+                assert a_file.read_data(archive.data_view) == e_file.data
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize(["stream_data", "expected"],
+                         [(DOW1_ARCHIVE_PACKED, DOW1_ARCHIVE),
+                          (DOW2_ARCHIVE_PACKED, DOW2_ARCHIVE),
+                          (DOW3_ARCHIVE_PACKED, DOW3_ARCHIVE)])
+def test_unpack_decompress(stream_data: bytes, expected: Archive, workers: int):
+    with BytesIO(stream_data) as stream:
+        archive = Archive.unpack(stream, sparse=False, decompress=True, workers=workers)
+    for (_, _, _, a_files), (_, _, _, e_files) in zip(archive.walk(), expected.walk()):
+        for a_file, e_file in zip(a_files, e_files):
+            assert a_file.decompressed
+            assert a_file.data == e_file.get_decompressed_data()
+
+
+def test_close_memory_map(tmp_path):
+    path = tmp_path / "archive.sga"
+    path.write_bytes(DOW3_ARCHIVE_PACKED)
+    with open(path, "rb") as stream:
+        with Archive.unpack(stream, sparse=False, memory_map=True) as archive:
+            files = [f for _, _, _, files in archive.walk() for f in files]
+            held = archive.data_view[:1]
+            with pytest.raises(BufferError):
+                archive.close()  # A view of the map is still held
+            held.release()
+        assert archive.data_view is None
+        assert all(file.data is None for file in files)  # Views of the map are unloaded
+        archive.close()  # Closing twice is harmless
+
+
+@pytest.mark.parametrize(["stream_data", "expected"],
+                         [(DOW1_ARCHIVE_PACKED, DOW1_ARCHIVE),
+                          (DOW2_ARCHIVE_PACKED, DOW2_ARCHIVE),
+                          (DOW3_ARCHIVE_PACKED, DOW3_ARCHIVE)])
+def test_path_index(stream_data: bytes, expected: Archive):
+    with BytesIO(stream_data) as stream:
+        archive = Archive.unpack(stream)
+    assert archive._path_index is not None  # Built while unpacking
+    with BytesIO(stream_data) as stream:
+        assert Archive.unpack(stream, index_paths=False)._path_index is None  # Built on the first lookup
+    for _, _, folders, files in expected.walk():
+        for folder in folders:
+            path = str(folder.full_path)
+            assert archive.exists(path.upper())
+            assert archive.get_folder(path).name == folder.name
+            assert archive.get_file(path) is None
+        for file in files:
+            path = str(file.full_path).replace("/", "\\")
+            assert archive.exists(path)
+            assert archive.get_file(path.upper()).name == file.name
+    assert archive.get("data:") is archive.drives[0]
+    assert not archive.exists("data:/does/not/exist.txt")
+    assert archive.get_file("data:/does/not/exist.txt") is None
+
+
+@pytest.mark.parametrize(["stream_data"], [(DOW1_ARCHIVE_PACKED,), (DOW2_ARCHIVE_PACKED,), (DOW3_ARCHIVE_PACKED,)])
+def test_unpack_toc_cache(stream_data: bytes, tmp_path):
+    from relic.sga.toc import ArchiveTableOfContentsCache
+    path = tmp_path / "archive.sga"
+    path.write_bytes(stream_data)
+    for cache in [ArchiveTableOfContentsCache(tmp_path / "cache"), ArchiveTableOfContentsCache()]:
+        with open(path, "rb") as stream:
+            expected = Archive.unpack(stream, toc_cache=cache)
+        with open(path, "rb") as stream:
+            key = cache.get_key(ArchiveIdentity.from_stream(stream), expected.header)
+            assert cache.load(key, validated=True) is not None
+            cached = Archive.unpack(stream, toc_cache=cache)
+        for (_, _, _, a_files), (_, _, _, e_files) in zip(cached.walk(), expected.walk()):
+            assert [f.full_path for f in a_files] == [f.full_path for f in e_files]
+            assert [f.header for f in a_files] == [f.header for f in e_files]
+
+
+@pytest.mark.parametrize("entry", [b"not zlib", zlib.compress(b"not a pickle"), zlib.compress(pickle.dumps(None))])
+def test_toc_cache_malformed_entry(entry: bytes, tmp_path):
+    from relic.sga.toc import ArchiveTableOfContentsCache
+    path = tmp_path / "archive.sga"
+    path.write_bytes(DOW2_ARCHIVE_PACKED)
+    cache = ArchiveTableOfContentsCache()
+    with open(path, "rb") as stream:
+        key = cache.get_key(ArchiveIdentity.from_stream(stream), ArchiveHeader.unpack(stream))
+        cache.get_cache_path(key).write_bytes(entry)
+        assert cache.load(key) is None
+        stream.seek(0)
+        assert len(Archive.unpack(stream, toc_cache=cache).drives) > 0  # Falls back to parsing the TOC
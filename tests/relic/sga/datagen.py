@@ -1,12 +1,16 @@
 import hashlib
-from typing import Tuple, Dict
+import zlib
+from io import BytesIO
+from typing import Tuple, Dict, List
 
 from serialization_tools.ioutil import WindowPtr, Ptr
 
-from relic.sga import ArchiveHeader, DowIArchiveHeader, DowIIArchiveHeader, DowIIIArchiveHeader, VirtualDrive, Folder, File, DowIIArchive, DowIArchive, DowIIIArchive, \
+from relic.sga import Archive, ArchiveHeader, DowIArchiveHeader, DowIIArchiveHeader, DowIIIArchiveHeader, VirtualDrive, Folder, File, DowIIArchive, DowIArchive, DowIIIArchive, \
     DowIIIFolderHeader, DowIIIFileHeader, DowIIIVirtualDriveHeader, DowIVirtualDriveHeader, DowIFolderHeader, DowIFileHeader, FileCompressionFlag, DowIIFolderHeader, DowIIVirtualDriveHeader, DowIIFileHeader
 from relic.sga.common import ArchiveRange
 from relic.sga.toc.toc import ArchiveTOC
+from relic.sga.writer import ArchiveWriter
+from tests.helpers import lorem_ipsum
 
 
 def encode_and_pad(v: str, byte_size: int, encoding: str) -> bytes:
@@ -303,7 +307,7 @@ class DowII:
 
 
 class DowIII:
-    VDRIVE_UNK = bytes.fromhex("dead")  # Arbitrary value
+    VDRIVE_UNK = bytes.fromhex("deadbeef")  # Arbitrary value; fills the (4 byte) field
     ARCHIVE_HEADER_SIZE = 432
     ARCHIVE_HEADER_UNK = b"dead " * 51 + b"\0"  # 256 bytes spamming `dead ` in ascii; with one byte '\0' to pad to 256
 
@@ -413,3 +417,59 @@ class DowIII:
 
         header = cls.gen_archive_header(archive_name,  cls.ARCHIVE_HEADER_SIZE, len(full_toc), cls.ARCHIVE_HEADER_SIZE + len(full_toc), len(file_uncomp_data))
         return DowIIIArchive(header, [vdrive_], False)
+
+
+def fast_gen_dow1_archive(*args):
+    return DowI.gen_sample_archive(*args), DowI.gen_sample_archive_buffer(*args)
+
+
+DOW1_ARCHIVE, DOW1_ARCHIVE_PACKED = fast_gen_dow1_archive("Dow1 Test Archive", "Tests", "And Now For Something Completely Different.txt", b"Just kidding, it's Monty Python.")
+
+
+def fast_gen_dow2_archive(*args):
+    return DowII.gen_sample_archive(*args), DowII.gen_sample_archive_buffer(*args)
+
+
+DOW2_ARCHIVE, DOW2_ARCHIVE_PACKED = fast_gen_dow2_archive("Dow2 Test Archive", "Tests", "A Favorite Guardsmen VL.txt", b"Where's that artillery!?")
+
+
+def fast_gen_dow3_archive(*args):
+    return DowIII.gen_sample_archive(*args), DowIII.gen_sample_archive_buffer(*args)
+
+
+DOW3_ARCHIVE, DOW3_ARCHIVE_PACKED = fast_gen_dow3_archive("Dow3 Test Archive", "Tests", "Some Witty FileName.txt", b"NGL; I'm running out of dumb/clever test data.")
+
+
+def write_archive(writer: ArchiveWriter) -> BytesIO:
+    """Writes the archive to a new stream; rewound, so it can be unpacked."""
+    stream = BytesIO()
+    written = writer.write(stream)
+    assert written == len(stream.getvalue())
+    stream.seek(0)
+    return stream
+
+
+def read_files(archive: Archive, stream: BytesIO) -> dict:
+    """Reads (and decompresses) every file in the archive; keyed by full path."""
+    with archive.header.data_ptr.stream_jump_to(stream) as data:
+        return {path: bytes(file.read_data(data, True)) for path, file in archive.iter_files()}
+
+
+def gen_file(data_offset: int, decomp_size: int, comp_size: int = None, name: str = "file.bin") -> File:
+    """Creates a detached file whose data lives at `data_offset` of some data block."""
+    return File(DowIII.gen_file_header(0, data_offset, decomp_size, comp_size), name)
+
+
+def gen_files(payloads: List[bytes], corrupt: int = None) -> Tuple[List[File], bytes]:
+    """Compresses the payloads back to back; the `corrupt`-th payload gets a broken zlib header."""
+    files, data = [], b""
+    for i, payload in enumerate(payloads):
+        compressed = zlib.compress(payload)
+        if i == corrupt:
+            compressed = b"\xde\xad" + compressed[2:]
+        files.append(gen_file(len(data), len(payload), len(compressed), f"{i}.txt"))
+        data += compressed
+    return files, data
+
+
+PAYLOADS = [(lorem_ipsum * i).encode("ascii") for i in range(1, 12)]
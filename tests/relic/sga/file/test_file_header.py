@@ -99,3 +99,16 @@ class TestDowIIIFileHeader(FileHeaderTests):
     @pytest.mark.parametrize(["expected", "data_stream"], [(DOW3_HEADER, DOW3_HEADER_BUFFER)])
     def test_inner_unpack(self, data_stream: bytes, expected: FileHeader):
         super().test_inner_unpack(data_stream, expected)
+
+
+@pytest.mark.parametrize(["expected", "data_stream", "version"],
+                         [(DOW1_HEADER, DOW1_HEADER_BUFFER, ArchiveVersion.Dow),
+                          (DOW2_HEADER, DOW2_HEADER_BUFFER, ArchiveVersion.Dow2),
+                          (DOW3_HEADER, DOW3_HEADER_BUFFER, ArchiveVersion.Dow3)])
+def test_unpack_table(data_stream: bytes, expected: FileHeader, version: VersionLike, count: int = 3):
+    with BytesIO(data_stream * count) as stream:
+        headers = FileHeader.unpack_table(stream, version, count)
+        assert len(headers) == count
+        for header in headers:
+            assert header.__class__ == expected.__class__
+            assert header == expected
@@ -0,0 +1,72 @@
+import zlib
+from io import BytesIO, SEEK_END, SEEK_CUR
+from typing import Tuple
+
+import pytest
+
+from relic.sga import File
+from tests.helpers import lorem_ipsum
+from tests.relic.sga.datagen import gen_file
+
+PAYLOAD = (lorem_ipsum * 64).encode("ascii")
+_PADDING = b"\xff" * 16  # Ensures the reader respects the file's bounds
+
+
+def gen_padded_file(compress: bool) -> Tuple[File, bytes]:
+    buffer = zlib.compress(PAYLOAD) if compress else PAYLOAD
+    return gen_file(len(_PADDING), len(PAYLOAD), len(buffer), "lorem.txt"), _PADDING + buffer + _PADDING
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("as_view", [True, False])
+def test_open_read(compress: bool, as_view: bool):
+    file, data = gen_padded_file(compress)
+    source = memoryview(data) if as_view else BytesIO(data)
+    with file.open(source) as reader:
+        reader._chunk_size = 97  # Force many small, bounded reads
+        parts = []
+        while part := reader.read(500):
+            assert len(part) <= 500
+            parts.append(part)
+    assert b"".join(parts) == PAYLOAD
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_open_seek(compress: bool):
+    file, data = gen_padded_file(compress)
+    with BytesIO(data) as stream:
+        stream.seek(3)
+        reader = file.open(stream)
+        assert reader.seek(1000) == 1000
+        assert reader.read(10) == PAYLOAD[1000:1010]
+        assert reader.seek(-20, SEEK_CUR) == 990
+        assert reader.read(10) == PAYLOAD[990:1000]
+        assert reader.seek(-5, SEEK_END) == len(PAYLOAD) - 5
+        assert reader.read() == PAYLOAD[-5:]
+        assert stream.tell() == 3  # The archive stream's position is preserved
+
+
+def test_open_loaded():
+    file, data = gen_padded_file(True)
+    file.load_data(BytesIO(data))
+    assert file.open().read() == PAYLOAD
+    assert file.open(decompress=False).read() == zlib.compress(PAYLOAD)
+
+
+@pytest.mark.parametrize("as_view", [True, False])
+def test_open_truncated(as_view: bool):
+    buffer = zlib.compress(PAYLOAD)[:-40]  # Cut short; zlib.decompress raises 'Error -5'
+    file = gen_file(0, len(PAYLOAD), len(buffer), "lorem.txt")
+    source = memoryview(buffer) if as_view else BytesIO(buffer)
+    with pytest.raises(zlib.error):
+        file.open(source).read()
+
+
+def test_open_wrong_size():
+    buffer = zlib.compress(PAYLOAD)
+    file = gen_file(0, len(PAYLOAD) + 1, len(buffer), "lorem.txt")  # The header disagrees with the data
+    with pytest.raises(zlib.error):
+        file.open(BytesIO(buffer)).read()
+    stored = gen_file(0, len(PAYLOAD), name="lorem.txt")
+    with pytest.raises(EOFError):
+        stored.open(BytesIO(PAYLOAD[:-10])).read()  # The source ends before the data does
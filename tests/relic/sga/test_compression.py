@@ -0,0 +1,44 @@
+import os
+import zlib
+
+from relic.sga import Archive, ArchiveVersion, FileCompressionFlag
+from relic.sga.compression import AdaptiveCompressionPolicy, CompressionMethod, STORE
+from relic.sga.writer import ArchiveWriter
+from tests.relic.sga.datagen import read_files, write_archive
+
+TEXT = b"GameData = Inherit([[sbps\\races\\space_marines\\troops\\tactical.lua]])\n" * 64
+NOISE = os.urandom(128 * 1024)
+
+
+def test_adaptive_policy():
+    policy = AdaptiveCompressionPolicy(level=6, extension_levels={".lua": 9})
+    assert policy.choose("music.ogg", TEXT) == STORE  # Already compressed
+    assert policy.choose("tiny.txt", b"tiny") == STORE
+    assert policy.choose("noise.rtx", NOISE) == STORE  # Incompressible
+    assert policy.choose("races.lua", TEXT) == CompressionMethod(True, 9, 14)
+    assert policy.choose("races.txt", TEXT * 64) == CompressionMethod(True, 6, 15)  # Large files use a 32 KiB window
+
+
+def test_adaptive_policy_samples_throughout():
+    policy = AdaptiveCompressionPolicy(sample_size=4096)
+    mixed = TEXT * 4 + NOISE  # A compressible header doesn't hide incompressible data
+    assert len(policy.sample(mixed)) == 4096
+    assert policy.estimate_ratio(mixed) > 0.5  # Only the first chunk is text
+    assert policy.estimate_ratio(TEXT * 64) < 0.1
+
+
+def test_write_with_policy():
+    writer = ArchiveWriter(ArchiveVersion.Dow, "Policy", policy=AdaptiveCompressionPolicy())
+    files = {"data:/races.lua": TEXT, "data:/music.ogg": TEXT, "data:/noise.rtx": NOISE, "data:/forced.ogg": TEXT}
+    for path, data in files.items():
+        writer.add_file(path, data, compress=CompressionMethod(True, zlib.Z_BEST_SPEED) if path == "data:/forced.ogg" else None)
+    stream = write_archive(writer)
+    archive = Archive.unpack(stream, validate=True)
+    assert read_files(archive, stream) == files
+    flags = {path: file.header.compression_flag for path, file in archive.iter_files()}
+    assert flags == {
+        "data:/races.lua": FileCompressionFlag.Compressed16,  # Small; so a 16 KiB window
+        "data:/music.ogg": FileCompressionFlag.Decompressed,
+        "data:/noise.rtx": FileCompressionFlag.Decompressed,
+        "data:/forced.ogg": FileCompressionFlag.Compressed32,
+    }
@@ -0,0 +1,36 @@
+import zlib
+from io import BytesIO
+
+import pytest
+
+from relic.sga.decompressor import ParallelDecompressor
+from tests.relic.sga.datagen import gen_files, PAYLOADS
+
+
+@pytest.mark.parametrize(["workers", "max_pending"], [(1, None), (4, None), (4, 1), (None, None)])
+def test_read_files_in_order(workers: int, max_pending: int):
+    files, data = gen_files(PAYLOADS)
+    decompressor = ParallelDecompressor(workers, max_pending)
+    for source in [BytesIO(data), memoryview(data)]:
+        results = list(decompressor.read_files(files, source))
+        assert [f for f, _ in results] == files
+        assert [future.result() for _, future in results] == PAYLOADS
+
+
+def test_read_files_errors_are_deterministic():
+    corrupt = 5
+    files, data = gen_files(PAYLOADS, corrupt)
+    with BytesIO(data) as stream:
+        for i, (file, future) in enumerate(ParallelDecompressor(4).read_files(files, stream)):
+            if i == corrupt:
+                with pytest.raises(zlib.error):
+                    future.result()
+            else:
+                assert future.result() == PAYLOADS[i]
+
+
+def test_load_files():
+    files, data = gen_files(PAYLOADS)
+    ParallelDecompressor(4).load_files(files, memoryview(data))
+    assert [f.data for f in files] == PAYLOADS
+    assert all(f.decompressed for f in files)
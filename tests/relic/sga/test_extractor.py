@@ -0,0 +1,64 @@
+from io import BytesIO
+
+import pytest
+
+from relic.sga.decompressor import ParallelDecompressor
+from relic.sga.extractor import plan_extraction, iter_extraction
+from tests.relic.sga.datagen import gen_file, gen_files, PAYLOADS
+
+
+def test_plan_extraction():
+    # Files are given out of order; a gap of 4 bytes (between 20 & 24) and of 76 (between 40 and 116)
+    files = [gen_file(24, 16), gen_file(116, 8), gen_file(0, 10), gen_file(10, 10)]
+    runs = plan_extraction(files, max_gap=4)
+    assert [(run.offset, run.size) for run in runs] == [(0, 40), (116, 8)]
+    assert [[file.header.data_sub_ptr.offset for file in run.files] for run in runs] == [[0, 10, 24], [116]]
+
+
+def test_plan_extraction_max_run_size():
+    files = [gen_file(i * 10, 10) for i in range(10)]
+    runs = plan_extraction(files, max_gap=0, max_run_size=30)
+    assert [(run.offset, run.size) for run in runs] == [(0, 30), (30, 30), (60, 30), (90, 10)]
+    assert [(run.offset, run.size) for run in plan_extraction([gen_file(0, 50)], max_run_size=30)] == [(0, 50)]
+
+
+def test_iter_extraction():
+    files, data = gen_files(PAYLOADS)
+    reordered = files[::-1]
+    for source in [BytesIO(data), memoryview(data)]:
+        results = list(iter_extraction(plan_extraction(reordered, max_run_size=1000), source))
+        assert [f for f, _ in results] == files  # Always in data order
+        assert [bytes(buffer) for _, buffer in results] == [bytes(f.read_data(source)) for f in files]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_read_runs(workers: int):
+    files, data = gen_files(PAYLOADS)
+    results = list(ParallelDecompressor(workers).read_runs(plan_extraction(files, max_run_size=1000), BytesIO(data)))
+    assert [f for f, _ in results] == files
+    assert [future.result() for _, future in results] == PAYLOADS
+
+
+class _FailingStream(BytesIO):
+    def __init__(self, data: bytes, fail_at: int):
+        super().__init__(data)
+        self.fail_at = fail_at
+
+    def read(self, size: int = -1) -> bytes:
+        if self.tell() == self.fail_at:
+            raise OSError("Read failed")
+        return super().read(size)
+
+
+def test_read_runs_error():
+    files, data = gen_files(PAYLOADS)
+    runs = plan_extraction(files, max_gap=0, max_run_size=1)  # A run per file
+    failing = runs[1]
+    results = list(ParallelDecompressor(2).read_runs(runs, _FailingStream(data, failing.offset)))
+    assert [f for f, _ in results] == files  # The error doesn't stop the remaining runs
+    for (file, future), payload in zip(results, PAYLOADS):
+        if file in failing.files:
+            with pytest.raises(OSError):
+                future.result()
+        else:
+            assert future.result() == payload
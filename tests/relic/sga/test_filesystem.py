@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, ArchiveVersion
+from relic.sga.filesystem import ArchiveFileSystem
+from relic.sga.writer import ArchiveWriter
+from tests.helpers import get_testdata_root_folder
+
+ARCHIVE_PATH = Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga"
+FILES = ["Lorem Ipsum Raw", "Lorem Ipsum Zlib-16", "Lorem Ipsum Zlib-32"]
+
+
+@pytest.fixture
+def fs() -> ArchiveFileSystem:
+    with open(ARCHIVE_PATH, "rb") as handle:
+        archive = Archive.unpack(handle, validate=False)  # The sample archive's checksums are zeroed
+    return ArchiveFileSystem(archive, ARCHIVE_PATH)
+
+
+def test_listdir(fs: ArchiveFileSystem):
+    assert fs.listdir() == ["test:"]
+    assert fs.listdir("test:") == ["Lorem Ipsum"]
+    assert fs.listdir("TEST:\\lorem ipsum") == FILES
+    with pytest.raises(FileNotFoundError):
+        fs.listdir("test:/missing")
+    with pytest.raises(NotADirectoryError):
+        fs.listdir("test:/lorem ipsum/lorem ipsum raw")
+
+
+def test_scandir(fs: ArchiveFileSystem):
+    entries = list(fs.scandir("test:"))
+    assert [(e.name, e.path, e.is_dir()) for e in entries] == [("Lorem Ipsum", "test:/Lorem Ipsum", True)]
+    entries = list(fs.scandir("test:/lorem ipsum"))
+    assert [e.name for e in entries] == FILES
+    assert all(e.is_file() for e in entries)
+    assert entries[1].stat().compressed_size == 330
+
+
+def test_stat(fs: ArchiveFileSystem):
+    stat = fs.stat("test:/lorem ipsum/lorem ipsum zlib-16")
+    assert (stat.path, stat.is_dir, stat.compressed_size, stat.decompressed_size, stat.st_size) == ("test:/Lorem Ipsum/Lorem Ipsum Zlib-16", False, 330, 610, 610)
+    assert fs.stat("test:/lorem ipsum").is_dir
+    assert fs.isdir("test:") and fs.isfile("test:/lorem ipsum/lorem ipsum raw") and not fs.exists("test:/missing")
+
+
+def test_open(fs: ArchiveFileSystem):
+    with fs.open("test:/lorem ipsum/lorem ipsum raw") as reader:
+        data = reader.read()
+    assert len(data) == 610
+    assert fs.read("test:/lorem ipsum/lorem ipsum raw") == data
+    with pytest.raises(IsADirectoryError):
+        fs.open("test:/lorem ipsum")
+
+
+def test_walk(fs: ArchiveFileSystem):
+    assert list(fs.walk()) == [("", ["test:"], []), ("test:", ["Lorem Ipsum"], []), ("test:/Lorem Ipsum", [], FILES)]
+    assert [path for path, _, _ in fs.walk(topdown=False)] == ["test:/Lorem Ipsum", "test:", ""]
+    walk = fs.walk("test:")
+    path, folders, _ = next(walk)
+    folders.clear()  # Prune, like os.walk
+    assert list(walk) == []
+
+
+def test_root_folder(tmp_path: Path):
+    writer = ArchiveWriter(ArchiveVersion.Dow, "Root")  # Writes a root folder (named ''), as the game expects
+    writer.add_file("data:/readme.txt", b"readme")
+    writer.add_file("data:/art/unit.whm", b"whm")
+    with open(tmp_path / "root.sga", "w+b") as handle:
+        writer.write(handle)
+        handle.seek(0)
+        fs = ArchiveFileSystem(Archive.unpack(handle, sparse=False))
+    assert [folder.name for folder in fs.archive.drives[0].sub_folders] == [""]
+    # The root folder is merged into its drive; not listed as a child of it
+    assert list(fs.walk()) == [("", ["data:"], []), ("data:", ["art"], ["readme.txt"]), ("data:/art", [], ["unit.whm"])]
+    assert fs.read("data:/readme.txt") == b"readme"
+    assert fs.stat("data:").is_dir
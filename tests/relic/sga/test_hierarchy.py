@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, ArchiveVersion
+from relic.sga.hierarchy import ArchiveQueryIndex, FlatHierarchy, compile_glob, glob_extension, glob_prefix, normalize_extension, normalize_path
+from relic.sga.writer import ArchiveWriter
+from scripts.universal.common import PrintOptions
+from scripts.universal.sga.unpack import unpack_archive
+from tests.helpers import get_testdata_root_folder
+
+ARCHIVE_PATH = Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga"
+FOLDER = "test:/Lorem Ipsum"
+FILES = [FOLDER + "/" + name for name in ["Lorem Ipsum Raw", "Lorem Ipsum Zlib-16", "Lorem Ipsum Zlib-32"]]
+
+
+@pytest.fixture
+def archive() -> Archive:
+    with open(ARCHIVE_PATH, "rb") as handle:
+        return Archive.unpack(handle, validate=False)  # The sample archive's checksums are zeroed
+
+
+@pytest.mark.parametrize(["pattern", "path", "expected"], [
+    ("data:/art/*.whm", "data:/art/unit.whm", True),
+    ("data:/art/*.whm", "data:/art/ebps/unit.whm", False),
+    ("data:/art/**/*.whm", "data:/art/unit.whm", True),
+    ("data:/art/**/*.whm", "data:/art/ebps/races/unit.whm", True),
+    ("DATA:\\Art\\unit?.whm", "data:/art/unit1.whm", True),
+    ("data:/art/unit[!0-9].whm", "data:/art/unit1.whm", False),
+])
+def test_compile_glob(pattern: str, path: str, expected: bool):
+    assert bool(compile_glob(pattern).match(path)) == expected
+
+
+def test_glob_prefix():
+    assert glob_prefix("data:/art/ebps/**/*.whm") == "data:/art/ebps"
+    assert glob_prefix("data:/art/unit.whm") == "data:/art"
+    assert normalize_extension("WHM") == normalize_extension(".whm") == ".whm"
+    assert glob_extension("data:/art/**/*.whm") == ".whm"
+    assert glob_extension("data:/art/*.wh?") is None
+    assert glob_extension("data:/art/*") is None
+
+
+def test_flat_hierarchy(archive: Archive):
+    flat = archive.flat_hierarchy
+    assert flat.folder_paths == ["test:/", FOLDER]
+    assert flat.subtree_ends == [2, 2]
+    assert flat.file_paths == FILES
+    assert [path for path, _ in archive.iter_files()] == FILES
+    assert [file.name for _, file in archive.iter_files()] == [file.name for _, _, _, files in archive.walk() for file in files]
+
+
+def test_iter_files_filters(archive: Archive):
+    assert [path for path, _ in archive.iter_files(prefix="TEST:\\lorem ipsum")] == FILES
+    assert [path for path, _ in archive.iter_files(prefix=FILES[0])] == FILES[:1]
+    assert list(archive.iter_files(prefix="test:/missing")) == []
+    assert [path for path, _ in archive.iter_files(pattern="test:/**/*zlib*")] == FILES[1:]
+    assert [path for path, _ in archive.iter_files(pattern="test:/*/lorem ipsum raw")] == FILES[:1]
+    assert list(archive.iter_files(extensions=[".txt"])) == []  # The sample's files have no extension
+
+
+QUERY_PATHS = ["data:/art/ebps/races/unit.whm", "data:/art/ebps/races/unit.rsh", "data:/art/ebps/unit.whm", "data:/art/ebps-old/unit.whm", "data:/art/unit.WHM", "data:/sound/unit.fda"]
+
+
+@pytest.fixture
+def query_index() -> ArchiveQueryIndex:
+    files = [object() for _ in QUERY_PATHS]  # The index never inspects its files
+    flat = FlatHierarchy([], [], [], [], [], [], [], files, QUERY_PATHS, [normalize_path(path) for path in QUERY_PATHS])
+    return ArchiveQueryIndex.build(flat)
+
+
+def test_query_glob(query_index: ArchiveQueryIndex):
+    paths = lambda pattern: [path for path, _ in query_index.glob(pattern)]
+    assert paths("data:art/ebps/**/*.whm") == ["data:/art/ebps/races/unit.whm", "data:/art/ebps/unit.whm"]
+    assert paths("data:/art/*.whm") == ["data:/art/unit.WHM"]
+    assert paths("DATA:\\art\\ebps\\races\\*") == ["data:/art/ebps/races/unit.rsh", "data:/art/ebps/races/unit.whm"]
+    assert paths("data:/art/ebps/races/unit.whm") == ["data:/art/ebps/races/unit.whm"]
+    assert paths("data:/missing/**/*") == []
+
+
+def test_query_prefix_range(query_index: ArchiveQueryIndex):
+    start, end = query_index.prefix_range("data:/art/ebps")
+    assert query_index.keys[start:end] == ["data:/art/ebps/races/unit.rsh", "data:/art/ebps/races/unit.whm", "data:/art/ebps/unit.whm"]  # Excludes 'ebps-old'
+    assert query_index.prefix_range("") == (0, len(QUERY_PATHS))
+
+
+def test_query_by_extension(query_index: ArchiveQueryIndex):
+    assert [path for path, _ in query_index.by_extension("whm")] == ["data:/art/ebps-old/unit.whm", "data:/art/ebps/races/unit.whm", "data:/art/ebps/unit.whm", "data:/art/unit.WHM"]
+    assert [path for path, _ in query_index.by_extension(".RSH", ".fda")] == ["data:/art/ebps/races/unit.rsh", "data:/sound/unit.fda"]
+    assert query_index.by_extension(".txt") == []
+
+
+def test_archive_glob(archive: Archive):
+    assert [path for path, _ in archive.glob("test:**/*zlib*")] == FILES[1:]
+    assert [path for path, _ in archive.by_extension("")] == FILES  # The sample's files have no extension
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_unpack_output_paths(tmp_path: Path, memory_map: bool):
+    writer = ArchiveWriter(ArchiveVersion.Dow, "Paths")
+    for path in ["data:/readme.txt", "data:/art/ebps/unit.whm", "attrib:/races.lua"]:
+        writer.add_file(path, path.encode())
+    archive_path = tmp_path / "paths.sga"
+    with open(archive_path, "w+b") as handle:
+        writer.write(handle)
+    unpack_archive(str(archive_path), str(tmp_path / "out"), prepend_archive_path=True, memory_map=memory_map, print_opts=PrintOptions(quiet=True))
+    # Drive-root files are unpacked (into the drive's folder), and folder names (E.G. 'art\ebps') become nested folders
+    written = sorted(path.relative_to(tmp_path / "out").as_posix() for path in (tmp_path / "out").rglob("*") if path.is_file())
+    assert written == ["paths/attrib/races.lua", "paths/data/art/ebps/unit.whm", "paths/data/readme.txt"]
+    assert (tmp_path / "out" / "paths" / "data" / "art" / "ebps" / "unit.whm").read_bytes() == b"data:/art/ebps/unit.whm"
@@ -0,0 +1,55 @@
+import zlib
+from pathlib import Path
+
+from relic.sga import File
+from relic.sga.common import ArchiveIdentity
+from relic.sga.manifest import ExtractionManifest, ManifestEntry, MANIFEST_NAME
+from tests.relic.sga.datagen import gen_file
+
+IDENTITY = ArchiveIdentity("archive.sga", 1024, 1)
+PATCHED = ArchiveIdentity("archive.sga", 2048, 2)
+DATA = zlib.compress(b"Lorem Ipsum" * 10)
+
+
+def gen_lorem_file(offset: int = 0, data: bytes = DATA) -> File:
+    return gen_file(offset, 110, len(data), "lorem.txt")
+
+
+def write_output(tmp_path: Path) -> Path:
+    output_path = tmp_path / "data" / "lorem.txt"
+    output_path.parent.mkdir()
+    output_path.write_bytes(b"Lorem Ipsum" * 10)
+    return output_path
+
+
+def test_manifest_roundtrip(tmp_path: Path):
+    manifest = ExtractionManifest(tmp_path / MANIFEST_NAME)
+    manifest.update("data/lorem.txt", IDENTITY, gen_lorem_file(), DATA)
+    manifest.update("data/other.txt", PATCHED, gen_lorem_file(32), DATA)
+    manifest.save()
+    loaded = ExtractionManifest.load(tmp_path / MANIFEST_NAME)
+    assert loaded.entries == manifest.entries
+    assert loaded.entries["data/lorem.txt"] == ManifestEntry(IDENTITY, 0, len(DATA), 110, zlib.crc32(DATA))
+
+
+def test_manifest_load_invalid(tmp_path: Path):
+    assert ExtractionManifest.load(tmp_path / MANIFEST_NAME).entries == {}
+    (tmp_path / MANIFEST_NAME).write_text("{ not json")
+    assert ExtractionManifest.load(tmp_path / MANIFEST_NAME).entries == {}
+
+
+def test_manifest_is_up_to_date(tmp_path: Path):
+    output_path = write_output(tmp_path)
+    manifest = ExtractionManifest(tmp_path / MANIFEST_NAME)
+    file = gen_lorem_file()
+    assert not manifest.is_up_to_date("data/lorem.txt", file, output_path, IDENTITY)
+    manifest.update("data/lorem.txt", IDENTITY, file, DATA)
+    assert manifest.is_up_to_date("data/lorem.txt", file, output_path, IDENTITY)
+    assert not manifest.is_up_to_date("data/lorem.txt", gen_lorem_file(16), output_path, IDENTITY)  # Moved
+    assert not manifest.is_up_to_date("data/lorem.txt", file, tmp_path / "missing.txt", IDENTITY)
+    # Once the archive is patched; data must be read to verify the file
+    assert not manifest.is_up_to_date("data/lorem.txt", file, output_path, PATCHED)
+    assert manifest.can_verify("data/lorem.txt", gen_lorem_file(16), output_path)
+    assert manifest.matches_data("data/lorem.txt", gen_lorem_file(16), DATA)
+    changed = zlib.compress(b"Ipsum Lorem" * 10)
+    assert not manifest.matches_data("data/lorem.txt", gen_lorem_file(16, changed), changed)
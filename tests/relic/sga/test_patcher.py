@@ -0,0 +1,86 @@
+import shutil
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, ArchiveVersion
+from relic.sga.patcher import ArchivePatcher
+from relic.sga.writer import ArchiveWriter
+from tests.helpers import get_testdata_root_folder
+
+FILES = {
+    "data:/art/unit.whm": b"unit " * 512,
+    "data:/art/unit.rsh": bytes(range(256)) * 4,
+    "data:/readme.txt": b"Read me!",
+}
+
+
+def read_files(path: Path) -> dict:
+    with open(path, "rb") as handle:
+        archive = Archive.unpack(handle, validate=True)  # The patched checksums must be valid
+        with archive.header.data_ptr.stream_jump_to(handle) as data:
+            return {archive_path.lower(): bytes(file.read_data(data, True)) for archive_path, file in archive.iter_files()}
+
+
+@pytest.fixture(params=[ArchiveVersion.Dow, ArchiveVersion.Dow2, ArchiveVersion.Dow3])
+def archive_path(request, tmp_path: Path) -> Path:
+    writer = ArchiveWriter(request.param, "Patch Me")
+    for path, data in FILES.items():
+        writer.add_file(path, data)
+    path = tmp_path / "patch-me.sga"
+    with open(path, "w+b") as handle:
+        writer.write(handle, toc_reserve=1024)
+    return path
+
+
+def test_commit_in_place(archive_path: Path):
+    original = archive_path.read_bytes()
+    patcher = ArchivePatcher(archive_path, toc_reserve=256)
+    patcher.add_file("data:/art/unit.whm", b"changed " * 64)
+    patcher.add_file("data:/art/ebps/new.whm", b"new")
+    patcher.remove_file("data:/readme.txt")
+    result = patcher.commit()
+    assert result.in_place
+    patched = archive_path.read_bytes()
+    # Unchanged payloads are untouched; new ones are appended
+    header_size = patcher.archive.header.toc_ptr.offset
+    data_pos = patcher.archive.header.data_ptr.offset
+    assert patched[data_pos:len(original)] == original[data_pos:]
+    assert len(patched) > len(original) and patched[:header_size] != original[:header_size]
+
+    expected = dict(FILES)
+    expected["data:/art/unit.whm"] = b"changed " * 64
+    expected["data:/art/ebps/new.whm"] = b"new"
+    del expected["data:/readme.txt"]
+    assert read_files(archive_path) == expected
+    assert result.dead_bytes > 0  # The old unit.whm and readme.txt
+
+    size = patcher.compact()
+    assert size < len(patched) and patcher.dead_bytes == 0
+    assert read_files(archive_path) == expected
+
+
+def test_commit_compacts_when_toc_overflows(archive_path: Path):
+    patcher = ArchivePatcher(archive_path, toc_reserve=0)
+    for i in range(64):
+        patcher.add_file(f"data:/generated/file_{i:03}.txt", b"%d" % i)
+    result = patcher.commit()
+    assert not result.in_place and result.dead_bytes == 0
+    files = read_files(archive_path)
+    assert files["data:/generated/file_042.txt"] == b"42"
+    assert files["data:/art/unit.whm"] == FILES["data:/art/unit.whm"]
+
+
+def test_patch_sample_archive(tmp_path: Path):
+    path = tmp_path / "archive-v2_0.sga"
+    shutil.copy(Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga", path)
+    patcher = ArchivePatcher(path)
+    patcher.add_file("test:/Lorem Ipsum/Lorem Ipsum Raw", b"Replaced")
+    result = patcher.commit()
+    assert result.in_place  # Replacing a file doesn't grow the TOC
+    with open(path, "rb") as handle:
+        archive = Archive.unpack(handle, validate=True)
+        with archive.header.data_ptr.stream_jump_to(handle) as data:
+            assert archive.get_file("test:/lorem ipsum/lorem ipsum raw").read_data(data) == b"Replaced"
+            assert len(archive.get_file("test:/lorem ipsum/lorem ipsum zlib-16").read_data(data)) == 330
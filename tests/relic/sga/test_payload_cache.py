@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from relic.sga import Archive
+from relic.sga.filesystem import ArchiveFileSystem
+from relic.sga.payload_cache import PayloadCache, PayloadCacheStats
+from relic.sga.vfs import OverlayFileSystem
+from tests.helpers import get_testdata_root_folder
+
+ARCHIVE_PATH = Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga"
+RAW = "test:/Lorem Ipsum/Lorem Ipsum Raw"
+
+
+def test_lru_eviction():
+    cache = PayloadCache(budget=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # 'a' is now the most recently used
+    cache.put("c", b"cccc")  # Exceeds the budget; evicts 'b'
+    assert "b" not in cache and "a" in cache and "c" in cache
+    cache.put("d", b"d" * 11)  # Larger than the budget; never cached
+    assert "d" not in cache
+    stats = cache.stats
+    assert (stats.hits, stats.evictions, stats.size, stats.count) == (1, 1, 8, 2)
+    cache.clear()
+    assert len(cache) == 0 and cache.stats == PayloadCacheStats(0, 0, 0, 0, 0)
+
+
+def test_get_or_load():
+    cache = PayloadCache()
+    loads = []
+    for _ in range(3):
+        assert cache.get_or_load("key", lambda: loads.append(1) or b"payload") == b"payload"
+    assert len(loads) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+    assert cache.stats.hit_rate == 2 / 3
+
+
+def test_thread_safety():
+    cache = PayloadCache(budget=64)
+    keys = [i % 16 for i in range(1000)]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda k: cache.get_or_load(k, lambda: bytes([k]) * 8), keys))
+    assert results == [bytes([k]) * 8 for k in keys]
+    stats = cache.stats
+    assert stats.hits + stats.misses == len(keys)
+    assert stats.size <= 64 and stats.size == stats.count * 8
+
+
+def test_shared_cache():
+    with open(ARCHIVE_PATH, "rb") as handle:
+        archive = Archive.unpack(handle, validate=False)  # The sample archive's checksums are zeroed
+    cache = PayloadCache()
+    fs = ArchiveFileSystem(archive, ARCHIVE_PATH, cache)
+    vfs = OverlayFileSystem(cache=cache)
+    vfs.mount_archive(archive, ARCHIVE_PATH)
+    first = fs.read(RAW)
+    assert fs.read(RAW) is first
+    assert vfs.read(RAW) == first  # A different mount; cached separately
+    assert vfs.read(RAW) == first
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.count) == (2, 2, 2)
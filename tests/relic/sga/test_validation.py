@@ -0,0 +1,100 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, ArchiveHeader
+from relic.sga import validation
+from relic.sga.validation import ArchiveValidator, ChecksumCache, gen_checksums
+from tests.helpers import get_testdata_root_folder
+
+_CHECKSUM_A = 12  # After the magic word and version
+_CHECKSUM_B = _CHECKSUM_A + 16 + 128  # After the name
+
+
+@pytest.fixture
+def archive_path(tmp_path: Path) -> Path:
+    # The sample archive's checksums are zeroed; so we fill them in
+    path = tmp_path / "archive.sga"
+    shutil.copy(Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga", path)
+    with open(path, "r+b") as handle:
+        header = ArchiveHeader.unpack(handle)
+        full, toc = gen_checksums(handle, header, fast=False)
+        handle.seek(_CHECKSUM_A)
+        handle.write(full)
+        handle.seek(_CHECKSUM_B)
+        handle.write(toc)
+    return path
+
+
+def corrupt(path: Path):
+    with open(path, "r+b") as handle:
+        handle.seek(-1, 2)
+        last = handle.read(1)
+        handle.seek(-1, 2)
+        handle.write(bytes([last[0] ^ 0xFF]))
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_gen_checksums(archive_path: Path, fast: bool):
+    with open(archive_path, "rb") as handle:
+        header = ArchiveHeader.unpack(handle)
+        position = handle.tell()
+        assert header.validate_checksums(handle, fast=False)
+        full, toc = gen_checksums(handle, header, fast, buffer_size=64)
+        assert handle.tell() == position
+    assert toc == header.checksums[1]
+    assert full == (None if fast else header.checksums[0])
+
+
+def test_validator_cache(archive_path: Path, tmp_path: Path, monkeypatch):
+    cache_path = tmp_path / "checksums.json"
+    with open(archive_path, "rb") as handle:
+        header = ArchiveHeader.unpack(handle)
+        assert ArchiveValidator(ChecksumCache(cache_path)).validate(handle, header, fast=True)
+
+        validator = ArchiveValidator(ChecksumCache(cache_path))  # Reloaded from disk
+        calls = []
+        monkeypatch.setattr(validation, "gen_checksums", lambda *args: calls.append(args) or gen_checksums(*args))
+        assert validator.validate(handle, header, fast=True)
+        assert len(calls) == 0
+        assert validator.validate(handle, header, fast=False)  # Only a fast validation was cached
+        assert len(calls) == 1
+        assert validator.validate(handle, header, fast=True)  # A full validation satisfies a fast one
+        assert validator.validate(handle, header, fast=False)
+        assert len(calls) == 1
+        saves = []
+        monkeypatch.setattr(validator.cache, "save", lambda: saves.append(None))
+        assert validator.validate(handle, header, fast=True, force=True)
+        assert len(calls) == 2
+        assert len(saves) == 0  # The entry was unchanged
+
+
+def test_validator_detects_changes(archive_path: Path):
+    validator = ArchiveValidator(ChecksumCache())
+    with open(archive_path, "rb") as handle:
+        assert validator.validate(handle, ArchiveHeader.unpack(handle), fast=False)
+    corrupt(archive_path)  # The size is unchanged, and mtime may be too coarse to notice; so validation is forced
+    with open(archive_path, "rb") as handle:
+        header = ArchiveHeader.unpack(handle)
+        assert not validator.validate(handle, header, fast=False, force=True, _assert=False)
+        with pytest.raises(AssertionError):
+            validator.validate(handle, header, fast=False, force=True)
+
+
+@pytest.mark.parametrize("corrupted", [False, True])
+def test_unpack_background_validation(archive_path: Path, corrupted: bool):
+    if corrupted:
+        with open(archive_path, "r+b") as handle:
+            handle.seek(_CHECKSUM_B)
+            handle.write(b"\0" * 16)
+    with ArchiveValidator(background=True) as validator:
+        with open(archive_path, "rb") as handle:
+            archive = Archive.unpack(handle, validator=validator)
+        assert archive.get_file("test:/Lorem Ipsum/Lorem Ipsum Raw") is not None  # The TOC is usable while validating
+        if corrupted:
+            with pytest.raises(AssertionError):
+                archive.validation.result()
+        else:
+            assert archive.validation.result() is True
+    assert validator._executor is None
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, File
+from relic.sga.vfs import OverlayFileSystem, ArchiveMount
+from tests.helpers import get_testdata_root_folder
+
+ARCHIVE_PATH = Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga"
+RAW = "test:/Lorem Ipsum/Lorem Ipsum Raw"
+
+
+@pytest.fixture
+def archive() -> Archive:
+    with open(ARCHIVE_PATH, "rb") as handle:
+        return Archive.unpack(handle, validate=False)  # The sample archive's checksums are zeroed
+
+
+@pytest.fixture
+def mod_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "Mod" / "Lorem Ipsum"
+    folder.mkdir(parents=True)
+    (folder / "Lorem Ipsum Raw").write_bytes(b"Overridden")
+    (folder / "Mod Only").write_bytes(b"Added")
+    return tmp_path / "Mod"
+
+
+def test_overlay_priority(archive: Archive, mod_folder: Path):
+    vfs = OverlayFileSystem()
+    archive_mount = vfs.mount_archive(archive, ARCHIVE_PATH)
+    directory_mount = vfs.mount_directory(mod_folder, "test", priority=1)
+
+    winner = vfs.resolve(RAW.upper().replace("/", "\\"))
+    assert winner.mount is directory_mount
+    assert vfs.read(RAW) == b"Overridden"
+    assert [entry.mount for entry in vfs.resolve_all(RAW)] == [directory_mount, archive_mount]
+    assert vfs.read("test:/lorem ipsum/mod only") == b"Added"
+    assert vfs.exists("test:/lorem ipsum/lorem ipsum zlib-16")  # Files which aren't overridden still resolve to the archive
+
+    vfs.unmount(directory_mount)
+    assert isinstance(vfs.resolve(RAW).item, File)
+    assert not vfs.exists("test:/lorem ipsum/mod only")
+
+
+def test_overlay_ties(archive: Archive, mod_folder: Path):
+    vfs = OverlayFileSystem()
+    vfs.mount_directory(mod_folder, "test")
+    vfs.mount_archive(archive, ARCHIVE_PATH)
+    assert isinstance(vfs.resolve(RAW).mount, ArchiveMount)  # Same priority; the latest mount wins
+
+
+def test_overlay_ties_after_unmount(archive: Archive, mod_folder: Path, tmp_path: Path):
+    other_folder = tmp_path / "Other" / "Lorem Ipsum"
+    other_folder.mkdir(parents=True)
+    (other_folder / "Lorem Ipsum Raw").write_bytes(b"Newest")
+    vfs = OverlayFileSystem()
+    first = vfs.mount_archive(archive, ARCHIVE_PATH)
+    vfs.mount_directory(mod_folder, "test")
+    vfs.unmount(first)
+    newest = vfs.mount_directory(tmp_path / "Other", "test")  # Must not reuse the order of a remaining mount
+    assert vfs.resolve(RAW).mount is newest
+    assert vfs.read(RAW) == b"Newest"
+
+
+def test_overlay_read(archive: Archive):
+    vfs = OverlayFileSystem()
+    vfs.mount_archive(archive, ARCHIVE_PATH)
+    file = archive.get_file(RAW)
+    with open(ARCHIVE_PATH, "rb") as handle:
+        with archive.header.data_ptr.stream_jump_to(handle) as data_stream:
+            expected = file.read_data(data_stream, True)
+    assert vfs.read(RAW) == expected
+    with vfs.open(RAW) as reader:
+        assert reader.read() == expected
+    with pytest.raises(FileNotFoundError):
+        vfs.read("test:/missing")
+    with pytest.raises(IsADirectoryError):
+        vfs.read("test:/lorem ipsum")
@@ -0,0 +1,121 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from relic.sga import Archive, ArchiveVersion, FileCompressionFlag
+from relic.sga.writer import ArchiveWriter
+from tests.helpers import get_testdata_root_folder
+from tests.relic.sga.datagen import read_files, write_archive
+
+ARCHIVE_PATH = Path(get_testdata_root_folder()) / "sga" / "archive-v2_0.sga"
+FILES = {
+    "data:/art/ebps/races/unit.whm": b"unit " * 1024,
+    "data:/art/ebps/races/unit.rsh": bytes(range(256)),
+    "data:/art/readme.txt": b"Compressible? " * 64,
+    "data:/scenarios/empty.sgb": b"",
+    "attrib:/attrib.lua": b"GameData = Inherit([[]])",
+}
+VERSIONS = [ArchiveVersion.Dow, ArchiveVersion.Dow2, ArchiveVersion.Dow3]
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_write_round_trip(version):
+    writer = ArchiveWriter(version, "Round Trip", workers=2, max_pending=1)
+    for path, data in FILES.items():
+        writer.add_file(path, data)
+    stream = write_archive(writer)
+    archive = Archive.unpack(stream, validate=True)  # The header checksums were back-patched
+    assert archive.header.validate_checksums(stream, fast=False)
+    assert archive.header.name == "Round Trip"
+    assert {path.lower(): data for path, data in read_files(archive, stream).items()} == FILES
+
+    whm = archive.get_file("data:/art/ebps/races/unit.whm")
+    assert whm.header.compressed and whm.header.compressed_size < whm.header.decompressed_size
+    rsh = archive.get_file("data:/art/ebps/races/unit.rsh")
+    assert not rsh.header.compressed  # Stored; compression didn't shrink it
+    assert archive.get_folder("data:/art/ebps/races").name == "art\\ebps\\races"
+    if version == ArchiveVersion.Dow:
+        assert whm.header.compression_flag == FileCompressionFlag.Compressed32
+
+
+def test_write_uncompressed():
+    writer = ArchiveWriter(ArchiveVersion.Dow2, "Stored", compress=False)
+    writer.add_file("data:/a.txt", b"a" * 4096)
+    writer.add_file("data:/b.txt", b"b" * 4096, compress=True)
+    archive = Archive.unpack(write_archive(writer))
+    assert not archive.get_file("data:/a.txt").header.compressed
+    assert archive.get_file("data:/b.txt").header.compressed
+
+
+def test_add_file_duplicate():
+    writer = ArchiveWriter(ArchiveVersion.Dow, "Duplicates")
+    writer.add_file("data:/art/unit.whm", b"")
+    with pytest.raises(ValueError):
+        writer.add_file("DATA:\\Art\\UNIT.whm", b"")
+
+
+def test_add_directory(tmp_path: Path):
+    (tmp_path / "art" / "ebps").mkdir(parents=True)
+    (tmp_path / "art" / "ebps" / "unit.whm").write_bytes(b"whm")
+    (tmp_path / "readme.txt").write_bytes(b"txt")
+    writer = ArchiveWriter(ArchiveVersion.Dow2, "Mod")
+    assert writer.add_directory(tmp_path) == 2
+    stream = write_archive(writer)
+    archive = Archive.unpack(stream)
+    assert read_files(archive, stream) == {"data:/readme.txt": b"txt", "data:/art/ebps/unit.whm": b"whm"}
+
+
+def test_repack_sparse_archive():
+    with open(ARCHIVE_PATH, "rb") as handle:
+        archive = Archive.unpack(handle, validate=False)  # The sample archive's checksums are zeroed
+        expected = read_files(archive, handle)
+    with pytest.raises(ValueError):
+        archive.pack(BytesIO())  # Sparse; the payloads can only be read with the archive's path
+    writer = ArchiveWriter.from_archive(archive, ARCHIVE_PATH)
+    sources = {id(writer.get_entry(path).source.source) for path, _ in archive.iter_files()}
+    assert len(sources) == 1  # Every payload is read from one (shared) map of the archive
+    stream = write_archive(writer)
+    assert writer._sources[0]._mapped is None  # Unmapped once written
+    repacked = Archive.unpack(stream, validate=True)
+    assert read_files(repacked, stream) == expected
+    assert [f.header for _, f in repacked.iter_files()] == [f.header for _, f in archive.iter_files()]
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_write_dedup(version):
+    texture = bytes(range(256)) * 16
+    writer = ArchiveWriter(version, "Re-skins", workers=4, max_pending=2)
+    for race in ["space_marines", "chaos", "eldar"]:
+        writer.add_file(f"data:/art/races/{race}/texture.rtx", texture)
+        writer.add_file(f"data:/sound/{race}/shout.wav", race.encode() * 8)
+    writer.add_file("data:/art/stored.rtx", texture, compress=False)  # Stored differently; so not shared
+    stream = write_archive(writer)
+    archive = Archive.unpack(stream, validate=True)
+    textures = [archive.get_file(f"data:/art/races/{race}/texture.rtx") for race in ["space_marines", "chaos", "eldar"]]
+    assert len({f.header.data_sub_ptr.offset for f in textures}) == 1
+    assert archive.get_file("data:/art/stored.rtx").header.data_sub_ptr.offset != textures[0].header.data_sub_ptr.offset
+    assert all(data == texture for path, data in read_files(archive, stream).items() if path.endswith(".rtx"))
+
+    stats = writer.stats
+    assert (stats.files, stats.payloads, stats.duplicates) == (7, 5, 2)
+    assert stats.bytes_saved == 2 * textures[0].header.compressed_size
+
+    writer.dedup = False
+    assert writer.write(BytesIO()) == len(stream.getvalue()) + stats.bytes_saved
+    assert writer.stats.bytes_saved == 0
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+def test_write_root_folder(version):
+    writer = ArchiveWriter(version, "Root")
+    writer.add_file("data:/readme.txt", b"txt")
+    writer.add_file("data:/art/a.txt", b"a")
+    archive = Archive.unpack(write_archive(writer), sparse=False)
+    # The game resolves files through folders; so drive-root files are in the drive's root folder (named '')
+    walked = [(folder.name if folder else None, [f.name for f in files]) for _, folder, _, files in archive.walk()]
+    assert walked == [(None, []), ("", ["readme.txt"]), ("art", ["a.txt"])]
+
+    repacked = Archive.unpack(write_archive(ArchiveWriter.from_archive(archive)))  # The root folder is kept; not nested
+    assert [folder.name for folder in repacked.drives[0].sub_folders] == [""]
+    assert [path for path, _ in repacked.iter_files()] == [path for path, _ in archive.iter_files()]
@@ -0,0 +1,42 @@
+from io import BytesIO
+
+import pytest
+
+from relic.sga import Archive, CompactArchive
+from relic.sga.toc.compact import NO_PARENT
+from tests.relic.sga.datagen import DOW1_ARCHIVE_PACKED, DOW2_ARCHIVE_PACKED, DOW3_ARCHIVE_PACKED
+
+
+@pytest.mark.parametrize(["stream_data"], [(DOW1_ARCHIVE_PACKED,), (DOW2_ARCHIVE_PACKED,), (DOW3_ARCHIVE_PACKED,)])
+def test_compact_matches_archive(stream_data: bytes):
+    with BytesIO(stream_data) as stream:
+        expected = Archive.unpack(stream, sparse=False)
+    with BytesIO(stream_data) as stream:
+        compact = CompactArchive.unpack(stream)
+        toc = compact.toc
+        expected_files = [f for _, _, _, files in expected.walk() for f in files]
+        assert toc.file_count == len(expected_files)
+        for i, e_file in enumerate(expected_files):
+            file = toc.file(i)
+            assert file.name == e_file.name
+            assert file.header == e_file.header
+            assert file.full_path == e_file.full_path
+            with compact.header.data_ptr.stream_jump_to(stream) as data_stream:
+                assert file.read_data(data_stream, True) == e_file.data
+
+        columns = [toc.files.name_offsets, toc.files.data_offsets, toc.files.parents, toc.files.drives, toc.folders.name_offsets, toc.folders.parents, toc.folders.drives, *toc.files.extras.values()]
+        assert all(column.itemsize == 4 for column in columns)  # The same size on every platform
+
+        assert toc.root_folders(0) == [i for i in range(toc.folder_count) if toc.folders.parents[i] == NO_PARENT]
+        assert toc.folder(0).name == expected.drives[0].sub_folders[0].name
+        assert list(toc.child_files(0)) == [0]
+        assert toc.file(0)._parent is toc.folder(0) and toc.folder(0)._drive is toc.drive(0)  # Proxies are cached
+
+
+def test_compact_close_memory_map(tmp_path):
+    path = tmp_path / "archive.sga"
+    path.write_bytes(DOW3_ARCHIVE_PACKED)
+    with open(path, "rb") as stream:
+        with CompactArchive.unpack(stream, memory_map=True) as compact:
+            assert compact.toc.file(0).read_data(compact.data_view, True) is not None
+        assert compact.data_view is None
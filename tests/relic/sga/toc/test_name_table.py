@@ -0,0 +1,69 @@
+import pickle
+from io import BytesIO
+
+import pytest
+
+from relic.sga import File, Folder
+from relic.sga.toc import NameTable
+from tests.relic.sga.datagen import DowIII
+
+NAMES = ["data", "art", "ebps", "races.lua"]
+BUFFER, LOOKUP = DowIII.gen_name_buffer(*NAMES)
+
+
+@pytest.mark.parametrize("trailing", [b"", b"trailing\0data"])
+def test_unpack(trailing: bytes):
+    with BytesIO(BUFFER + trailing) as stream:
+        table = NameTable.unpack(stream, len(NAMES))
+    assert table.buffer == BUFFER
+    assert dict(table) == {offset: name for name, offset in LOOKUP.items()}
+
+
+def test_lazy_decode():
+    table = NameTable(BUFFER)
+    offset = LOOKUP["ebps"]
+    assert table._names == {}
+    assert table[offset] == "ebps"
+    assert list(table._names) == [offset]
+    assert table[offset] is table[offset]  # Interned
+    assert offset in table and offset + 1 not in table and "ebps" not in table
+    with pytest.raises(KeyError):
+        _ = table[offset + 1]  # Not the start of a name
+    with pytest.raises(KeyError):
+        _ = table[len(BUFFER)]
+
+
+def test_pickle():
+    table = NameTable(BUFFER)
+    _ = table[0]
+    restored = pickle.loads(pickle.dumps(table))
+    assert restored == table
+    assert restored.buffer == BUFFER
+
+
+def test_lazy_names():
+    table = NameTable(BUFFER)
+    file = File.create(DowIII.gen_file_header(LOOKUP["races.lua"], 0, 0))
+    folder = Folder.create(DowIII.gen_folder_header(LOOKUP["art"], 0, 0, 0, 0))
+    file.load_name_from_lookup(table)
+    folder.load_name_from_lookup(table)
+    assert table._names == {}
+    assert file.name == "races.lua"
+    assert folder.name == "art"
+    file.name = "renamed.lua"
+    assert file.name == "renamed.lua"
+
+
+def test_lazy_names_compare():
+    table = NameTable(BUFFER)
+    header = DowIII.gen_file_header(LOOKUP["races.lua"], 0, 0)
+    lazy, read = File.create(header), File.create(header)
+    lazy.load_name_from_lookup(table)
+    read.load_name_from_lookup(table)
+    _ = read.name
+    assert lazy == read == File(header, name="races.lua")  # Whether or not the name was read
+    assert "races.lua" in repr(lazy)
+    folder_header = DowIII.gen_folder_header(LOOKUP["art"], 0, 0, 0, 0)
+    folder = Folder.create(folder_header)
+    folder.load_name_from_lookup(table)
+    assert folder == Folder(folder_header, name="art", sub_folders=[], files=[])
@@ -0,0 +1,15 @@
+import struct
+
+
+def pack_chunk(chunk_type: str, chunk_id: str, payload: bytes, name: str = "") -> bytes:
+    # A v1.1 chunk header; type, id, version, size, then a length-prefixed name
+    encoded_name = name.encode("ascii")
+    return struct.pack("<4s4s2lL", chunk_type.encode("ascii"), chunk_id.encode("ascii"), 1, len(payload), len(encoded_name)) + encoded_name + payload
+
+
+def pack_chunky(chunks: bytes) -> bytes:
+    # A v1.1 chunky header followed by the (already packed) top-level chunks
+    return b"Relic Chunky\r\n\x1a\0" + struct.pack("<2L", 1, 1) + chunks
+
+
+CHUNKY = pack_chunky(pack_chunk("FOLD", "RSGM", pack_chunk("DATA", "SSHR", b"shader.rsh", "Shader") + pack_chunk("FOLD", "MSLC", pack_chunk("DATA", "DATA", b"\x01" * 64))) + pack_chunk("DATA", "FBIF", b"File Burner"))
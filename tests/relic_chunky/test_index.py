@@ -0,0 +1,52 @@
+from io import BytesIO
+
+import pytest
+
+from relic.chunky.index import ChunkIndex, compile_chunk_query
+from relic.chunky.serializer import read_chunky
+from tests.relic_chunky.datagen import CHUNKY, pack_chunk, pack_chunky
+
+MESH = pack_chunky(pack_chunk("FOLD", "RSGM", pack_chunk("FOLD", "MSGR", b"".join(pack_chunk("FOLD", "MSLC", pack_chunk("DATA", "DATA", b"mesh %d" % i) + pack_chunk("DATA", "ATTR", b"attr %d" % i)) for i in range(3)))) + pack_chunk("DATA", "ATTR", b"root"))
+
+PATHS = [
+    "FOLD:RSGM#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#1/DATA:DATA#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#1/DATA:ATTR#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#2",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#2/DATA:DATA#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#2/DATA:ATTR#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#3",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#3/DATA:DATA#1",
+    "FOLD:RSGM#1/FOLD:MSGR#1/FOLD:MSLC#3/DATA:ATTR#1",
+    "DATA:ATTR#1",
+]
+
+
+@pytest.mark.parametrize("index", [True, False])
+def test_chunk_index(index: bool):
+    chunky = read_chunky(BytesIO(MESH), lazy=True, index=index)
+    assert (chunky.index is not None) == index
+    assert list(chunky.get_index().paths) == PATHS
+    assert chunky.get_index() == ChunkIndex.build(chunky.chunks)  # Parsing and building agree
+
+    assert chunky.get_chunk("FOLD:RSGM/FOLD:MSGR/FOLD:MSLC#2/DATA:DATA").raw_bytes == b"mesh 1"
+    assert chunky.get_chunk("FOLD:RSGM/DATA:ATTR") is None
+    attrs = chunky.query("**/DATA:ATTR")
+    assert [bytes(chunk.raw_bytes) for _, chunk in attrs] == [b"attr 0", b"attr 1", b"attr 2", b"root"]
+    assert [path for path, _ in chunky.query("FOLD:RSGM/*/FOLD:MSLC#3/*")] == PATHS[9:11]
+    assert [path for path, _ in chunky.query("FOLD:RSGM/**")] == PATHS[1:11]
+    assert [path for path, _ in chunky.query("*")] == [PATHS[0], PATHS[-1]]
+
+
+def test_compile_chunk_query():
+    assert compile_chunk_query("**/DATA:ATTR").match("DATA:ATTR#1")
+    assert compile_chunk_query("**/DATA:?TTR#2").match("FOLD:A#1/DATA:ATTR#2")
+    assert not compile_chunk_query("**/DATA:ATTR#2").match("FOLD:A#1/DATA:ATTR#1")
+    assert not compile_chunk_query("FOLD:*").match("FOLD:A#1/DATA:ATTR#1")
+
+
+def test_chunk_index_sample():
+    chunky = read_chunky(BytesIO(CHUNKY), index=True)
+    assert chunky.get_chunk("FOLD:RSGM/FOLD:MSLC/DATA:DATA").raw_bytes == b"\x01" * 64
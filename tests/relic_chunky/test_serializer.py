@@ -0,0 +1,82 @@
+import os
+from io import BytesIO
+
+import pytest
+
+from relic.chunky import ChunkType, FolderChunk, GenericDataChunk, LazyDataChunk, LazyFolderChunk
+from relic.chunky.serializer import MemoryViewReader, read_chunky
+from tests.relic_chunky.datagen import CHUNKY, pack_chunk, pack_chunky
+
+
+class CountingStream(BytesIO):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_read_chunky_lazy():
+    eager = read_chunky(BytesIO(CHUNKY))
+    stream = CountingStream(CHUNKY)
+    lazy = read_chunky(stream, lazy=True)
+    assert stream.bytes_read < len(CHUNKY) - 64  # The payloads weren't read
+
+    rsgm, fbif = lazy.chunks
+    assert isinstance(rsgm, LazyFolderChunk) and isinstance(rsgm, FolderChunk)
+    assert isinstance(fbif, LazyDataChunk) and isinstance(fbif, GenericDataChunk) and not fbif.data_loaded
+    sshr, mslc = rsgm.chunks
+    assert CHUNKY[sshr.offset:sshr.offset + sshr.header.size] == b"shader.rsh"
+    assert sshr.header.name == "Shader" and mslc.header.type == ChunkType.Folder
+
+    assert mslc.chunks[0].raw_bytes == b"\x01" * 64
+    assert fbif.raw_bytes == b"File Burner" and fbif.data_loaded
+    assert [c.raw_bytes for c in rsgm.chunks[1].chunks] == [c.raw_bytes for c in eager.chunks[0].chunks[1].chunks]
+    assert sshr.raw_bytes == eager.chunks[0].chunks[0].raw_bytes
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_read_chunky_memoryview(lazy: bool):
+    buffer = bytearray(CHUNKY)
+    chunky = read_chunky(memoryview(buffer), lazy=lazy)
+    sshr = chunky.chunks[0].chunks[0]
+    assert isinstance(sshr, LazyDataChunk) == lazy
+    assert isinstance(sshr.raw_bytes, memoryview) and sshr.raw_bytes == b"shader.rsh"
+    buffer[buffer.index(b"shader.rsh")] = ord("S")  # A view of the buffer; not a copy
+    assert bytes(sshr.raw_bytes) == b"Shader.rsh"
+    with BytesIO(chunky.chunks[1].raw_bytes) as stream:  # Converters wrap payloads in streams
+        assert stream.read() == b"File Burner"
+
+
+def test_memory_view_reader():
+    reader = MemoryViewReader(b"0123456789")
+    assert reader.read(3) == b"012" and reader.tell() == 3
+    assert reader.seek(-2, os.SEEK_END) == 8
+    assert bytes(reader.read_view()) == b"89" and reader.read(4) == b""
+
+
+def test_read_chunky_deeply_nested():
+    depth = 2000  # Deeper than the default recursion limit
+    tree = pack_chunk("DATA", "LEAF", b"leaf")
+    for _ in range(depth):
+        tree = pack_chunk("FOLD", "NEST", tree) + pack_chunk("DATA", "SIBL", b"")
+    chunky = pack_chunky(tree)
+    for lazy in [False, True]:
+        chunks = read_chunky(BytesIO(chunky), lazy).chunks
+        for _ in range(depth):
+            folder, sibling = chunks
+            assert folder.header.id == "NEST" and sibling.header.id == "SIBL"
+            chunks = folder.chunks
+        assert [c.raw_bytes for c in chunks] == [b"leaf"]
+
+
+def test_read_chunky_truncated():
+    truncated = CHUNKY[:-4]  # FBIF's payload is cut short
+    with pytest.raises(EOFError):
+        read_chunky(BytesIO(truncated))
+    fbif = read_chunky(BytesIO(truncated), lazy=True).chunks[1]
+    with pytest.raises(EOFError):
+        fbif.raw_bytes
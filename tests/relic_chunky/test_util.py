@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+
+from relic.chunky import ChunkType, FolderChunk, GenericDataChunk
+from relic.chunky.chunk import ChunkHeaderV0101
+from relic.chunky_formats.util import ChunkCollectionX
+
+
+def data_chunk(chunk_id: str, payload: bytes) -> GenericDataChunk:
+    return GenericDataChunk(ChunkHeaderV0101(ChunkType.Data, chunk_id, 1, len(payload), ""), payload)
+
+
+@dataclass
+class AttrChunk:
+    CHUNK_ID = "ATTR"
+    CHUNK_TYPE = ChunkType.Data
+    value: bytes
+
+    @classmethod
+    def convert(cls, chunk: GenericDataChunk) -> "AttrChunk":
+        return cls(chunk.raw_bytes)
+
+
+def test_chunk_collection_x():
+    chunks = [data_chunk("ATTR", b"a"), data_chunk("DATA", b"d"), data_chunk("ATTR", b"b")]
+    folder = FolderChunk(chunks + [FolderChunk([], ChunkHeaderV0101(ChunkType.Folder, "ATTR", 1, 0, ""))], ChunkHeaderV0101(ChunkType.Folder, "MSLC", 1, 0, ""))
+    collection = ChunkCollectionX(folder)
+    assert len(collection) == 4 and len(ChunkCollectionX.list2col(chunks)) == 3
+    assert collection.get_chunk("ATTR", ChunkType.Data) is chunks[0]
+    assert collection.get_chunks("ATTR", ChunkType.Data) == [chunks[0], chunks[2]]
+    assert collection.get_chunk("ATTR", ChunkType.Folder) is folder.chunks[3]
+    assert collection.get_chunk("MISS", ChunkType.Data) is None and collection.get_chunks("MISS", ChunkType.Data) == []
+    assert list(collection.data_chunks) == chunks
+    assert collection.find(AttrChunk) is chunks[0]
+    assert collection.find_and_convert(AttrChunk) == AttrChunk(b"a")
+    assert collection.find_and_convert(AttrChunk, many=True) == [AttrChunk(b"a"), AttrChunk(b"b")]